@@ -3,11 +3,11 @@ import random  # 가짜 날씨/뉴스를 랜덤으로 만들기 위해 사용
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
-import sounddevice as sd
-import scipy.io.wavfile as wav
-import numpy as np
 import time
-from playsound import playsound
+from audio_io import encode_wav, transcribe, play_mp3_bytes  # 파일 없이 메모리에서 오디오 처리 (같은 폴더)
+from vad_recorder import VADRecorder  # 링 버퍼 기반 자동 녹음기 (같은 폴더)
+from streaming_stt import listen_and_transcribe  # 말하는 동안 구간별 받아쓰기 (같은 폴더)
+from tool_registry import ToolRegistry  # 도구 등록 + 병렬 실행 (같은 폴더)
 
 # ------------------------------------------------------------
 # API 초기화
@@ -15,10 +15,24 @@ from playsound import playsound
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# 말하는 동안 구간별로 미리 받아쓰기 (False면 말이 끝난 뒤 한 번에 받아쓰기)
+STREAMING_STT = True
+
 # ------------------------------------------------------------
 # [NEW] 1. 도구(함수) 정의: AI가 사용할 실제 파이썬 함수들
+# @tools.tool(...)에 GPT에게 보여줄 설명(스키마)을 함께 적어 두면
+# tools_schema가 자동으로 만들어집니다.
 # ------------------------------------------------------------
+tools = ToolRegistry()
 
+@tools.tool(
+    description="특정 지역의 현재 날씨를 조회합니다.",
+    properties={
+        "location": {"type": "string", "description": "서울, 부산, 뉴욕 등 도시 이름"},
+        "unit": {"type": "string", "enum": ["celsius", "fahrenheit"]}
+    },
+    required=["location"]
+)
 def get_current_weather(location, unit="celsius"):
     """
     [시뮬레이션] 특정 지역의 날씨 정보를 가져옵니다.
@@ -40,6 +54,13 @@ def get_current_weather(location, unit="celsius"):
         "description": f"{location}은(는) 현재 {condition}, 기온은 {temp}도입니다."
     })
 
+@tools.tool(
+    description="특정 주제에 대한 최신 뉴스 헤드라인을 검색합니다.",
+    properties={
+        "topic": {"type": "string", "description": "검색할 뉴스 키워드 (예: AI, 주식, 스포츠)"}
+    },
+    required=["topic"]
+)
 def get_latest_news(topic="general"):
     """
     [시뮬레이션] 특정 주제의 최신 뉴스를 검색합니다.
@@ -61,77 +82,30 @@ def get_latest_news(topic="general"):
 # ------------------------------------------------------------
 # [NEW] 2. 도구 스키마(Schema) 정의
 # GPT에게 "이런 함수들이 있고, 이런 인자를 받아"라고 설명하는 명세서입니다.
+# (위에서 @tools.tool로 등록한 내용으로 자동 생성)
 # ------------------------------------------------------------
-tools_schema = [
-    {
-        "type": "function",
-        "function": {
-            "name": "get_current_weather",
-            "description": "특정 지역의 현재 날씨를 조회합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "location": {"type": "string", "description": "서울, 부산, 뉴욕 등 도시 이름"},
-                    "unit": {"type": "string", "enum": ["celsius", "fahrenheit"]}
-                },
-                "required": ["location"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_latest_news",
-            "description": "특정 주제에 대한 최신 뉴스 헤드라인을 검색합니다.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "topic": {"type": "string", "description": "검색할 뉴스 키워드 (예: AI, 주식, 스포츠)"}
-                },
-                "required": ["topic"]
-            }
-        }
-    }
-]
+tools_schema = tools.schema
 
 # ------------------------------------------------------------
 # 3. 기존 음성 녹음 및 STT 함수 (변동 없음)
 # ------------------------------------------------------------
-def record_voice_auto(filename="input.wav", fs=16000, silence_threshold=300, min_silence_duration=1.5):
+def record_voice_auto(fs=16000, silence_threshold=300, min_silence_duration=1.5):
     print("\n🎤 말씀해주세요! (말씀이 끝나면 자동으로 인식합니다)\n")
-    buffer = []
-    silence_start = None
-    recording = True
-    start_time = time.time()
+    recorder = VADRecorder(fs=fs, silence_threshold=silence_threshold, silence_duration=min_silence_duration,
+                           wait_for_voice=False, ignore_initial=0.5)  # 콜백 + 링 버퍼 녹음 (처음 0.5초 무음 무시)
 
     try:
-        with sd.InputStream(samplerate=fs, channels=1, dtype="int16") as stream:
-            while recording:
-                frame, _ = stream.read(int(0.1 * fs))
-                buffer.append(frame)
-                volume = np.sqrt(np.mean(frame.astype(np.float64)**2))
-
-                if time.time() - start_time < 0.5: continue
-
-                if volume < silence_threshold:
-                    if silence_start is None: silence_start = time.time()
-                    elif time.time() - silence_start > min_silence_duration:
-                        print("🛑 녹음 종료.")
-                        recording = False
-                else:
-                    silence_start = None
-
-        wav.write(filename, fs, np.concatenate(buffer, axis=0))
-        return filename
+        audio = recorder.record()
+        print("🛑 녹음 종료.")
+        return encode_wav(audio, fs)  # WAV 바이트 (파일 저장 없음)
     except Exception as e:
         print(f"녹음 오류: {e}")
         return None
 
-def speech_to_text(file_path):
-    if not os.path.exists(file_path): return ""
+def speech_to_text(audio_bytes):
+    if not audio_bytes: return ""
     try:
-        with open(file_path, "rb") as f:
-            return client.audio.transcriptions.create(model="whisper-1", file=f, language="ko").text
+        return transcribe(client, audio_bytes, language="ko")
     except: return ""
 
 # ------------------------------------------------------------
@@ -165,31 +139,8 @@ def ask_gpt(question):
             # 대화 내역에 GPT의 판단(도구 호출 요청)을 추가
             messages.append(response_message)
 
-            # GPT가 요청한 각 도구를 실제로 실행
-            for tool_call in tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                function_response = ""
-                
-                # 함수 이름에 따라 실제 파이썬 함수 실행
-                if function_name == "get_current_weather":
-                    function_response = get_current_weather(
-                        location=function_args.get("location"),
-                        unit=function_args.get("unit", "celsius")
-                    )
-                elif function_name == "get_latest_news":
-                    function_response = get_latest_news(
-                        topic=function_args.get("topic")
-                    )
-
-                # 도구 실행 결과를 대화 내역에 추가 (role: tool)
-                messages.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "name": function_name,
-                    "content": function_response,
-                })
+            # GPT가 요청한 도구들을 동시에 실행하고, 결과를 대화 내역에 추가 (role: tool)
+            messages.extend(tools.run_calls(tool_calls))
 
             # 2차 호출: 도구 실행 결과를 바탕으로 최종 답변 생성
             print("🤔 정보를 바탕으로 답변 정리 중...")
@@ -216,9 +167,7 @@ def ask_gpt(question):
 def text_to_speech(text):
     try:
         speech = client.audio.speech.create(model="tts-1", voice="nova", input=text)
-        filename = f"reply_{int(time.time())}.mp3"
-        with open(filename, "wb") as f: f.write(speech.read())
-        return filename
+        return speech.read()  # MP3 바이트
     except: return None
 
 def ai_voice_assistant():
@@ -230,22 +179,26 @@ def ai_voice_assistant():
                 print(f"⏳ {i}...")
                 time.sleep(1)
             
-            audio_file = record_voice_auto()
-            if not audio_file: continue
-
-            user_text = speech_to_text(audio_file)
+            if STREAMING_STT:
+                print("\n🎤 말씀해주세요! (말씀이 끝나면 자동으로 인식합니다)\n")
+                user_text = listen_and_transcribe(client, silence_threshold=300, silence_duration=1.5,
+                                                  wait_for_voice=False, ignore_initial=0.5)
+            else:
+                audio_bytes = record_voice_auto()
+                if not audio_bytes: continue
+                user_text = speech_to_text(audio_bytes)
             print(f"📝 사용자: {user_text}")
 
             if not user_text.strip(): continue
             if "종료" in user_text:
-                playsound(text_to_speech("네, 종료할게요. 좋은 하루 보내세요!"))
+                play_mp3_bytes(text_to_speech("네, 종료할게요. 좋은 하루 보내세요!"))
                 break
 
             ai_answer = ask_gpt(user_text)
-            sound_file = text_to_speech(ai_answer)
+            sound = text_to_speech(ai_answer)
             
-            if sound_file:
-                playsound(sound_file)
+            if sound:
+                play_mp3_bytes(sound)
                 time.sleep(1)
                 
         except KeyboardInterrupt: break
@@ -7,12 +7,12 @@ import random  # 🎲 날씨나 뉴스 예시를 랜덤으로 뽑기 위한 도
 from openai import OpenAI  # 🤖 지능형 AI(GPT)와 대화하기 위한 OpenAI 전용 도구입니다.
 from dotenv import load_dotenv  # 🔐 비밀번호(.env 파일)를 안전하게 불러오는 도구입니다.
 import os  # 💻 파일 경로를 찾거나 운영체제 기능을 쓰기 위한 도구입니다.
-import sounddevice as sd  # 🎤 마이크로 소리를 듣고 녹음하는 도구입니다.
-import scipy.io.wavfile as wav  # 🎼 녹음된 소리를 파일(.wav)로 저장하는 도구입니다.
-import numpy as np  # 🧮 소리 파형(숫자)을 계산하고 분석하는 수학 도구입니다.
 import time  # ⏱️ 시간을 재거나 잠시 기다리게 하는 도구입니다.
-from playsound import playsound  # 🔊 MP3 파일을 스피커로 재생해주는 도구입니다.
-from fpdf import FPDF  # 📑 예쁜 PDF 보고서를 만들기 위한 도구입니다.
+from audio_io import encode_wav, transcribe, play_mp3_bytes  # 🎼 파일 없이 메모리에서 오디오 처리 (같은 폴더)
+from vad_recorder import VADRecorder  # 🎙️ 링 버퍼 기반 스마트 녹음기 (같은 폴더)
+from streaming_stt import listen_and_transcribe  # 🌊 말하는 동안 구간별 받아쓰기 (같은 폴더)
+from tool_registry import ToolRegistry  # 🧰 도구 등록 + 동시 실행 (같은 폴더)
+from pdf_service import get_pdf_service, announce  # 📑 PDF 보고서를 백그라운드에서 만드는 도구 (같은 폴더)
 
 # ------------------------------------------------------------
 # 0. API 초기화 (준비 단계)
@@ -21,10 +21,20 @@ load_dotenv()  # 📂 프로젝트 폴더의 .env 파일을 찾아 내용을 읽
 # 🔑 환경변수에서 API 키를 꺼내와서 OpenAI AI와 연결할 준비를 합니다.
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# 🌊 말하는 동안 구간별로 미리 받아쓰기 (False면 말이 끝난 뒤 한 번에 받아쓰기)
+STREAMING_STT = True
+
 # ------------------------------------------------------------
 # 1. 도구(함수) 정의 - AI가 사용할 수 있는 능력들
 # ------------------------------------------------------------
-
+# 🗂️ 도구 등록기: 함수 위에 @tools.tool(설명서)을 붙이면 AI용 설명서가 자동으로 만들어집니다.
+tools = ToolRegistry()
+
+@tools.tool(
+    description="지역 날씨 조회",
+    properties={"location": {"type": "string"}},
+    required=["location"]
+)
 def get_current_weather(location, unit="celsius"):
     """ [시뮬레이션] 특정 지역의 날씨를 알려주는 척하는 함수입니다. """
     print(f"🕵️ [System] '{location}'의 날씨를 조회하고 있습니다...")  # 🔍 로그 출력
@@ -35,6 +45,11 @@ def get_current_weather(location, unit="celsius"):
         "condition": random.choice(conditions)  # 🎲 날씨 중 하나 랜덤 선택
     })
 
+@tools.tool(
+    description="뉴스 키워드 검색",
+    properties={"topic": {"type": "string"}},
+    required=["topic"]
+)
 def get_latest_news(topic="general"):
     """ [시뮬레이션] 뉴스를 검색하는 척하는 함수입니다. """
     print(f"🕵️ [System] '{topic}' 관련 뉴스를 검색하고 있습니다...")  # 🔍 로그 출력
@@ -49,42 +64,29 @@ def get_latest_news(topic="general"):
         "headlines": random.sample(fake_headlines, 3)  # 🎰 3개만 뽑아서 줌
     })
 
+@tools.tool(
+    description="정보를 요약하여 PDF 파일로 저장. 검색 후 결과를 파일로 달라고 할 때 사용.",
+    properties={
+        "title": {"type": "string", "description": "보고서 제목"},
+        "content": {"type": "string", "description": "PDF 본문 내용"}
+    },
+    required=["title", "content"]
+)
 def create_pdf_report(title, content):
     """ [PDF 생성] 검색한 내용을 깔끔한 PDF 파일로 만들어주는 함수입니다. """
-    print(f"🖨️ [System] PDF 보고서를 생성 중입니다... (제목: {title})")  # 🚀 생성 시작 알림
-    
-    filename = f"Report_{int(time.time())}.pdf"  # 🕒 파일명에 시간을 넣어 겹치지 않게 함
-    
+    print(f"🖨️ [System] PDF 보고서를 요청했습니다... (제목: {title})")  # 🚀 생성 시작 알림
+
     try:
-        pdf = FPDF()  # 📄 빈 PDF 문서를 만듭니다.
-        pdf.add_page()  # ➕ 종이 한 장을 추가합니다.
-        
-        # ⚠️ 한글 폰트 설정 (중요: 한글이 깨지지 않으려면 폰트가 필요함)
-        # 윈도우 기본 폰트 경로입니다. 맥(Mac) 사용자는 경로 변경이 필요합니다.
-        font_path = "C:/Windows/Fonts/malgun.ttf" 
-        
-        if os.path.exists(font_path):  # ✅ 폰트 파일이 진짜 있는지 확인
-            pdf.add_font("Malgun", fname=font_path)  # 📥 폰트 등록
-            pdf.set_font("Malgun", size=12)  # 🔤 폰트 선택 및 크기 설정
-        else:
-            print("⚠️ [경고] 한글 폰트가 없어서 기본 폰트를 씁니다. (한글 깨짐 주의)")
-            pdf.set_font("Helvetica", size=12)  # 🔤 폰트가 없으면 영어 폰트 사용
+        # 🏭 PDF는 백그라운드 작업장(pdf_service)에서 만들고, 여기서는 기다리지 않고 바로 돌아옵니다.
+        #    한글 폰트는 한 번만 찾아서 읽어 두고 계속 재사용합니다. (PDF_FONT_PATH로 지정 가능)
+        job = get_pdf_service().submit(
+            content,  # 📜 긴 글도 자동으로 줄바꿈
+            title=f"Report: {title}",  # 📌 가운데 정렬 제목
+            on_done=announce  # 🎉 다 만들어지면 "PDF 저장 완료" 출력
+        )
 
-        # 📌 제목 쓰기
-        pdf.set_font_size(16)  # 제목이니까 글자를 키웁니다.
-        # 가운데 정렬(C)로 제목을 적습니다.
-        pdf.cell(0, 10, text=f"Report: {title}", new_x="LMARGIN", new_y="NEXT", align='C')
-        pdf.ln(10) # ↩️ 한 줄 띄우기
-        
-        # 📝 본문 쓰기
-        pdf.set_font_size(11)  # 본문 글자 크기로 줄입니다.
-        pdf.multi_cell(0, 8, text=content)  # 📜 긴 글도 자동으로 줄바꿈해주는 함수 사용
-        
-        pdf.output(filename)  # 💾 최종 파일 저장
-        print(f"✅ PDF 저장 완료: {filename}")  # 🎉 성공 메시지
-        
-        # 📨 AI에게 성공했다고 알려줍니다.
-        return json.dumps({"status": "success", "filename": filename, "message": "파일 생성 완료"})
+        # 📨 AI에게 파일 이름을 바로 알려줍니다.
+        return json.dumps({"status": "success", "filename": job.filename, "message": "파일 생성 중 (잠시 후 저장)"})
 
     except Exception as e:  # 💥 에러가 나면 프로그램이 꺼지지 않고 여기로 옴
         print(f"❌ PDF 생성 실패: {e}")
@@ -93,109 +95,42 @@ def create_pdf_report(title, content):
 # ------------------------------------------------------------
 # 2. AI에게 도구 사용법 알려주기 (설명서)
 # ------------------------------------------------------------
-tools_schema = [
-    {
-        "type": "function",
-        "function": {
-            "name": "get_current_weather",
-            "description": "지역 날씨 조회",
-            "parameters": {
-                "type": "object",
-                "properties": {"location": {"type": "string"}},
-                "required": ["location"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_latest_news",
-            "description": "뉴스 키워드 검색",
-            "parameters": {
-                "type": "object",
-                "properties": {"topic": {"type": "string"}},
-                "required": ["topic"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "create_pdf_report",
-            "description": "정보를 요약하여 PDF 파일로 저장. 검색 후 결과를 파일로 달라고 할 때 사용.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string", "description": "보고서 제목"},
-                    "content": {"type": "string", "description": "PDF 본문 내용"}
-                },
-                "required": ["title", "content"]
-            }
-        }
-    }
-]
+tools_schema = tools.schema  # 📜 위에서 등록한 도구들로 자동 생성
 
 # ------------------------------------------------------------
 # 3. [핵심] 스마트 음성 녹음 (VAD 기능)
 # ------------------------------------------------------------
-def record_voice_smart(filename="input.wav", fs=16000, silence_threshold=150, silence_duration=1.2):
+def record_voice_smart(fs=16000, silence_threshold=150, silence_duration=1.2):
     """
     🎤 목소리가 들릴 때까지 대기하다가, 말이 시작되면 녹음하고,
        말이 끝나고 조용해지면 자동으로 녹음을 멈추는 함수입니다.
     """
     print("\n👂 듣고 있어요... 말씀해 보세요! (목소리를 감지하면 녹음 시작)")
     
-    buffer = []  # 🥣 소리 데이터를 담을 바구니
-    recording = True  # ⏺️ 녹음 루프 제어용 깃발
-    voice_detected = False  # 🗣️ 말을 시작했는지 확인하는 깃발
-    silence_start_time = None  # 🔇 침묵이 시작된 시간
-    
-    # 🎧 마이크를 켭니다 (InputStream)
-    with sd.InputStream(samplerate=fs, channels=1, dtype="int16") as stream:
-        while recording:
-            # 🎵 0.1초 분량의 소리를 읽어옵니다.
-            frame, _ = stream.read(int(0.1 * fs))
-            
-            # 🔊 소리의 크기(에너지)를 계산합니다.
-            volume = np.sqrt(np.mean(frame.astype(np.float64)**2))
-            
-            # --- 로직: 소리 감지 및 녹음 제어 ---
-            if volume > silence_threshold:  # 📢 설정한 기준보다 소리가 크다면? (말하는 중)
-                if not voice_detected:
-                    print("🗣️ 감지됨! 녹음 중...")  # 🚨 화면에 표시
-                    voice_detected = True  # 말하기 시작했다고 표시
-                
-                silence_start_time = None  # 말하고 있으니 침묵 타이머 리셋
-                buffer.append(frame)  # 소리를 바구니에 담음
-                
-            else:  # 🤫 소리가 기준보다 작다면? (조용함)
-                if voice_detected:  # 🗣️ 이미 말을 시작한 상태라면?
-                    if silence_start_time is None:
-                        silence_start_time = time.time()  # ⏱️ 침묵 시작 시간 기록
-                    
-                    buffer.append(frame)  # 말이 끊기지 않게 조용한 부분도 일단 담음
-                    
-                    # ⏳ 조용한 시간이 설정값(1.2초)을 넘었는지 확인
-                    if time.time() - silence_start_time > silence_duration:
-                        print("✅ 말씀이 끝나서 녹음을 종료합니다.")
-                        recording = False  # 녹음 종료!
-                else:
-                    # 💤 아직 말을 시작 안 했으면 아무것도 안 하고 대기 (버퍼에 안 담음)
-                    pass
-
-    # 💾 모은 소리 조각들을 합쳐서 파일로 저장합니다.
-    if buffer:
-        wav.write(filename, fs, np.concatenate(buffer, axis=0))
-        return filename
+    # 🎙️ 마이크 콜백이 미리 잡아 둔 링 버퍼(바구니)에 소리를 바로 씁니다.
+    #    말이 시작되기 직전 0.3초(pre-roll)도 함께 남겨서 첫 음절이 잘리지 않습니다.
+    recorder = VADRecorder(
+        fs=fs,
+        silence_threshold=silence_threshold,  # 📢 이 기준보다 크면 말하는 중
+        silence_duration=silence_duration,  # ⏳ 조용한 시간이 이만큼 이어지면 종료
+        pre_roll=0.3,
+        max_seconds=30,  # 📏 아무리 길게 말해도 30초까지만 (메모리 고정)
+        on_voice=lambda: print("🗣️ 감지됨! 녹음 중..."),  # 🚨 화면에 표시
+    )
+    audio = recorder.record()
+
+    # 💾 녹음된 소리를 WAV 바이트로 돌려줍니다.
+    if audio is not None:
+        print("✅ 말씀이 끝나서 녹음을 종료합니다.")
+        return encode_wav(audio, fs)  # WAV 바이트 (파일 저장 없음)
     return None
 
-def speech_to_text(file_path):
-    """ 📝 녹음된 파일을 OpenAI Whisper에게 보내 글자로 바꿔오는 함수입니다. """
-    if not os.path.exists(file_path): return ""  # 파일 없으면 패스
+def speech_to_text(audio_bytes):
+    """ 📝 녹음된 WAV 바이트를 OpenAI Whisper에게 보내 글자로 바꿔오는 함수입니다. """
+    if not audio_bytes: return ""  # 녹음 데이터 없으면 패스
     try:
-        with open(file_path, "rb") as f:
-            # 🌪️ STT 모델(Whisper) 호출
-            return client.audio.transcriptions.create(model="whisper-1", file=f, language="ko").text
+        # 🌪️ STT 모델(Whisper) 호출 (파일 없이 바이트 그대로 업로드)
+        return transcribe(client, audio_bytes, language="ko")
     except: return ""
 
 # ------------------------------------------------------------
@@ -231,31 +166,9 @@ def ask_gpt(question):
             print(f"🤖 GPT: {len(tool_calls)}가지 작업을 수행하겠습니다...")
             messages.append(response_message)  # 대화 흐름에 추가
 
-            # 🏃‍♂️ GPT가 시킨 도구들을 하나씩 실행합니다.
-            for tool_call in tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                tool_result = ""
-                
-                # 어떤 도구인지 확인하고 실행
-                if function_name == "get_current_weather":
-                    tool_result = get_current_weather(function_args.get("location"))
-                elif function_name == "get_latest_news":
-                    tool_result = get_latest_news(function_args.get("topic"))
-                elif function_name == "create_pdf_report":
-                    tool_result = create_pdf_report(
-                        function_args.get("title"), 
-                        function_args.get("content")
-                    )
-
-                # 📥 도구 실행 결과를 대화 목록에 추가해줍니다.
-                messages.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "name": function_name,
-                    "content": tool_result,
-                })
+            # 🏃‍♂️🏃‍♀️ GPT가 시킨 도구들을 동시에 실행하고, 결과를 대화 목록에 추가해줍니다.
+            #    (도구마다 제한 시간이 지나면 '시간 초과' 결과로 대신합니다.)
+            messages.extend(tools.run_calls(tool_calls))
 
             # 2️⃣ 도구 결과를 다 보고 최종 답변 생성
             second_response = client.chat.completions.create(
@@ -276,14 +189,11 @@ def ask_gpt(question):
 # 5. 말하기 및 메인 실행
 # ------------------------------------------------------------
 def text_to_speech(text):
-    """ 🔊 AI의 텍스트 답변을 목소리 파일(MP3)로 바꿔주는 함수입니다. """
+    """ 🔊 AI의 텍스트 답변을 목소리(MP3 바이트)로 바꿔주는 함수입니다. """
     try:
         # 🗣️ OpenAI TTS 사용 (목소리: nova)
         speech = client.audio.speech.create(model="tts-1", voice="nova", input=text)
-        filename = f"reply_{int(time.time())}.mp3"
-        with open(filename, "wb") as f:
-            f.write(speech.read())
-        return filename
+        return speech.read()
     except: return None
 
 def ai_voice_assistant():
@@ -294,19 +204,25 @@ def ai_voice_assistant():
         try:
             print("\n" + "="*40)
             
-            # 1. 🎤 듣기 (스마트 녹음)
-            audio_file = record_voice_smart()
-            if not audio_file: continue  # 녹음된 게 없으면 다시 대기
-
-            # 2. 📝 받아적기 (STT)
-            user_text = speech_to_text(audio_file)
+            if STREAMING_STT:
+                # 1+2. 🎤📝 듣는 동안 쉼마다 앞부분을 미리 받아적기 (말이 끝나면 마지막 조각만 기다림)
+                print("\n👂 듣고 있어요... 말씀해 보세요! (목소리를 감지하면 녹음 시작)")
+                user_text = listen_and_transcribe(client, on_voice=lambda: print("🗣️ 감지됨! 녹음 중..."))
+                if not user_text: continue  # 들은 게 없으면 다시 대기
+            else:
+                # 1. 🎤 듣기 (스마트 녹음)
+                audio_bytes = record_voice_smart()
+                if not audio_bytes: continue  # 녹음된 게 없으면 다시 대기
+
+                # 2. 📝 받아적기 (STT)
+                user_text = speech_to_text(audio_bytes)
             print(f"📝 사용자: {user_text}")
 
             # 👋 종료 명령어 확인
             if "종료" in user_text:
                 print("👋 비서를 종료합니다.")
                 bye_sound = text_to_speech("네, 이용해 주셔서 감사합니다. 안녕히 가세요.")
-                playsound(bye_sound)
+                play_mp3_bytes(bye_sound)
                 break  # 루프 탈출
 
             # 3. 🧠 생각하고 답하기 (GPT + Tools)
@@ -315,11 +231,10 @@ def ai_voice_assistant():
                 print(f"🤖 AI: {ai_answer}")
 
                 # 4. 🔊 말하기 (TTS)
-                sound_file = text_to_speech(ai_answer)
-                if sound_file:
-                    playsound(sound_file)
+                sound = text_to_speech(ai_answer)
+                if sound:
+                    play_mp3_bytes(sound)  # 🧹 재생용 임시 파일은 재생 후 자동 삭제
                     time.sleep(0.5)
-                    os.remove(sound_file) # 🧹 다 들은 파일 삭제 (깔끔하게)
 
         except KeyboardInterrupt:
             print("\n강제 종료합니다.")
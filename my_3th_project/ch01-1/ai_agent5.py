@@ -6,13 +6,14 @@ import random  # 🎲 랜덤 뽑기
 from openai import OpenAI  # 🤖 AI 모델 연결
 from dotenv import load_dotenv  # 🔐 API 키 로드
 import os  # 💻 시스템 제어
-import sounddevice as sd  # 🎤 녹음
-import scipy.io.wavfile as wav  # 🎼 WAV 파일 저장
-import numpy as np  # 🧮 수치 계산
 import time  # ⏱️ 시간 제어
-from datetime import datetime  # 📅 [NEW] 날짜와 시간을 기록하기 위해 추가
-from playsound import playsound  # 🔊 소리 재생
-from fpdf import FPDF  # 📑 PDF 생성
+from audio_io import encode_wav, transcribe, play_mp3_bytes  # 🎼 파일 없이 메모리에서 오디오 처리 (같은 폴더)
+from vad_recorder import VADRecorder  # 🎙️ 링 버퍼 기반 스마트 녹음기 (같은 폴더)
+from streaming_stt import listen_and_transcribe  # 🌊 말하는 동안 구간별 받아쓰기 (같은 폴더)
+from speech_pipeline import speak_while_generating  # 🗣️ 답변 생성과 말하기를 동시에 (같은 폴더)
+from tool_registry import ToolRegistry  # 🧰 도구 등록 + 동시 실행 (같은 폴더)
+from pdf_service import get_pdf_service, announce  # 📑 백그라운드 PDF 생성 (같은 폴더)
+from conversation_log import get_log  # 💾 구조화된 대화 기록 (같은 폴더)
 
 # ------------------------------------------------------------
 # 0. 설정 및 초기화
@@ -20,33 +21,43 @@ from fpdf import FPDF  # 📑 PDF 생성
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-# 💾 [NEW] 대화 내용을 저장할 파일 이름
-LOG_FILE = "conversation_log.txt"
+# 🌊 말하는 동안 구간별로 미리 받아쓰기 (False면 말이 끝난 뒤 한 번에 받아쓰기)
+STREAMING_STT = True
+
+# 🗣️ 답변이 만들어지는 대로 문장 단위로 말하기 (False면 전체 답변 → 전체 TTS → 재생)
+SPEAK_WHILE_GENERATING = True
+
+# 💾 [NEW] 대화 내용을 저장할 파일 이름 (JSON Lines: 한 줄 = 한 턴, 5MB마다 압축해서 돌려 씀)
+LOG_FILE = "conversation_log.jsonl"
 
 # ------------------------------------------------------------
 # 1. [NEW] 대화 저장 함수 (핵심 추가 기능)
 # ------------------------------------------------------------
-def save_conversation(user_text, ai_text):
+def save_conversation(user_text, ai_text, stats=None):
     """
-    🗣️ 사용자의 질문과 AI의 답변을 텍스트 파일에 이어붙여 저장(Append)합니다.
+    🗣️ 사용자의 질문과 AI의 답변을 한 줄(JSON)로 기록합니다.
+    stats(turn_stats)를 주면 라운드 수, GPT/도구 시간, 토큰 수도 함께 저장합니다.
+    👀 보기: python conversation_log.py tail 5  /  python conversation_log.py 2025-12-21
     """
-    # 🕒 현재 날짜와 시간 구하기 (예: 2025-12-21 14:30:05)
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # 📝 저장할 형식 만들기
-    log_content = f"[{now}]\n👤 사용자: {user_text}\n🤖 AI: {ai_text}\n" + "-"*50 + "\n"
-    
     try:
-        # 📂 파일을 '이어쓰기 모드(a)'로 엽니다. (utf-8 인코딩 필수)
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(log_content)
-        print(f"💾 [System] 대화 내용이 '{LOG_FILE}'에 저장되었습니다.")
+        # 처음 저장할 때 기록 객체를 꺼냅니다. (모듈을 다시 불러오는 작업 프로세스는 파일을 열지 않음)
+        get_log(LOG_FILE).append(user_text, ai_text, stats=stats)
+        print(f"💾 [System] 대화 내용이 '{LOG_FILE}'에 기록되었습니다.")
     except Exception as e:
         print(f"❌ 로그 저장 실패: {e}")
 
 # ------------------------------------------------------------
-# 2. 도구(함수) 정의
+# 2. 도구(함수) 정의 (@tools.tool에 적은 설명으로 스키마 자동 생성)
 # ------------------------------------------------------------
+tools = ToolRegistry()
+
+@tools.tool(
+    description="지역 날씨 조회",
+    properties={"location": {"type": "string"}},
+    required=["location"],
+    memoize=True,  # ♻️ 한 번의 응답 안에서 같은 지역을 여러 번 물어도 한 번만 조회
+    ttl=0  # 날씨는 바뀌므로 저장해 두지 않음
+)
 def get_current_weather(location, unit="celsius"):
     """ [시뮬레이션] 날씨 조회 """
     print(f"🕵️ [System] '{location}' 날씨 조회 중...")
@@ -57,6 +68,13 @@ def get_current_weather(location, unit="celsius"):
         "condition": random.choice(conditions)
     })
 
+@tools.tool(
+    description="뉴스 키워드 검색",
+    properties={"topic": {"type": "string"}},
+    required=["topic"],
+    memoize=True,  # ♻️ 같은 주제는 10분 동안 다시 검색하지 않음
+    ttl=600
+)
 def get_latest_news(topic="general"):
     """ [시뮬레이션] 뉴스 검색 """
     print(f"🕵️ [System] '{topic}' 뉴스 검색 중...")
@@ -71,35 +89,21 @@ def get_latest_news(topic="general"):
         "headlines": random.sample(fake_headlines, 3)
     })
 
+@tools.tool(
+    description="정보를 PDF 파일로 저장",
+    properties={
+        "title": {"type": "string"},
+        "content": {"type": "string"}
+    },
+    required=["title", "content"]
+)
 def create_pdf_report(title, content):
-    """ [PDF 생성] 보고서 만들기 """
-    print(f"🖨️ [System] PDF 생성 중... (제목: {title})")
-    filename = f"Report_{int(time.time())}.pdf"
-    
+    """ [PDF 생성] 보고서 만들기 (백그라운드에서 생성하고 바로 반환) """
+    print(f"🖨️ [System] PDF 생성 요청... (제목: {title})")
+
     try:
-        pdf = FPDF()
-        pdf.add_page()
-        # 윈도우 폰트 경로 (맥은 변경 필요)
-        font_path = "C:/Windows/Fonts/malgun.ttf"
-        
-        if os.path.exists(font_path):
-            pdf.add_font("Malgun", fname=font_path)
-            pdf.set_font("Malgun", size=12)
-        else:
-            pdf.set_font("Helvetica", size=12)
-
-        # 제목
-        pdf.set_font_size(16)
-        pdf.cell(0, 10, text=f"Report: {title}", new_x="LMARGIN", new_y="NEXT", align='C')
-        pdf.ln(10)
-        
-        # 본문
-        pdf.set_font_size(11)
-        pdf.multi_cell(0, 8, text=content)
-        
-        pdf.output(filename)
-        print(f"✅ PDF 저장 완료: {filename}")
-        return json.dumps({"status": "success", "filename": filename})
+        job = get_pdf_service().submit(content, title=f"Report: {title}", on_done=announce)
+        return json.dumps({"status": "success", "filename": job.filename})
 
     except Exception as e:
         print(f"❌ PDF 생성 실패: {e}")
@@ -108,152 +112,163 @@ def create_pdf_report(title, content):
 # ------------------------------------------------------------
 # 3. 도구 스키마
 # ------------------------------------------------------------
-tools_schema = [
-    {
-        "type": "function",
-        "function": {
-            "name": "get_current_weather",
-            "description": "지역 날씨 조회",
-            "parameters": {
-                "type": "object",
-                "properties": {"location": {"type": "string"}},
-                "required": ["location"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_latest_news",
-            "description": "뉴스 키워드 검색",
-            "parameters": {
-                "type": "object",
-                "properties": {"topic": {"type": "string"}},
-                "required": ["topic"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "create_pdf_report",
-            "description": "정보를 PDF 파일로 저장",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string"},
-                    "content": {"type": "string"}
-                },
-                "required": ["title", "content"]
-            }
-        }
-    }
-]
+tools_schema = tools.schema
 
 # ------------------------------------------------------------
 # 4. 스마트 녹음 (VAD)
 # ------------------------------------------------------------
-def record_voice_smart(filename="input.wav", fs=16000, silence_threshold=150, silence_duration=1.2):
+def record_voice_smart(fs=16000, silence_threshold=150, silence_duration=1.2):
     """ 🎤 말할 때만 녹음하는 똑똑한 귀 """
     print("\n👂 듣고 있어요... (말씀하시면 녹음 시작)")
     
-    buffer = []
-    recording = True
-    voice_detected = False
-    silence_start_time = None
-    
-    with sd.InputStream(samplerate=fs, channels=1, dtype="int16") as stream:
-        while recording:
-            frame, _ = stream.read(int(0.1 * fs))
-            volume = np.sqrt(np.mean(frame.astype(np.float64)**2))
-            
-            if volume > silence_threshold:
-                if not voice_detected:
-                    print("🗣️ 감지됨! 녹음 중...")
-                    voice_detected = True
-                silence_start_time = None
-                buffer.append(frame)
-                
-            else:
-                if voice_detected:
-                    if silence_start_time is None: silence_start_time = time.time()
-                    buffer.append(frame)
-                    
-                    if time.time() - silence_start_time > silence_duration:
-                        print("✅ 녹음 종료.")
-                        recording = False
-
-    if buffer:
-        wav.write(filename, fs, np.concatenate(buffer, axis=0))
-        return filename
+    # 🎙️ 콜백 + 링 버퍼 녹음 (말 시작 직전 0.3초 포함, 최대 30초)
+    recorder = VADRecorder(fs=fs, silence_threshold=silence_threshold, silence_duration=silence_duration,
+                           on_voice=lambda: print("🗣️ 감지됨! 녹음 중..."))
+    audio = recorder.record()
+
+    if audio is not None:
+        print("✅ 녹음 종료.")
+        return encode_wav(audio, fs)  # WAV 바이트 (파일 저장 없음)
     return None
 
-def speech_to_text(file_path):
-    """ 📝 음성 -> 텍스트 변환 """
-    if not os.path.exists(file_path): return ""
+def speech_to_text(audio_bytes):
+    """ 📝 음성(WAV 바이트) -> 텍스트 변환 """
+    if not audio_bytes: return ""
     try:
-        with open(file_path, "rb") as f:
-            return client.audio.transcriptions.create(model="whisper-1", file=f, language="ko").text
+        return transcribe(client, audio_bytes, language="ko")
     except: return ""
 
 # ------------------------------------------------------------
 # 5. GPT 뇌 (생각 + 도구 실행)
 # ------------------------------------------------------------
-def ask_gpt(question):
-    messages = [
-        {"role": "system", "content": "당신은 AI 비서입니다. PDF 저장을 요청받으면 검색 후 요약하여 문서를 만드세요."},
+SYSTEM_PROMPT = "당신은 AI 비서입니다. PDF 저장을 요청받으면 검색 후 요약하여 문서를 만드세요."
+
+# 🔁 "도구 실행 → 결과 보고 다시 생각"을 최대 몇 번 반복할지 (넘으면 도구 없이 답변만 받음)
+MAX_TOOL_ROUNDS = 5
+
+def _new_messages(question):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": question}
     ]
 
+def _record_round(stats, round_no, llm_seconds, tool_seconds, usage, tool_count):
+    """ 📊 라운드별 소요 시간과 토큰 수를 기록합니다. (튜닝용) """
+    entry = {
+        "round": round_no,
+        "llm_seconds": round(llm_seconds, 3),
+        "tool_seconds": round(tool_seconds, 3),
+        "tool_calls": tool_count,
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+    print(f"📊 [라운드 {round_no}] GPT {llm_seconds:.2f}초 · 도구 {tool_count}개 {tool_seconds:.2f}초 · "
+          f"토큰 {entry['prompt_tokens']}+{entry['completion_tokens']}")
+    if stats is not None:
+        stats.append(entry)
+
+def ask_gpt(question, stats=None):
+    """ 🧠 도구가 더 필요 없다고 할 때까지 (최대 MAX_TOOL_ROUNDS번) 생각 → 도구 실행을 반복합니다. """
+    messages = _new_messages(question)
+
     try:
-        # 1차 생각
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages,
-            tools=tools_schema,
-            tool_choice="auto"
-        )
-        
-        response_message = response.choices[0].message
-        tool_calls = response_message.tool_calls
-
-        # 도구 사용이 필요하면
-        if tool_calls:
-            print(f"🤖 GPT: {len(tool_calls)}가지 작업을 수행합니다...")
-            messages.append(response_message)
+        for round_no in range(1, MAX_TOOL_ROUNDS + 2):
+            # 마지막 한 번은 도구 없이 지금까지의 결과로 답변만 받습니다.
+            options = {} if round_no > MAX_TOOL_ROUNDS else {"tools": tools_schema, "tool_choice": "auto"}
 
-            for tool_call in tool_calls:
-                fname = tool_call.function.name
-                args = json.loads(tool_call.function.arguments)
-                result = ""
-                
-                if fname == "get_current_weather":
-                    result = get_current_weather(args.get("location"))
-                elif fname == "get_latest_news":
-                    result = get_latest_news(args.get("topic"))
-                elif fname == "create_pdf_report":
-                    result = create_pdf_report(args.get("title"), args.get("content"))
-
-                messages.append({
-                    "tool_call_id": tool_call.id,
-                    "role": "tool",
-                    "name": fname,
-                    "content": result
-                })
-
-            # 최종 답변 생성
-            second_response = client.chat.completions.create(
-                model="gpt-4o-mini", messages=messages
+            started = time.perf_counter()
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                **options
             )
-            return second_response.choices[0].message.content
-        
-        else:
-            return response_message.content
+            llm_seconds = time.perf_counter() - started
+
+            response_message = response.choices[0].message
+            tool_calls = response_message.tool_calls
+
+            # 도구가 더 필요 없으면 최종 답변
+            if not tool_calls:
+                _record_round(stats, round_no, llm_seconds, 0.0, response.usage, 0)
+                return response_message.content
+
+            print(f"🤖 GPT: {len(tool_calls)}가지 작업을 수행합니다... (라운드 {round_no})")
+            messages.append(response_message)
+
+            # 요청된 도구들을 동시에 실행 (도구별 제한 시간, 같은 요청은 저장된 결과 재사용)
+            started = time.perf_counter()
+            messages.extend(tools.run_calls(tool_calls))
+            _record_round(stats, round_no, llm_seconds, time.perf_counter() - started,
+                          response.usage, len(tool_calls))
 
     except Exception as e:
         print(f"❌ GPT 오류: {e}")
         return "오류가 발생했습니다."
 
+def _stream_content(stream, tool_calls, state):
+    """ 스트리밍 응답에서 글자 조각을 내보내고, 도구 호출 조각은 tool_calls에, 글/토큰 수는 state에 모읍니다. """
+    for chunk in stream:
+        if getattr(chunk, "usage", None):
+            state["usage"] = chunk.usage  # 📊 include_usage 옵션이면 마지막 조각에 토큰 수가 옵니다.
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            state["content"] = state.get("content", "") + delta.content
+            yield delta.content
+        for tc in delta.tool_calls or []:
+            # 🧩 도구 호출은 id/이름/인자가 여러 조각으로 나뉘어 오므로 index별로 이어 붙입니다.
+            call = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+            if tc.id:
+                call["id"] = tc.id
+            if tc.function and tc.function.name:
+                call["name"] += tc.function.name
+            if tc.function and tc.function.arguments:
+                call["arguments"] += tc.function.arguments
+
+def ask_gpt_stream(question, stats=None):
+    """ 🌊 ask_gpt의 스트리밍 버전: 답변을 조각 단위로 바로바로 내보냅니다. (여러 라운드 도구 사용 포함) """
+    messages = _new_messages(question)
+    try:
+        for round_no in range(1, MAX_TOOL_ROUNDS + 2):
+            options = {} if round_no > MAX_TOOL_ROUNDS else {"tools": tools_schema, "tool_choice": "auto"}
+
+            # 도구가 필요 없으면 이 라운드의 답변이 그대로 흘러나옴
+            tool_calls, state = {}, {}
+            started = time.perf_counter()
+            stream = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                **options
+            )
+            yield from _stream_content(stream, tool_calls, state)
+            llm_seconds = time.perf_counter() - started
+
+            if not tool_calls:
+                _record_round(stats, round_no, llm_seconds, 0.0, state.get("usage"), 0)
+                return
+
+            # 도구 사용이 필요하면 실행 후 다음 라운드에서 다시 생각
+            calls = [tool_calls[i] for i in sorted(tool_calls)]
+            print(f"🤖 GPT: {len(calls)}가지 작업을 수행합니다... (라운드 {round_no})")
+            messages.append({
+                "role": "assistant",
+                "content": state.get("content"),
+                "tool_calls": [
+                    {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+                    for c in calls
+                ]
+            })
+            started = time.perf_counter()
+            messages.extend(tools.run_calls(calls))
+            _record_round(stats, round_no, llm_seconds, time.perf_counter() - started,
+                          state.get("usage"), len(calls))
+    except Exception as e:
+        print(f"❌ GPT 오류: {e}")
+        yield "오류가 발생했습니다."
+
 # ------------------------------------------------------------
 # 6. 메인 실행 (저장 기능 포함)
 # ------------------------------------------------------------
@@ -261,9 +276,7 @@ def text_to_speech(text):
     """ 🔊 텍스트 -> 음성 변환 """
     try:
         speech = client.audio.speech.create(model="tts-1", voice="nova", input=text)
-        filename = f"reply_{int(time.time())}.mp3"
-        with open(filename, "wb") as f: f.write(speech.read())
-        return filename
+        return speech.read()  # MP3 바이트 (파일 저장 없음)
     except: return None
 
 def ai_voice_assistant():
@@ -272,12 +285,18 @@ def ai_voice_assistant():
     while True:
         try:
             print("\n" + "="*40)
-            # 1. 듣기
-            audio_file = record_voice_smart()
-            if not audio_file: continue
+            if STREAMING_STT:
+                # 1+2. 들으면서 적기 (쉼마다 앞부분을 미리 받아씀)
+                print("\n👂 듣고 있어요... (말씀하시면 녹음 시작)")
+                user_text = listen_and_transcribe(client, on_voice=lambda: print("🗣️ 감지됨! 녹음 중..."))
+                if not user_text: continue
+            else:
+                # 1. 듣기
+                audio_bytes = record_voice_smart()
+                if not audio_bytes: continue
 
-            # 2. 적기
-            user_text = speech_to_text(audio_file)
+                # 2. 적기
+                user_text = speech_to_text(audio_bytes)
             print(f"📝 사용자: {user_text}")
 
             if "종료" in user_text:
@@ -286,20 +305,37 @@ def ai_voice_assistant():
                 save_conversation(user_text, "비서 종료")
                 break
 
+            turn_stats = []  # 📊 이번 질문의 라운드별 시간/토큰 기록
+
+            # 3+4. 생각하면서 말하기 (첫 문장이 완성되면 바로 말하기 시작)
+            if user_text.strip() and SPEAK_WHILE_GENERATING:
+                print("🤖 AI: ", end="", flush=True)
+                ai_answer = speak_while_generating(
+                    ask_gpt_stream(user_text, stats=turn_stats),
+                    text_to_speech,  # 문장마다 TTS (작업자 스레드)
+                    play_mp3_bytes,  # 문장 순서대로 재생
+                    on_text=lambda t: print(t, end="", flush=True)
+                )
+                print()
+                save_conversation(user_text, ai_answer, stats=turn_stats)
+
             # 3. 생각하기 (말이 있을 때만)
-            if user_text.strip():
-                ai_answer = ask_gpt(user_text)
+            elif user_text.strip():
+                ai_answer = ask_gpt(user_text, stats=turn_stats)
                 print(f"🤖 AI: {ai_answer}")
 
                 # 🌟 [핵심] 대화 내용 파일로 저장
-                save_conversation(user_text, ai_answer)
+                save_conversation(user_text, ai_answer, stats=turn_stats)
 
                 # 4. 말하기
-                sound_file = text_to_speech(ai_answer)
-                if sound_file:
-                    playsound(sound_file)
+                sound = text_to_speech(ai_answer)
+                if sound:
+                    play_mp3_bytes(sound) # 임시 파일은 재생 후 자동 삭제
                     time.sleep(0.5)
-                    os.remove(sound_file) # 임시 파일 삭제
+
+            if turn_stats:
+                tokens = sum(r["prompt_tokens"] + r["completion_tokens"] for r in turn_stats)
+                print(f"📊 이번 답변: {len(turn_stats)}라운드 · GPT {sum(r['llm_seconds'] for r in turn_stats):.2f}초 · 토큰 {tokens}")
 
         except KeyboardInterrupt:
             print("\n강제 종료")
@@ -1,16 +1,20 @@
 import streamlit as st  # 웹 앱 생성을 위한 스트림릿(Streamlit) 라이브러리입니다. 🌊
 import os  # 운영체제(OS) 기능 사용을 위한 모듈입니다. 💻
 import re  # 정규표현식(Regular Expression) 처리를 위한 모듈입니다. 🧩
-import time  # 시간 지연 및 측정을 위한 모듈입니다. ⏱️
+from concurrent.futures import ThreadPoolExecutor  # 여러 문장의 TTS를 동시에 생성하기 위한 스레드 풀입니다. 🧵
 import numpy as np  # 수치 계산을 위한 넘파이(NumPy) 라이브러리입니다. 🧮
 import sounddevice as sd  # 오디오 재생을 위한 사운드디바이스(SoundDevice) 라이브러리입니다. 🔊
-from scipy.io.wavfile import read  # WAV 파일 읽기를 위한 사이파이(SciPy) 모듈입니다. 🎼
-from openai import OpenAI  # OpenAI API 사용을 위한 클라이언트입니다. 🤖
 from dotenv import load_dotenv  # 환경변수 로드를 위한 라이브러리입니다. 🔐
 from streamlit_mic_recorder import mic_recorder  # 스트림릿용 마이크 녹음 위젯입니다. 🎤
 from streamlit_lottie import st_lottie  # 로티(Lottie) 애니메이션 표시를 위한 라이브러리입니다. 🎬
-import requests  # HTTP 요청을 위한 리퀘스트(Requests) 라이브러리입니다. 🌐
-from fpdf import FPDF  # PDF 생성을 위한 FPDF 라이브러리입니다. 📑
+from pdf_service import get_pdf_service  # PDF를 백그라운드 프로세스에서 만드는 서비스입니다. (같은 폴더) 📑
+from conversation_memory import ConversationMemory, gpt_summarizer  # 토큰 예산 안에서 대화를 기억하는 모듈입니다. (같은 폴더) 🧠
+from karaoke_renderer import KaraokeRenderer  # 바뀐 부분만 다시 그리는 노래방 자막 렌더러입니다. (같은 폴더) 🎨
+from word_alignment import align_words, char_timeline, save_word_srt, save_vtt  # 음성에서 단어별 시간을 찾는 모듈입니다. (같은 폴더) ⏱️
+from audio_archive import SessionAudioArchive  # 재생한 문장 음성을 모아 두는 보관함입니다. (같은 폴더) 🗄️
+from lottie_assets import load_lottie  # Lottie JSON을 메모리/디스크에 캐시해서 불러오는 모듈입니다. (같은 폴더) 🎬
+from openai_client import get_client  # 프로세스 전체에서 함께 쓰는 OpenAI 클라이언트입니다. (같은 폴더) 🔗
+from audio_io import decode_wav, transcribe  # 파일 없이 메모리에서 WAV를 다루는 공용 모듈입니다. (같은 폴더) 🎼
 
 
 # ---------------------------------------------------------
@@ -24,7 +28,12 @@ if not api_key:  # 키가 없으면 경고하고 중단합니다. 🛑
     st.error("❌ OPENAI_API_KEY가 없습니다.")
     st.stop()
 
-client = OpenAI(api_key=api_key)  # OpenAI 클라이언트를 초기화합니다. 🔗
+# 스크립트가 다시 실행될 때마다 새로 만들지 않고, 처음 만든 클라이언트(연결 풀 포함)를 계속 재사용합니다. 🔗
+client = get_client(api_key)
+
+TTS_WORKERS = 4  # 동시에 생성할 TTS 요청 수(Worker Pool 크기)입니다. 🧵
+MEMORY_TOKEN_BUDGET = 1200  # GPT에 원문 그대로 보낼 최근 대화의 최대 토큰 수입니다. 넘치면 오래된 대화는 요약됩니다. 🧠
+SYSTEM_PROMPT = "명확하고 간결하게 답변하라."  # GPT 역할 지시문입니다. 📜
 
 
 # ---------------------------------------------------------
@@ -66,14 +75,10 @@ st.markdown("""
 # 3. Lottie 로더 (Animation Loader)
 # ---------------------------------------------------------
 def load_lottieurl(url):  # Lottie JSON 파일을 URL에서 불러오는 함수입니다. 📥
-    try:
-        r = requests.get(url)  # URL로 요청을 보냅니다. 📨
-        r.raise_for_status()  # 오류가 있으면 예외를 발생시킵니다. 🚨
-        return r.json()  # JSON 데이터를 반환합니다. 📄
-    except:
-        return None  # 실패 시 None 반환 🚫
+    # 스크립트가 다시 실행될 때마다 요청하지 않도록 메모리 → 디스크 캐시 → 네트워크(제한 시간 있음) → 번들 사본 순서로 찾습니다. 🗃️
+    return load_lottie(url)  # JSON 데이터를 반환합니다. 실패 시 None 🚫
 
-# 애니메이션 파일 로드 (파도 모양, 로딩 모양)
+# 애니메이션 파일 로드 (파도 모양, 로딩 모양) — 처음 한 번만 내려받고 이후 실행에서는 캐시를 씁니다.
 lottie_wave = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_tutvdkg0.json") 
 lottie_loading = load_lottieurl("https://assets10.lottiefiles.com/packages/lf20_j1adxtyb.json")
 
@@ -83,16 +88,8 @@ lottie_loading = load_lottieurl("https://assets10.lottiefiles.com/packages/lf20_
 # ---------------------------------------------------------
 def STT(audio_bytes):  # 음성을 텍스트로 변환(STT)하는 함수입니다. 👂
     """Whisper STT"""
-    with open("temp_input.wav", "wb") as f:  # 임시 파일로 저장합니다. 💾
-        f.write(audio_bytes)
-
-    with open("temp_input.wav", "rb") as f:  # 파일을 읽어서 API로 보냅니다. 📤
-        tr = client.audio.transcriptions.create(
-            model="whisper-1",  # Whisper 모델 사용 🤫
-            file=f,
-            language="ko"  # 한국어로 설정 🇰🇷
-        )
-    return tr.text  # 변환된 텍스트 반환 📝
+    # 녹음 바이트를 임시 파일 없이 바로 API로 보냅니다. (동시 사용자끼리 파일 충돌 없음) 📤
+    return transcribe(client, audio_bytes, language="ko")  # 한국어로 변환된 텍스트 반환 🇰🇷📝
 
 
 def ask_gpt(messages, max_tokens=150):  # GPT에게 질문하고 답변을 받는 함수입니다. 🧠
@@ -106,20 +103,31 @@ def ask_gpt(messages, max_tokens=150):  # GPT에게 질문하고 답변을 받
 
 
 def tts_generate(sentence, voice="nova"):  # 텍스트를 음성(WAV)으로 변환하는 함수입니다. 🗣️
-    """TTS 문장 1개 wav 생성"""
+    """TTS 문장 1개 wav 생성 (파일 없이 메모리에서 디코딩)"""
     res = client.audio.speech.create(
         model="tts-1",  # TTS 모델 사용 🔊
         voice=voice,  # 목소리 선택 🎤
         input=sentence,  # 변환할 문장 📄
         response_format="wav"  # WAV 포맷으로 요청 🎼
     )
-    with open("tts.wav", "wb") as f:  # 파일로 저장합니다. 💾
-        f.write(res.content)
-
-    fs, data = read("tts.wav")  # 샘플링 레이트(fs)와 데이터(data)를 읽어옵니다. 📊
+    # 응답 바이트를 파일로 저장하지 않고 복사 없이 바로 디코딩합니다. (동시 호출 시 파일 덮어쓰기 방지) 🧠
+    fs, data = decode_wav(res.content)  # 샘플링 레이트(fs)와 데이터(data)를 읽어옵니다. 📊
     return fs, data
 
 
+def tts_pipeline(sentences, voice="nova", max_workers=TTS_WORKERS):  # 문장별 TTS를 동시에 생성하는 제너레이터입니다. 🧵
+    """모든 문장을 워커 풀에 맡기고, 입력 순서대로 준비되는 즉시 (문장, fs, data)를 넘겨줍니다."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(tts_generate, s, voice) for s in sentences]  # 생산자(Producer): 전부 요청 📤
+        try:
+            for sentence, future in zip(sentences, futures):
+                fs, data = future.result()  # 이 문장의 음성이 준비될 때까지만 기다립니다. ⏳
+                yield sentence, fs, data  # 소비자(Consumer)가 재생하는 동안 뒤 문장은 계속 생성됩니다. ▶️
+        finally:
+            for future in futures:  # 중간에 멈추면 아직 시작하지 않은 요청은 취소합니다. 🛑
+                future.cancel()
+
+
 # ---------------------------------------------------------
 # 5. SRT 자동 생성 (Subtitle Generation)
 # ---------------------------------------------------------
@@ -148,7 +156,7 @@ def save_srt(sentences, durations, filename="result.srt"):  # 자막 파일(SRT)
 # ---------------------------------------------------------
 # 6. Karaoke 모드 (Karaoke Mode)
 # ---------------------------------------------------------
-def karaoke_mode(text, text_placeholder, visualizer_placeholder, voice):  # 자막과 음성을 싱크에 맞춰 재생하는 핵심 함수입니다. 🎤
+def karaoke_mode(text, text_placeholder, visualizer_placeholder, voice, archive):  # 자막과 음성을 싱크에 맞춰 재생하는 핵심 함수입니다. 🎤
 
     # 문장 분리 (Split Sentences)
     sentences = re.split(r'(?<=[.?!])\s+', text)  # 마침표, 물음표, 느낌표 뒤에서 자릅니다. ✂️
@@ -159,101 +167,74 @@ def karaoke_mode(text, text_placeholder, visualizer_placeholder, voice):  # 자
         if lottie_loading:
             st_lottie(lottie_loading, height=100)  # 로딩 애니메이션 표시 ⏳
 
-    audio_segments = []  # 오디오 데이터를 담을 리스트 🎵
-    durations = []  # 재생 시간을 담을 리스트 ⏱️
-
-    # ▶ 문장별 TTS 생성 (Batch Processing)
-    for s in sentences:
-        fs, data = tts_generate(s, voice)  # 음성 생성 요청 🗣️
-        duration = len(data) / fs  # 데이터 길이 / 샘플링 레이트 = 재생 시간(초) 🧮
-
-        audio_segments.append((s, fs, data))  # 결과 저장 📦
-        durations.append(duration)
+    # 재생한 문장 음성과 단어별 시간은 archive(세션 오디오 보관함)에 모읍니다. 🗄️
+    # → MP3/SRT 내보내기를 TTS 재요청 없이 이 데이터로 만듭니다.
 
-    visualizer_placeholder.empty()  # 로딩 애니메이션 지우기 🧹
-
-    with visualizer_placeholder:
-        st.caption("🔊 AI 음성 재생 중…")
-        if lottie_wave:
-            st_lottie(lottie_wave, height=70, loop=True)  # 파형 애니메이션 표시 🌊
-
-    full_log = ""  # 전체 누적 텍스트
+    # 자막 영역: 다 읽은 문장(한 번만 그림) + 지금 읽는 문장(하이라이트 갱신) 🎨
+    with text_placeholder.container():
+        renderer = KaraokeRenderer(st.container(), st.empty())
 
     # ▶ 문장 단위 Karaoke 재생 (Playback Loop)
-    for (sentence, fs, data), duration in zip(audio_segments, durations):
-
-        total_len = len(sentence)  # 문장 글자 수 📏
-        sd.play(data, fs)  # 오디오 재생 시작 ▶️
+    # 문장별 TTS는 백그라운드 워커에서 동시에 생성되고, 1번 문장이 준비되는 즉시 재생을 시작합니다. 🧵
+    for i, (sentence, fs, data) in enumerate(tts_pipeline(sentences, voice)):
 
-        start = time.time()  # 시작 시간 기록 🕒
-        while time.time() - start < duration:  # 오디오가 끝날 때까지 반복 🔄
-
-            progress = (time.time() - start) / duration  # 진행률 계산 (0.0 ~ 1.0) 📊
-            idx = min(total_len, int(total_len * progress))  # 현재 하이라이트할 글자 위치 계산 📍
+        duration = len(data) / fs  # 데이터 길이 / 샘플링 레이트 = 재생 시간(초) 🧮
+        timings = align_words(sentence, data, fs)  # 음량이 줄어드는 쉼을 찾아 단어별 시작/끝 시간 추정 ⏱️
+        archive.add(sentence, fs, data, timings)  # 디코딩된 PCM을 그대로 보관 (복사 없음) 🗄️
 
-            highlighted = sentence[:idx]  # 이미 읽은 부분 (노란색) 🟡
-            remaining = sentence[idx:]  # 앞으로 읽을 부분 (회색) ⚪
+        if i == 0:  # 첫 문장이 준비되면 로딩 애니메이션을 파형 애니메이션으로 바꿉니다. 🔄
+            visualizer_placeholder.empty()  # 로딩 애니메이션 지우기 🧹
 
-            # HTML로 스타일 적용
-            html = (
-                f"{full_log} "
-                f"<span class='karaoke-highlighted'>{highlighted}</span>"
-                f"<span class='karaoke-normal'>{remaining}</span>"
-            )
+            with visualizer_placeholder:
+                st.caption("🔊 AI 음성 재생 중…")
+                if lottie_wave:
+                    st_lottie(lottie_wave, height=70, loop=True)  # 파형 애니메이션 표시 🌊
 
-            text_placeholder.markdown(
-                f"<div class='karaoke-line'>{html}</div>", unsafe_allow_html=True
-            )
+        sd.play(data, fs)  # 오디오 재생 시작 ▶️
+        # 재생 시작 시각(monotonic clock) 기록 🕒 — 하이라이트는 단어별 시간을 따라갑니다.
+        renderer.start(sentence, duration, timeline=char_timeline(sentence, timings, duration))
 
-            time.sleep(0.05)  # 화면 갱신 주기 (0.05초) 💤
+        # 하이라이트 위치가 바뀔 때만 현재 문장을 다시 그립니다. (이미 읽은 부분 🟡 / 앞으로 읽을 부분 ⚪)
+        renderer.play()
 
         sd.wait()  # 오디오 재생이 완전히 끝날 때까지 대기 ⏹️
 
-        # 문장 완료 → 평문으로 기록하고 다음 문장으로 넘어감
-        full_log += " " + sentence
-        text_placeholder.markdown(full_log)
+        # 문장 완료 → 완료 영역에 평문으로 한 번 추가하고 다음 문장으로 넘어감
+        renderer.finish()
 
     visualizer_placeholder.empty()  # 애니메이션 종료 🛑
 
-    # ▶ SRT 생성 (Create SRT File)
-    save_srt(sentences, durations)
+    # ▶ SRT 생성 (Create SRT File) — 문장 단위 + 단어 단위(SRT/VTT)
+    # 보관함 전체(세션 오디오) 기준으로 만들어서 MP3 내보내기와 시간이 정확히 맞습니다.
+    save_srt(archive.sentences, archive.durations)
+    save_word_srt(archive.word_timings())
+    save_vtt(archive.word_timings())
 
 
 # ---------------------------------------------------------
 # 7. PDF 저장 (Save as PDF)
 # ---------------------------------------------------------
 def save_pdf(text, filename="result.pdf"):
-    pdf = FPDF()
-    pdf.add_page()
-    try:
-        # 한글 폰트 설정 (Windows 기준) 🔤
-        pdf.add_font("malgun", "", r"C:\\Windows\\Fonts\\malgun.ttf", uni=True)
-        pdf.set_font("malgun", size=12)
-    except:
-        pdf.set_font("Arial", size=12)  # 실패 시 기본 영문 폰트 사용 🅰️
-
-    for line in text.split("\n"):
-        pdf.multi_cell(0, 8, line)  # 줄바꿈 처리하여 쓰기 📝
-    pdf.output(filename)
+    # 한글 폰트는 서비스가 한 번만 찾아서 읽어 두고 재사용합니다. (PDF_FONT_PATH로 지정 가능) 🔤
+    # 생성은 백그라운드 프로세스에서 진행되므로 화면이 멈추지 않습니다. 작업 핸들(PDFJob)을 반환합니다. 🎫
+    return get_pdf_service().submit(text, filename=filename)
 
 
 # ---------------------------------------------------------
 # 8. 전체 MP3 저장 (Save Full MP3)
 # ---------------------------------------------------------
-def save_mp3(text, filename="result.mp3", voice="nova"):
+def save_mp3(archive, filename="result.mp3"):
+    # 이미 재생한 문장 음성을 이어 붙여 로컬에서 인코딩합니다. (TTS 재요청 없음 → 즉시, 비용 0) 🗄️
+    # lameenc가 없으면 MP3 대신 WAV로 저장하고, 실제로 저장한 파일 이름을 반환합니다.
     try:
-        res = client.audio.speech.create(
-            model="tts-1",
-            voice=voice,
-            input=text,
-            response_format="mp3"
-        )
+        audio_bytes, ext = archive.export_audio()
+        filename = os.path.splitext(filename)[0] + "." + ext
         with open(filename, "wb") as f:
-            f.write(res.content)
-        return True
+            f.write(audio_bytes)
+        return filename
     except Exception as e:
         st.error(f"MP3 저장 오류: {e}")
-        return False
+        return None
 
 
 # ---------------------------------------------------------
@@ -263,7 +244,15 @@ if "messages" not in st.session_state:
     st.session_state.messages = []  # 대화 기록 초기화 🆕
 
 if "full_text" not in st.session_state:
-    st.session_state.full_text = ""  # 전체 텍스트 기록 초기화 📝
+    st.session_state.full_text = ""  # 전체 텍스트 기록 초기화 📝 (TXT/PDF 내보내기용)
+
+if "memory" not in st.session_state:
+    # GPT에 보낼 대화 기억 (최근 대화 원문 + 오래된 대화 요약) 🧠
+    # 화면에 보여줄 messages와 달리 크기가 일정하게 유지되어 긴 대화에서도 요청 비용이 늘지 않습니다.
+    st.session_state.memory = ConversationMemory(MEMORY_TOKEN_BUDGET, summarize=gpt_summarizer(client))
+
+if "audio_archive" not in st.session_state:
+    st.session_state.audio_archive = SessionAudioArchive()  # 재생한 문장 음성 보관함 (MP3/SRT 내보내기용) 🗄️
 
 
 # ---------------------------------------------------------
@@ -298,29 +287,60 @@ with st.sidebar:
 
     # PDF 저장 버튼
     if st.button("📄 PDF 저장"):
-        save_pdf(st.session_state.full_text)
-        st.success("PDF 저장 완료!")
+        st.session_state.pdf_job = save_pdf(st.session_state.full_text)
+
+    pdf_job = st.session_state.get("pdf_job")
+    if pdf_job is not None:
+        if not pdf_job.done():
+            st.info("📄 PDF 생성 중… (잠시 후 다시 확인하세요)")
+        else:
+            try:
+                pdf_job.result()
+                st.success("PDF 저장 완료!")
+                with open(pdf_job.filename, "rb") as f:
+                    st.download_button("⬇ PDF 다운로드", f, pdf_job.filename)
+            except Exception as e:
+                st.error(f"PDF 저장 오류: {e}")
 
     # MP3 저장 및 다운로드 버튼
     if st.button("🎵 MP3 저장"):
-        if save_mp3(st.session_state.full_text, "result.mp3", tts_voice):
-            with open("result.mp3", "rb") as f:
-                st.download_button("⬇ MP3 다운로드", f, "result.mp3")
+        if not len(st.session_state.audio_archive):
+            st.warning("먼저 AI 음성을 생성하세요.")
+        else:
+            saved = save_mp3(st.session_state.audio_archive, "result.mp3")
+            if saved:
+                with open(saved, "rb") as f:
+                    st.download_button(f"⬇ {saved} 다운로드", f, saved)
 
     # SRT 저장 및 다운로드 버튼
     if st.button("🎼 SRT 저장"):
         if os.path.exists("result.srt"):
             with open("result.srt", "rb") as f:
                 st.download_button("⬇ SRT 다운로드", f, "result.srt")
+            # 단어 단위 자막 (단어마다 한 줄인 SRT, 단어 시각 태그가 들어간 VTT)
+            for name in ("result_words.srt", "result.vtt"):
+                if os.path.exists(name):
+                    with open(name, "rb") as f:
+                        st.download_button(f"⬇ {name} 다운로드", f, name)
         else:
             st.warning("먼저 AI 음성을 생성해 SRT 파일을 만드세요.")
 
     st.markdown("---")
 
+    # 🧠 대화 기억 상태 (GPT에 실제로 보내는 크기)
+    memory = st.session_state.memory
+    st.caption(
+        f"🧠 기억: 최근 메시지 {len(memory.recent)}개 · 약 {memory.total_tokens}토큰"
+        + (" (이전 대화는 요약됨)" if memory.summary else "")
+    )
+
     # 🔄 전체 초기화 버튼
     if st.button("🔄 전체 초기화"):
         st.session_state.messages = []
         st.session_state.full_text = ""
+        st.session_state.memory.clear()
+        st.session_state.audio_archive.clear()
+        st.session_state.pdf_job = None
         st.rerun()  # 앱 재실행 🔄
 
     # ⛔ 종료 버튼
@@ -370,19 +390,20 @@ if audio or text_input:  # 녹음이 되거나 텍스트가 입력되면 실행
         with st.chat_message("user"):  # 사용자 메시지 표시
             st.markdown(user_text)
 
-        st.session_state.messages.append({"role": "user", "content": user_text})  # 세션에 저장 💾
+        st.session_state.messages.append({"role": "user", "content": user_text})  # 화면 표시용으로 저장 💾
+        st.session_state.memory.add("user", user_text)  # GPT 기억에 추가 🧠
 
         st.info("🤖 GPT 답변 생성 중…")
 
-        # GPT에게 답변 요청 (이전 대화 내역 포함)
+        # GPT에게 답변 요청 (전체 대화 대신 요약 + 최근 대화만 보내므로 요청 크기가 일정합니다)
         ai_text = ask_gpt(
-            [{"role": "system", "content": "명확하고 간결하게 답변하라."}] +
-            st.session_state.messages,
+            st.session_state.memory.messages(SYSTEM_PROMPT),
             max_tokens=max_tokens
         )
 
         st.session_state.full_text += f"\nAI: {ai_text}"  # 전체 기록에 AI 답변 추가 ➕
-        st.session_state.messages.append({"role": "assistant", "content": ai_text})  # 세션에 저장 💾
+        st.session_state.messages.append({"role": "assistant", "content": ai_text})  # 화면 표시용으로 저장 💾
+        st.session_state.memory.add("assistant", ai_text)  # 예산을 넘으면 오래된 대화가 요약됩니다. 🧠
 
         with st.chat_message("assistant"):  # AI 메시지 영역 🤖
 
@@ -390,4 +411,5 @@ if audio or text_input:  # 녹음이 되거나 텍스트가 입력되면 실행
             text_placeholder = st.empty()  # 자막을 보여줄 빈 공간 확보 📺
 
             # 노래방 모드 실행 (음성 재생 + 자막 하이라이트) 🎤
-            karaoke_mode(ai_text, text_placeholder, visual_placeholder, voice=tts_voice)
+            karaoke_mode(ai_text, text_placeholder, visual_placeholder, voice=tts_voice,
+                         archive=st.session_state.audio_archive)
@@ -0,0 +1,163 @@
+# ------------------------------------------------------------
+# assistant_registry.py
+# Assistants API 재사용 도우미
+#  - AssistantRegistry : 같은 설정(이름/모델/지시문)의 Assistant id를 파일에 저장해
+#                        실행할 때마다 새로 만들지 않고 재사용합니다.
+#  - WarmThreadPool    : 한 번 실행하는 동안 미리 만들어 둔 Thread를 꺼내 쓰고, 모자란 만큼만
+#                        백그라운드에서 채웁니다. (질문마다 threads.create 왕복을 기다리지 않음)
+#                        close()에서 이 풀이 만든 Thread를 모두 지웁니다. (서버에 쌓이지 않음)
+# OPENAI_BASE_URL 환경변수로 로컬 목(mock) 서버를 지정하면 그대로 테스트할 수 있습니다.
+# ------------------------------------------------------------
+import hashlib
+import json
+import os
+import queue
+import threading
+
+from openai import NotFoundError
+
+REGISTRY_PATH = "assistants.json"
+
+
+# ------------------------------------------------------------
+# 1) Assistant id 레지스트리
+# ------------------------------------------------------------
+class AssistantRegistry:
+    """설정 해시 → Assistant id 를 JSON 파일에 저장하고 재사용합니다."""
+
+    def __init__(self, client, path=REGISTRY_PATH):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name, model, instructions):
+        payload = json.dumps([name, model, instructions], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self, data):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)  # 쓰는 도중 중단돼도 기존 파일이 깨지지 않게 교체합니다.
+
+    def get_or_create(self, name, instructions, model):
+        """저장된 Assistant가 서버에 아직 있으면 그 id를, 없으면 새로 만들어 저장한 id를 반환합니다."""
+        key = self.make_key(name, model, instructions)
+
+        with self._lock:
+            data = self._load()
+            assistant_id = data.get(key)
+
+            if assistant_id:
+                try:
+                    self.client.beta.assistants.retrieve(assistant_id)
+                    return assistant_id
+                except NotFoundError:
+                    pass  # 서버에서 삭제되었으면 새로 만듭니다.
+
+            assistant = self.client.beta.assistants.create(
+                name=name,
+                instructions=instructions,
+                model=model,
+            )
+            data[key] = assistant.id
+            self._save(data)
+            return assistant.id
+
+
+# ------------------------------------------------------------
+# 2) 미리 만들어 둔 Thread 풀
+# ------------------------------------------------------------
+class WarmThreadPool:
+    """
+    Thread(대화 공간)를 size개 미리 만들어 둡니다.
+    acquire()는 준비된 Thread를 바로 꺼내 주고, 준비 수가 size보다 적을 때만 백그라운드에서 다시 채웁니다.
+    질문끼리 대화 문맥이 섞이지 않도록 한 번 쓴 Thread는 다시 나눠 주지 않습니다.
+    limit을 주면 전체로 그 수까지만 만들고, close()(또는 with 블록 종료)에서 이 풀이 만든 Thread를
+    (나눠 준 것, 남은 것 모두) 서버에서 지웁니다.
+    풀은 메모리에만 있으므로 실행이 끝나면 사라집니다. (실행 사이에 Thread를 이어 쓰지 않음)
+    """
+
+    def __init__(self, client, size=4, limit=None):
+        self.client = client
+        self.size = size
+        self.limit = limit  # 전체로 만들 Thread 수 상한 (None이면 제한 없음)
+        self._ready = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0  # 백그라운드에서 만드는 중인 Thread 수
+        self._created = 0  # 지금까지 만들기 시작한 Thread 수
+        self._handed_out = []  # acquire()로 나눠 준 Thread id (close()에서 지움)
+        self._closed = False
+        self._top_up()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _create(self):
+        try:
+            thread_id = self.client.beta.threads.create().id
+        except Exception as e:
+            print(f"⚠️ Thread 미리 만들기 실패: {e}")
+            thread_id = None
+
+        with self._lock:
+            self._pending -= 1
+            if thread_id is None:
+                self._created -= 1
+                return
+            if not self._closed:
+                self._ready.put(thread_id)
+                return
+        self._delete(thread_id)  # 만드는 사이에 풀이 닫혔으면 바로 지웁니다.
+
+    def _top_up(self):
+        """준비된 것 + 만드는 중인 것이 size보다 적을 때만 새로 만듭니다."""
+        with self._lock:
+            while (not self._closed
+                   and self._ready.qsize() + self._pending < self.size
+                   and (self.limit is None or self._created < self.limit)):
+                self._pending += 1
+                self._created += 1
+                threading.Thread(target=self._create, daemon=True).start()
+
+    def _delete(self, thread_id):
+        try:
+            self.client.beta.threads.delete(thread_id)
+        except Exception as e:
+            print(f"⚠️ Thread 삭제 실패 ({thread_id}): {e}")
+
+    def acquire(self):
+        """준비된 Thread id를 반환합니다. 아직 준비된 것이 없으면 그 자리에서 만듭니다."""
+        try:
+            thread_id = self._ready.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self._created += 1
+            thread_id = self.client.beta.threads.create().id
+        with self._lock:
+            self._handed_out.append(thread_id)
+        self._top_up()
+        return thread_id
+
+    def close(self):
+        """나눠 준 Thread와 쓰지 않고 남은 Thread를 서버에서 지웁니다. (만드는 중인 것은 완성되는 대로 지움)"""
+        with self._lock:
+            self._closed = True
+            handed_out, self._handed_out = self._handed_out, []
+        for thread_id in handed_out:
+            self._delete(thread_id)  # 답변을 이미 받았으므로 서버에 쌓아 둘 필요가 없습니다.
+        while True:
+            try:
+                self._delete(self._ready.get_nowait())
+            except queue.Empty:
+                break
@@ -0,0 +1,87 @@
+# ------------------------------------------------------------
+# audio_archive.py
+# 세션 오디오 보관함 (노래방 모드에서 만든 문장별 음성을 그대로 모아 둠)
+#  - 문장마다 디코딩된 PCM(numpy 배열)과 단어별 시간을 보관합니다.
+#  - 내보내기(MP3/WAV, SRT/VTT)는 보관된 구간을 이어 붙여 로컬에서 만듭니다.
+#    → TTS API를 다시 부르지 않으므로 즉시 끝나고 비용도 들지 않습니다.
+#  - 자막 시간은 이어 붙인 오디오의 실제 샘플 위치로 계산하므로 소리와 정확히 맞습니다.
+#  - MP3 인코딩은 lameenc(선택 사항)가 있으면 사용하고, 없으면 WAV로 내보냅니다.
+# ------------------------------------------------------------
+import numpy as np
+
+from audio_io import encode_wav
+
+
+class SessionAudioArchive:
+    """문장별 (문장, fs, PCM, 단어별 시간)을 순서대로 보관합니다. 오래된 문장부터 max_seconds까지만 유지합니다."""
+
+    def __init__(self, max_seconds=1800.0):
+        self.max_seconds = max_seconds
+        self.clear()
+
+    def clear(self):
+        self.segments = []  # [(문장, fs, data, timings)]
+        self._seconds = 0.0
+
+    def __len__(self):
+        return len(self.segments)
+
+    def add(self, sentence, fs, data, timings=None):
+        """재생한 문장 음성을 보관합니다. (data는 복사하지 않고 그대로 참조)"""
+        if self.segments and fs != self.segments[0][1]:
+            raise ValueError(f"샘플링 레이트가 다릅니다. ({self.segments[0][1]} → {fs})")
+        self.segments.append((sentence, fs, data, timings or []))
+        self._seconds += len(data) / fs
+        while self._seconds > self.max_seconds and len(self.segments) > 1:
+            _, old_fs, old, _ = self.segments.pop(0)
+            self._seconds -= len(old) / old_fs
+
+    @property
+    def sentences(self):
+        return [s for s, _, _, _ in self.segments]
+
+    @property
+    def durations(self):
+        return [len(data) / fs for _, fs, data, _ in self.segments]
+
+    def word_timings(self):
+        """[(문장 시작 초, [(단어, 시작, 끝), ...]), ...] — word_alignment의 SRT/VTT 저장 함수 형식"""
+        offsets = np.concatenate(([0.0], np.cumsum(self.durations)))
+        return [(float(offset), timings) for offset, (_, _, _, timings) in zip(offsets, self.segments)]
+
+    # -------------------------------
+    # 오디오 내보내기
+    # -------------------------------
+    def pcm(self):
+        """보관된 문장 음성을 하나의 배열로 이어 붙여 (fs, data)로 반환합니다."""
+        if not self.segments:
+            return 0, np.zeros(0, dtype=np.int16)
+        fs = self.segments[0][1]
+        return fs, np.concatenate([data for _, _, data, _ in self.segments])
+
+    def to_wav(self):
+        fs, data = self.pcm()
+        return encode_wav(data, fs)
+
+    def to_mp3(self, bitrate=128):
+        """lameenc로 MP3 바이트를 만듭니다. (lameenc가 없으면 ImportError)"""
+        import lameenc  # 선택 사항: pip install lameenc
+
+        fs, data = self.pcm()
+        if data.dtype != np.int16:
+            data = (np.clip(data, -1.0, 1.0) * 32767).astype(np.int16)  # float PCM → int16
+        channels = 1 if data.ndim == 1 else data.shape[1]
+
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(bitrate)
+        encoder.set_in_sample_rate(fs)
+        encoder.set_channels(channels)
+        encoder.set_quality(2)
+        return bytes(encoder.encode(np.ascontiguousarray(data).tobytes()) + encoder.flush())
+
+    def export_audio(self):
+        """(오디오 바이트, 확장자)를 반환합니다. MP3를 만들 수 없으면 WAV로 대신합니다."""
+        try:
+            return self.to_mp3(), "mp3"
+        except ImportError:
+            return self.to_wav(), "wav"
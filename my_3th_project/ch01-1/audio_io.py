@@ -0,0 +1,142 @@
+# ------------------------------------------------------------
+# audio_io.py
+# STT/TTS 공용 오디오 입출력 도우미
+# - 녹음 데이터 → WAV 바이트 (파일 저장 없음)
+# - WAV 바이트 → (fs, numpy 배열) (복사 없이 버퍼를 그대로 사용)
+# - 바이트를 Whisper API에 바로 업로드
+# - MP3 바이트 재생 (playsound용 고유 임시 파일 사용)
+# 고정된 파일 이름(input.wav, tts.wav 등)을 쓰지 않으므로
+# 여러 세션이 동시에 실행되어도 서로의 파일을 덮어쓰지 않습니다.
+# ------------------------------------------------------------
+import io
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+# WAV fmt 청크의 포맷 코드
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+# ------------------------------------------------------------
+# 1. WAV 인코딩 (numpy 배열 → WAV 바이트)
+# ------------------------------------------------------------
+def encode_wav(samples, fs):
+    """PCM/float 샘플 배열을 WAV 바이트로 만듭니다. (scipy wav.write와 같은 형식)"""
+    samples = np.ascontiguousarray(samples)
+    samples = samples.astype(samples.dtype.newbyteorder("<"), copy=False)  # WAV는 리틀 엔디언
+
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    fmt_tag = WAVE_FORMAT_IEEE_FLOAT if samples.dtype.kind == "f" else WAVE_FORMAT_PCM
+    block_align = channels * samples.dtype.itemsize
+    data_size = samples.nbytes
+
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, fmt_tag, channels, fs, fs * block_align, block_align,
+        samples.dtype.itemsize * 8,
+        b"data", data_size,
+    )
+    # 헤더와 샘플 버퍼를 한 번에 이어 붙입니다. (중간 tobytes() 복사 없음)
+    return b"".join((header, memoryview(samples).cast("B")))
+
+
+# ------------------------------------------------------------
+# 2. WAV 디코딩 (WAV 바이트 → fs, numpy 배열)
+# ------------------------------------------------------------
+def _wav_dtype(fmt_tag, bits):
+    if fmt_tag == WAVE_FORMAT_PCM:
+        if bits == 8:
+            return np.dtype("u1")
+        if bits in (16, 32):
+            return np.dtype(f"<i{bits // 8}")
+    elif fmt_tag == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        return np.dtype(f"<f{bits // 8}")
+    raise ValueError(f"지원하지 않는 WAV 형식입니다. (format={fmt_tag}, bits={bits})")
+
+
+def decode_wav(wav_bytes):
+    """
+    WAV 바이트를 (샘플링 레이트, numpy 배열)로 읽습니다.
+    배열은 입력 버퍼를 그대로 가리키므로(np.frombuffer) 데이터 복사가 없습니다.
+    TTS 스트리밍 응답처럼 data 청크 크기가 비어 있거나(0xFFFFFFFF) 실제보다 큰 경우에도
+    버퍼 끝까지를 데이터로 사용합니다.
+    """
+    buf = memoryview(wav_bytes).cast("B")
+    if len(buf) < 12 or buf[0:4] != b"RIFF" or buf[8:12] != b"WAVE":
+        raise ValueError("WAV(RIFF) 데이터가 아닙니다.")
+
+    pos = 12
+    fmt = None
+    while pos + 8 <= len(buf):
+        chunk_id = buf[pos:pos + 4].tobytes()
+        size = struct.unpack_from("<I", buf, pos + 4)[0]
+        body = pos + 8
+
+        if chunk_id == b"fmt ":
+            fmt_tag, channels, fs, _, _, bits = struct.unpack_from("<HHIIHH", buf, body)
+            if fmt_tag == WAVE_FORMAT_EXTENSIBLE:
+                # 확장 포맷은 SubFormat GUID 앞 2바이트가 실제 포맷 코드입니다.
+                fmt_tag = struct.unpack_from("<H", buf, body + 24)[0]
+            fmt = (_wav_dtype(fmt_tag, bits), channels, fs)
+
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV fmt 청크가 data 청크보다 먼저 나와야 합니다.")
+            dtype, channels, fs = fmt
+            end = min(body + size, len(buf))
+            frames = (end - body) // (dtype.itemsize * channels)
+            data = np.frombuffer(buf, dtype=dtype, count=frames * channels, offset=body)
+            if channels > 1:
+                data = data.reshape(-1, channels)
+            return fs, data
+
+        pos = body + size + (size & 1)  # 청크는 짝수 바이트 단위로 정렬됩니다.
+
+    raise ValueError("WAV data 청크를 찾을 수 없습니다.")
+
+
+# ------------------------------------------------------------
+# 3. Whisper 업로드 (파일 없이 바이트 그대로)
+# ------------------------------------------------------------
+def transcribe(client, audio, language="ko", model="whisper-1", filename="input.wav"):
+    """
+    오디오 바이트(bytes, bytearray, memoryview)를 파일 저장 없이 Whisper로 보냅니다.
+    filename은 서버가 형식을 알아보는 데만 쓰이며 디스크에는 아무것도 만들지 않습니다.
+    """
+    if not isinstance(audio, bytes):
+        audio = io.BytesIO(audio)
+
+    options = {"language": language} if language else {}
+    result = client.audio.transcriptions.create(
+        model=model,
+        file=(filename, audio),
+        **options
+    )
+    return result.text
+
+
+# ------------------------------------------------------------
+# 4. MP3 바이트 재생 (playsound)
+# ------------------------------------------------------------
+def play_mp3_bytes(mp3_bytes):
+    """
+    playsound는 파일 경로만 받으므로 호출마다 고유한 임시 파일에 쓰고, 재생이 끝나면 지웁니다.
+    (reply_시간.mp3 처럼 같은 초에 겹칠 수 있는 이름을 쓰지 않습니다.)
+    """
+    from playsound import playsound  # 재생할 때만 필요한 라이브러리입니다.
+
+    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+        f.write(mp3_bytes)
+        path = f.name
+    try:
+        playsound(path)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,7 +1,11 @@
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
-import csv
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from population_store import PopulationStore
+from assistant_registry import AssistantRegistry, WarmThreadPool
 
 # ------------------------------------------------------------
 # 1) 자치구 코드 매핑
@@ -28,8 +32,22 @@ GU_CODE_PREFIX = {
 #    - CSV 파일 구조는 서울열린데이터광장 "생활인구" 데이터를 기준으로 만들어졌습니다.
 #    - 행정동코드 앞 5자리(prefix)로 구 구분
 #    - "생활인구합계" 열의 값들을 모두 더해 최종 구별 인구를 계산합니다.
+#    - CSV는 처음 한 번만 읽어 열 단위 캐시(seoul_population.cache/)로 저장하고,
+#      이후 조회는 캐시의 구 인덱스로 바로 계산합니다. (population_store.py)
 # ------------------------------------------------------------
-def load_population_by_gu(csv_path: str, gu_name: str) -> float:
+_stores = {}  # CSV 경로별로 열어 둔 PopulationStore (같은 실행 안에서 재사용)
+_stores_lock = threading.Lock()  # 여러 스레드가 동시에 캐시(.npy)를 만들지 않도록 잠급니다.
+
+
+def get_population_store(csv_path: str) -> PopulationStore:
+    """CSV 경로에 해당하는 열 단위 캐시를 열어 반환합니다. (없으면 한 번 생성)"""
+    with _stores_lock:
+        if csv_path not in _stores:
+            _stores[csv_path] = PopulationStore.open(csv_path)
+        return _stores[csv_path]
+
+
+def load_population_by_gu(csv_path: str, gu_name: str, hours=None) -> float:
     """행정동코드 앞 5자리 기준으로 특정 구의 생활인구 합계를 계산합니다."""
 
     # 해당 구의 코드 prefix 찾기
@@ -37,76 +55,119 @@ def load_population_by_gu(csv_path: str, gu_name: str) -> float:
     if prefix is None:
         raise ValueError(f"{gu_name}은(는) 지원되지 않는 구 이름입니다.")
 
-    total = 0.0
+    # '*' 처럼 비공개 데이터는 캐시를 만들 때 NaN으로 바뀌어 합계에서 빠집니다.
+    # hours=[8, 9] 처럼 시간대를 주면 해당 시간대의 합계만 계산합니다.
+    return get_population_store(csv_path).gu_total(prefix, hours)
 
-    # CSV는 euc-kr 인코딩인 경우가 일반적
-    with open(csv_path, "r", encoding="euc-kr") as f:
-        reader = csv.DictReader(f)
 
-        for row in reader:
-            code = row["행정동코드"].strip()
+# ------------------------------------------------------------
+# 2-1) 모든 구의 생활인구를 한 번에 계산하는 함수
+#    - load_population_by_gu를 구마다 부르지 않고, CSV 한 번 읽기(캐시 생성)로
+#      GU_CODE_PREFIX의 모든 구를 행정동코드 앞 5자리로 묶어 집계합니다.
+#    - '*' 비공개 값은 마스크(NaN) 처리되어 합계에서 빠지고, 개수는 따로 셉니다.
+# ------------------------------------------------------------
+def load_population_all_gu(csv_path: str) -> dict:
+    """GU_CODE_PREFIX의 모든 구에 대해 생활인구 합계/순위/비중 표를 반환합니다."""
 
-            # 코드가 prefix로 시작하면 해당 구에 속한 동
-            if code.startswith(prefix):
+    table = get_population_store(csv_path).gu_table()
+    empty = {"population": 0.0, "rows": 0, "suppressed": 0}
 
-                # 생활인구합계(문자열)을 float으로 변환
-                val = row["생활인구합계"].strip()
+    # 구 이름 기준 표로 바꾸기
+    result = {
+        gu_name: {"prefix": prefix, **table.get(prefix, empty)}
+        for gu_name, prefix in GU_CODE_PREFIX.items()
+    }
 
-                # '*' 처럼 비공개 데이터는 float 변환 실패 → 건너뛰기
-                try:
-                    total += float(val)
-                except ValueError:
-                    continue
+    # 생활인구가 많은 순서로 순위와 전체 대비 비중(%) 추가
+    grand_total = sum(row["population"] for row in result.values())
+    ranked = sorted(result, key=lambda name: result[name]["population"], reverse=True)
+    for rank, gu_name in enumerate(ranked, start=1):
+        row = result[gu_name]
+        row["rank"] = rank
+        row["share"] = row["population"] / grand_total * 100 if grand_total else 0.0
 
-    return total
+    return result
 
 
 # ------------------------------------------------------------
-# 3) Assistant에게 질문하고 답변을 받아 출력하는 함수
+# 3) Assistant에게 질문하고 답변을 받아 반환하는 함수
 #    - Assistants API 기반 (deprecated이지만 여전히 동작)
 #    - 구별 생활인구 값을 전달하고, GPT가 분석 설명하도록 요청
+#    - thread_pool을 주면 미리 만들어 둔 Thread를 꺼내 씁니다.
+#    - table을 주면 이미 계산해 둔 구별 생활인구 표를 그대로 씁니다.
 # ------------------------------------------------------------
-def ask_about_gu(client: OpenAI, assistant_id: str, gu_name: str):
+def ask_about_gu(client: OpenAI, assistant_id: str, gu_name: str,
+                 thread_pool: WarmThreadPool = None, table: dict = None) -> str:
 
-    # 1) CSV에서 해당 구의 생활인구 합계 계산
-    population = load_population_by_gu("seoul_population.csv", gu_name)
+    # 1) CSV에서 모든 구의 생활인구 표를 계산 (비교용 실제 수치)
+    if table is None:
+        table = load_population_all_gu("seoul_population.csv")
+    if gu_name not in table:
+        raise ValueError(f"{gu_name}은(는) 지원되지 않는 구 이름입니다.")
+    population = table[gu_name]["population"]
 
-    # 2) Thread 생성 (대화 공간 만들기)
-    thread = client.beta.threads.create()
+    comparison = "\n".join(
+        f"- {name}: {row['population']:,.0f}명 ({row['rank']}위, {row['share']:.1f}%)"
+        for name, row in sorted(table.items(), key=lambda item: item[1]["rank"])
+    )
+
+    # 2) Thread 준비 (대화 공간: 풀에 미리 만들어 둔 것이 있으면 사용)
+    if thread_pool is not None:
+        thread_id = thread_pool.acquire()
+    else:
+        thread_id = client.beta.threads.create().id
 
     # 3) 사용자 메시지 구성
     user_message = (
         f"다음은 서울시 {gu_name}의 생활인구 합계입니다.\n\n"
         f"- 구 이름: {gu_name}\n"
-        f"- 생활인구 합계: {population:,.0f}명\n\n"
+        f"- 생활인구 합계: {population:,.0f}명\n"
+        f"- 순위: {len(table)}개 구 중 {table[gu_name]['rank']}위\n\n"
+        f"[비교 대상 구별 생활인구 합계]\n{comparison}\n\n"
         "이 수치를 바탕으로, 이 구의 인구 규모를 설명해 주세요. "
-        "서울의 다른 구들과 비교했을 때 대략 어느 정도 수준인지도 함께 설명해 주세요."
+        "위 표의 다른 구들과 비교했을 때 어느 정도 수준인지도 함께 설명해 주세요."
     )
 
     # 4) 사용자 메시지를 Thread에 입력
     client.beta.threads.messages.create(
-        thread_id=thread.id,
+        thread_id=thread_id,
         role="user",
         content=user_message,
     )
 
     # 5) Assistant 실행 + 완료될 때까지 대기
     run = client.beta.threads.runs.create_and_poll(
-        thread_id=thread.id,
+        thread_id=thread_id,
         assistant_id=assistant_id,
     )
 
     # 6) Assistant의 답변 메시지 조회
-    messages = client.beta.threads.messages.list(thread_id=thread.id)
+    messages = client.beta.threads.messages.list(thread_id=thread_id)
 
-    # 가장 마지막 assistant 메시지를 찾아 출력
+    # 가장 마지막 assistant 메시지를 찾아 텍스트 반환
     for msg in reversed(messages.data):
         if msg.role == "assistant":
-            for c in msg.content:
-                if c.type == "text":
-                    print("\n[assistant]")
-                    print(c.text.value)
-            break
+            return "\n".join(c.text.value for c in msg.content if c.type == "text")
+    return ""
+
+
+# ------------------------------------------------------------
+# 3-1) 여러 구를 동시에 질문하는 함수
+#    - 구마다 run 완료를 기다리는 시간(polling)이 대부분이므로,
+#      질문을 한꺼번에 제출하고 끝나는 순서대로 (구 이름, 답변)을 돌려줍니다.
+#    - 생활인구 표는 질문을 나눠 보내기 전에 한 번만 계산해서 모든 작업에 넘겨줍니다.
+# ------------------------------------------------------------
+def ask_many_gu(client: OpenAI, assistant_id: str, gu_names: list,
+                thread_pool: WarmThreadPool = None, max_workers: int = 4):
+    """여러 구의 질문을 동시에 실행하고, 완료되는 대로 (구 이름, 답변)을 yield 합니다."""
+    table = load_population_all_gu("seoul_population.csv")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(ask_about_gu, client, assistant_id, gu_name, thread_pool, table): gu_name
+            for gu_name in gu_names
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
 
 
 # ------------------------------------------------------------
@@ -118,8 +179,9 @@ if __name__ == "__main__":
     load_dotenv()
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-    # 1) Assistant 생성
-    assistant = client.beta.assistants.create(
+    # 1) Assistant 준비 (assistants.json에 저장된 id가 있으면 재사용, 없으면 생성)
+    registry = AssistantRegistry(client)
+    assistant_id = registry.get_or_create(
         name="서울시 인구 전문가",
         instructions=(
             "당신은 서울시 각 구의 생활인구 통계를 이해하기 쉽게 설명해 주는 전문가입니다. "
@@ -128,8 +190,13 @@ if __name__ == "__main__":
         model="gpt-4.1-mini",
     )
 
-    print("생성된 Assistant id:", assistant.id)
+    print("사용할 Assistant id:", assistant_id)
 
-    # 2) 종로구 인구를 GPT에게 설명 요청
-    ask_about_gu(client, assistant.id, "종로구")
+    # 2) 구 인구를 GPT에게 설명 요청 (예: python ch01ex01.py 종로구 중구 용산구)
+    gu_names = sys.argv[1:] or ["종로구"]
+    # 질문 수만큼만 Thread를 만들고, 끝나면 만든 Thread를 모두 지웁니다.
+    with WarmThreadPool(client, size=min(len(gu_names), 4), limit=len(gu_names)) as thread_pool:
+        for gu_name, answer in ask_many_gu(client, assistant_id, gu_names, thread_pool):
+            print(f"\n[assistant] {gu_name}")
+            print(answer)
 
@@ -5,6 +5,7 @@ from openai import OpenAI           # OpenAI API 사용 라이브러리
 from dotenv import load_dotenv      # .env 파일에서 환경변수 로드
 import numpy as np                 # 코사인 유사도 계산용
 import os                          # 환경 변수 접근용
+from vector_store import EmbeddingStore  # 임베딩 벡터 저장소 (같은 폴더의 vector_store.py)
 
 
 # ------------------------------------------------------------
@@ -50,6 +51,26 @@ similarity = cosine_similarity(vec1, vec2)
 print("코사인 유사도:", similarity)
 
 
+# ------------------------------------------------------------
+# 6.3 임베딩 벡터 저장소 (여러 문장 → 한 번의 요청, 행렬 곱 한 번으로 검색)
+# ------------------------------------------------------------
+# - add_texts : 문장 여러 개를 묶어서(batch) 한 번에 임베딩하고 embeddings/ 폴더에 저장
+# - search    : 저장된 모든 벡터와의 코사인 유사도를 행렬-벡터 곱 한 번으로 계산해 상위 k개 반환
+store = EmbeddingStore(client, path="embeddings")
+
+documents = [
+    "서울시는 대한민국의 수도입니다.",
+    "부산은 대한민국 제2의 도시이자 항구 도시입니다.",
+    "생성형 AI로 광고 카피를 빠르게 만들 수 있습니다.",
+    "유튜브 쇼츠는 첫 3초가 가장 중요합니다.",
+    "인스타그램 포스팅에는 해시태그가 중요합니다.",
+]
+store.add_texts(documents)  # 5개 문장을 요청 1번으로 임베딩
+
+for doc_id, score in store.search("한국의 수도는 어디인가요?", k=3):
+    print(f"유사도 {score:.3f} : {doc_id}")
+
+
 # ------------------------------------------------------------
 # 7. Whisper (음성 → 텍스트) / TTS (텍스트 → 음성)
 # ------------------------------------------------------------
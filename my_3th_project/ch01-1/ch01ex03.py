@@ -4,11 +4,10 @@
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
-import sounddevice as sd
 import scipy.io.wavfile as wav
-import numpy as np
 import time
 from playsound import playsound
+from vad_recorder import VADRecorder  # 🎙️ 링 버퍼 기반 자동 녹음기 (같은 폴더)
 
 # ------------------------------------------------------------
 # API 초기화
@@ -27,29 +26,17 @@ def record_voice_auto(
 ):
     print("\n🎤 이제 말씀해주세요! (말 끝날 때까지 자동 녹음)\n")
 
-    buffer = []
-    silence_start = None
-    recording = True
-    frame_duration = 0.1  # 0.1초씩 분석
-
-    while recording:
-        frame = sd.rec(int(frame_duration * fs), samplerate=fs, channels=1, dtype="int16")
-        sd.wait()
-
-        buffer.append(frame)
-        volume = np.abs(frame).mean()
-
-        # 🔊 한국어 발성 인식 강화
-        if volume < silence_threshold:
-            if silence_start is None:
-                silence_start = time.time()
-            elif time.time() - silence_start > silence_duration:
-                print("🛑 말이 끝난 것 같습니다. 녹음을 종료합니다.")
-                recording = False
-        else:
-            silence_start = None
-
-    audio = np.concatenate(buffer, axis=0)
+    # 🔊 sd.rec()를 0.1초마다 새로 부르면 호출 사이의 소리가 빠지므로,
+    #    스트림을 한 번 열고 콜백이 링 버퍼에 이어서 쓰는 녹음기를 사용합니다.
+    recorder = VADRecorder(
+        fs=fs,
+        silence_threshold=silence_threshold,
+        silence_duration=silence_duration,
+        wait_for_voice=False,
+    )
+    audio = recorder.record()
+    print("🛑 말이 끝난 것 같습니다. 녹음을 종료합니다.")
+
     wav.write(filename, fs, audio)
 
     print("🎧 녹음 완료:", filename)
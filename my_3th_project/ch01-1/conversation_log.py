@@ -0,0 +1,277 @@
+# ------------------------------------------------------------
+# conversation_log.py
+# 구조화된 대화 기록 (JSON Lines: 한 줄 = 대화 한 턴)
+#  - 턴마다 {"time", "user", "ai", 라운드 수, GPT/도구 시간, 토큰 수}를 한 줄로 이어 씁니다.
+#  - 파일은 한 번만 열어 두고, 기록을 모았다가 flush_every개(또는 flush_interval초)마다 씁니다.
+#    fsync=True면 쓸 때마다 디스크까지 확실히 내려 보냅니다. (느리지만 전원이 꺼져도 안전)
+#  - 파일이 max_bytes를 넘으면 이름만 .1로 바꾸고(rotation) 새 파일을 엽니다. (기록은 기다리지 않음)
+#    gzip 압축(.1 → .1.gz)은 잠금 밖의 백그라운드 스레드에서 하고, 기존 .N.gz는 하나씩 뒤로 밉니다.
+#  - 같은 파일은 한 객체만 쓰도록 get_log(path)로 꺼내 씁니다. (같은 경로면 같은 객체)
+#  - 읽을 때는 파일 전체를 메모리에 올리지 않습니다.
+#    tail()은 파일 끝에서부터 블록 단위로 거꾸로 읽고, read()는 한 줄씩 흘려 읽으며 날짜로 거릅니다.
+#
+# 터미널에서 보기:
+#   python conversation_log.py tail 5            (최근 5턴)
+#   python conversation_log.py 2025-12-21        (그날 대화)
+#   python conversation_log.py 2025-12-01 2025-12-31
+# ------------------------------------------------------------
+import atexit
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+
+
+_logs = {}  # 절대 경로 → ConversationLog (한 파일에 쓰는 객체는 하나)
+_logs_lock = threading.Lock()
+
+
+def get_log(path="conversation_log.jsonl", **options):
+    """path에 쓰는 공용 ConversationLog를 반환합니다. (처음 부를 때 만들고, 이후에는 같은 객체)"""
+    key = os.path.abspath(path)
+    with _logs_lock:
+        if key not in _logs:
+            _logs[key] = ConversationLog(path, **options)
+        return _logs[key]
+
+
+class ConversationLog:
+    """대화 턴을 JSONL 파일에 모아서 쓰고, 크기가 커지면 이름을 바꿔 돌리고 뒤에서 압축합니다."""
+
+    def __init__(self, path="conversation_log.jsonl", flush_every=8, flush_interval=5.0,
+                 fsync=False, max_bytes=5 * 1024 * 1024, backups=5):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        self._pending = []  # 아직 파일에 쓰지 않은 줄 (bytes)
+        self._file = None
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._compressor = None  # .1 → .1.gz 압축 중인 스레드
+        self._start_compress()  # 지난 실행에서 압축하다 끊긴 .1이 있으면 마저 압축합니다.
+        atexit.register(self.close)  # 프로그램이 끝날 때 남은 기록을 씁니다.
+
+    # -------------------------------
+    # 쓰기
+    # -------------------------------
+    def append(self, user_text, ai_text, stats=None, **extra):
+        """
+        대화 한 턴을 기록합니다.
+        stats는 ai_agent5의 turn_stats(라운드별 시간/토큰 딕셔너리 목록)이고, extra는 그대로 저장됩니다.
+        """
+        record = {"time": datetime.now().isoformat(timespec="seconds"), "user": user_text, "ai": ai_text}
+        if stats:
+            record.update(
+                rounds=len(stats),
+                llm_seconds=round(sum(r["llm_seconds"] for r in stats), 3),
+                tool_seconds=round(sum(r["tool_seconds"] for r in stats), 3),
+                tool_calls=sum(r["tool_calls"] for r in stats),
+                prompt_tokens=sum(r["prompt_tokens"] for r in stats),
+                completion_tokens=sum(r["completion_tokens"] for r in stats),
+            )
+        record.update(extra)
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with self._lock:
+            self._pending.append(line)
+            if (len(self._pending) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+        return record
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            compressor = self._compressor
+        if compressor is not None:
+            compressor.join()  # 압축 중이던 파일을 끝까지 압축합니다.
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+
+        data = b"".join(self._pending)
+        self._pending = []
+        if self._file is not None and not _same_file(self._file, self.path):
+            self._file.close()  # 다른 곳에서 파일을 돌렸으면(rotation) 새 파일을 다시 엽니다.
+            self._file = None
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _rotate(self):
+        """현재 파일 이름을 .1로 바꾸고 새 파일을 엽니다. (backups개까지 보관, 압축은 백그라운드에서)"""
+        self._file.close()
+        if self._compressor is not None:
+            self._compressor.join()  # 바로 전 압축이 아직 안 끝났으면 (드문 경우) 기다립니다.
+
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}.gz"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}.gz")
+        os.replace(self.path, f"{self.path}.1")  # 이름만 바꾸므로 바로 끝납니다.
+        self._file = open(self.path, "ab")
+        self._start_compress()
+
+    def _start_compress(self):
+        if os.path.exists(f"{self.path}.1"):
+            self._compressor = threading.Thread(target=_compress, args=(f"{self.path}.1",), daemon=True)
+            self._compressor.start()
+
+    # -------------------------------
+    # 읽기
+    # -------------------------------
+    def files(self):
+        """기록 파일 목록 (오래된 것 → 최신 순). 압축 중인 .1은 압축 전 파일을 씁니다."""
+        rotated = [f"{self.path}.{i}.gz" for i in range(self.backups, 1, -1)]
+        first = f"{self.path}.1"
+        rotated.append(first if os.path.exists(first) else first + ".gz")
+        return [p for p in rotated + [self.path] if os.path.exists(p)]
+
+    def tail(self, n=10):
+        """최근 n턴을 오래된 것 → 최신 순서로 반환합니다. (파일 끝에서부터 필요한 만큼만 읽음)"""
+        self.flush()
+        records = deque()
+        for path in reversed(self.files()):
+            lines = _read_last_lines(path, n - len(records))
+            records.extendleft(json.loads(line) for line in reversed(lines))
+            if len(records) >= n:
+                break
+        return list(records)
+
+    def read(self, since=None, until=None):
+        """
+        since ≤ 시간 ≤ until 인 기록을 오래된 것부터 하나씩 내보냅니다. (날짜/datetime/"YYYY-MM-DD" 문자열)
+        날짜만 주면 until은 그날 하루 끝까지 포함합니다.
+        """
+        self.flush()
+        since, until = _bound(since, "0000"), _bound(until, "9999", end_of_day=True)
+        for path in self.files():
+            with _open_text(path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["time"] > until:
+                        return  # 시간 순으로 쌓이므로 더 볼 필요가 없습니다.
+                    if record["time"] >= since:
+                        yield record
+
+
+def _compress(path):
+    """path를 path.gz로 압축하고 원본을 지웁니다. (다 쓴 뒤 이름을 바꿔서 반쯤 쓴 .gz가 보이지 않음)"""
+    try:
+        with open(path, "rb") as src, gzip.open(path + ".gz.tmp", "wb") as dst:
+            while True:
+                block = src.read(1024 * 1024)
+                if not block:
+                    break
+                dst.write(block)
+        os.replace(path + ".gz.tmp", path + ".gz")
+        os.remove(path)
+    except OSError as e:
+        print(f"⚠️ 대화 기록 압축 실패 ({path}): {e}")
+
+
+def _read_last_lines(path, n):
+    if not path.endswith(".gz"):
+        try:
+            return _last_lines(path, n)
+        except FileNotFoundError:
+            path += ".gz"  # 그 사이에 압축이 끝났습니다.
+    return _gzip_last_lines(path, n)
+
+
+def _open_text(path):
+    if not path.endswith(".gz"):
+        try:
+            return open(path, "rt", encoding="utf-8")
+        except FileNotFoundError:
+            path += ".gz"  # 그 사이에 압축이 끝났습니다.
+    return gzip.open(path, "rt", encoding="utf-8")
+
+
+def _same_file(f, path):
+    """열어 둔 파일 f가 아직 path의 그 파일인지 확인합니다."""
+    try:
+        return os.path.samestat(os.fstat(f.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+def _bound(value, default, end_of_day=False):
+    if value is None:
+        return default
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="seconds")
+    if isinstance(value, date):
+        value = value.isoformat()
+    if end_of_day and len(value) == 10:
+        return value + "T23:59:59"
+    return value
+
+
+def _last_lines(path, n, block_size=64 * 1024):
+    """일반 파일의 마지막 n줄을 뒤에서부터 블록 단위로 읽어 반환합니다."""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return [line.decode("utf-8") for line in data.splitlines()[-n:] if line.strip()]
+
+
+def _gzip_last_lines(path, n):
+    """압축 파일은 거꾸로 읽을 수 없으므로 흘려 읽으면서 마지막 n줄만 남깁니다."""
+    if n <= 0:
+        return []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [line for line in deque(f, maxlen=n) if line.strip()]
+
+
+def _print_record(record):
+    print(f"[{record['time']}]")
+    print(f"👤 사용자: {record['user']}")
+    print(f"🤖 AI: {record['ai']}")
+    if "rounds" in record:
+        print(f"📊 {record['rounds']}라운드 · GPT {record['llm_seconds']:.2f}초 · "
+              f"토큰 {record['prompt_tokens'] + record['completion_tokens']}")
+    print("-" * 50)
+
+
+if __name__ == "__main__":
+    log = get_log(os.getenv("CONVERSATION_LOG", "conversation_log.jsonl"))
+    args = sys.argv[1:]
+    if args and args[0] == "tail":
+        found = log.tail(int(args[1]) if len(args) > 1 else 10)
+    else:
+        since = args[0] if args else None
+        found = log.read(since, args[1] if len(args) > 1 else since)
+    for record in found:
+        _print_record(record)
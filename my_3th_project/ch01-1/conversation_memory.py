@@ -0,0 +1,110 @@
+# ------------------------------------------------------------
+# conversation_memory.py
+# 토큰 예산이 정해진 대화 기억 (최근 대화는 그대로 + 오래된 대화는 요약)
+#  - 토큰 수는 API를 부르지 않고 로컬에서 셉니다. (tiktoken이 있으면 사용, 없으면 글자 수로 어림)
+#  - 최근 메시지는 budget 토큰 안에서 원문 그대로 보관합니다.
+#  - 예산을 넘으면 가장 오래된 대화부터 꺼내 "이전 요약 + 꺼낸 대화"만으로 요약을 갱신합니다.
+#    → 전체 대화를 다시 요약하지 않으므로 요약 비용도, 매 턴 GPT에 보내는 크기도 일정합니다.
+#  - 요약할 때는 예산의 절반까지 한꺼번에 비워 두어 매 턴마다 요약하지 않도록 합니다.
+# ------------------------------------------------------------
+import math
+from functools import lru_cache
+
+MESSAGE_OVERHEAD = 4  # 메시지 하나마다 붙는 역할/구분 토큰 (대략)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken  # 선택 사항: 설치되어 있으면 정확하게 셉니다.
+        return tiktoken.get_encoding("o200k_base")  # gpt-4o 계열 토크나이저
+    except Exception:
+        return None
+
+
+def count_tokens(text):
+    """text의 토큰 수를 셉니다. tiktoken이 없으면 영문 4글자 ≈ 1토큰, 한글 1글자 ≈ 1토큰으로 어림합니다."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def message_tokens(message):
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD
+
+
+def gpt_summarizer(client, model="gpt-4o-mini", max_tokens=300):
+    """ConversationMemory(summarize=...)에 넘길 요약 함수를 만듭니다. (이전 요약 + 새로 밀려난 대화 → 새 요약)"""
+    def summarize(summary, messages):
+        dialog = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        res = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "대화 요약을 갱신하라. 이름, 선호, 결정, 사실 등 이후 대화에 필요한 정보만 한국어로 간결하게 남겨라."},
+                {"role": "user", "content": f"[지금까지의 요약]\n{summary or '(없음)'}\n\n[새로 추가할 대화]\n{dialog}"},
+            ],
+            max_tokens=max_tokens,
+        )
+        return res.choices[0].message.content.strip()
+    return summarize
+
+
+class ConversationMemory:
+    """최근 메시지는 토큰 예산 안에서 그대로, 그보다 오래된 메시지는 요약 하나로 보관합니다."""
+
+    def __init__(self, budget=1200, summarize=None, keep_last=2):
+        self.budget = budget  # 최근 메시지 원문에 쓸 최대 토큰 수
+        self.summarize = summarize  # summarize(이전 요약, 밀려난 메시지 목록) -> 새 요약 (없으면 그냥 버림)
+        self.keep_last = keep_last  # 예산을 넘어도 최소한 원문으로 남길 메시지 수
+        self.clear()
+
+    def clear(self):
+        self.summary = ""
+        self.recent = []  # 최근 메시지 (오래된 것 → 최신)
+        self._tokens = []  # recent와 같은 순서의 메시지별 토큰 수 (한 번만 셈)
+
+    @property
+    def recent_tokens(self):
+        return sum(self._tokens)
+
+    @property
+    def total_tokens(self):
+        """GPT에 보낼 기억의 크기 (요약 + 최근 메시지, system 프롬프트 제외)"""
+        return self.recent_tokens + (count_tokens(self.summary) + MESSAGE_OVERHEAD if self.summary else 0)
+
+    def add(self, role, content):
+        """메시지를 추가하고, 예산을 넘으면 오래된 메시지를 요약으로 넘깁니다."""
+        message = {"role": role, "content": content}
+        self.recent.append(message)
+        self._tokens.append(message_tokens(message))
+        if self.recent_tokens > self.budget:
+            self._fold(target=self.budget // 2)
+
+    def _fold(self, target):
+        folded = []
+        while len(self.recent) > self.keep_last and self.recent_tokens > target:
+            folded.append(self.recent.pop(0))
+            self._tokens.pop(0)
+        # 🧩 user로 시작하도록 맞춥니다. (assistant 답변만 덩그러니 남지 않게)
+        while len(self.recent) > self.keep_last and self.recent[0]["role"] != "user":
+            folded.append(self.recent.pop(0))
+            self._tokens.pop(0)
+
+        if folded and self.summarize:
+            try:
+                self.summary = self.summarize(self.summary, folded)
+            except Exception as e:
+                print(f"⚠️ 대화 요약 실패 (오래된 대화는 요약 없이 버립니다): {e}")
+
+    def messages(self, system_prompt=None):
+        """GPT에 보낼 메시지 목록: [system] + [이전 대화 요약] + 최근 메시지"""
+        result = []
+        if system_prompt:
+            result.append({"role": "system", "content": system_prompt})
+        if self.summary:
+            result.append({"role": "system", "content": f"이전 대화 요약:\n{self.summary}"})
+        return result + list(self.recent)
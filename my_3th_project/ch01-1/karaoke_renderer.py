@@ -0,0 +1,93 @@
+# ------------------------------------------------------------
+# karaoke_renderer.py
+# 노래방 자막 하이라이트 렌더러 (Streamlit)
+#  - 이미 다 읽은 문장은 "완료 영역"에 한 번만 추가하고 다시 그리지 않습니다.
+#    → 매 갱신마다 보내는 내용은 지금 읽는 문장 하나뿐이라, 답변이 길어져도 크기가 일정합니다.
+#  - 하이라이트 위치(글자 인덱스)가 실제로 바뀔 때만 화면을 갱신합니다. (같은 내용은 다시 보내지 않음)
+#  - 위치는 time.monotonic() 기준 경과 시간으로 계산하고, 다음 글자가 바뀔 시각까지 잠듭니다.
+#    → sleep(0.05)를 반복하면서 생기는 시간 밀림(drift)이 쌓이지 않습니다.
+#  - timeline(word_alignment.char_timeline)을 주면 글자 속도가 일정하다고 가정하지 않고
+#    음성에서 찾은 단어별 시간에 맞춰 하이라이트합니다. (쉼 동안에는 멈춤)
+# ------------------------------------------------------------
+import html
+import time
+
+import numpy as np
+
+
+class KaraokeRenderer:
+    """완료 영역(done_area, st.container)과 현재 문장 영역(live_area, st.empty)에 자막을 그립니다."""
+
+    def __init__(self, done_area, live_area, min_interval=0.05):
+        self.done_area = done_area
+        self.live_area = live_area
+        self.min_interval = min_interval  # 화면 갱신 최소 간격 (초)
+        self.renders = 0  # live_area를 실제로 갱신한 횟수
+        self.sentence = ""
+        self.duration = 0.0
+        self.timeline = None  # (시각 배열, 글자 인덱스 배열) 또는 None (글자 속도 일정)
+        self._started = 0.0
+        self._index = -1  # 마지막으로 그린 하이라이트 위치
+
+    def start(self, sentence, duration, started=None, timeline=None):
+        """새 문장의 재생을 시작합니다. started는 재생 시작 시각 (time.monotonic 기준)."""
+        self.sentence = sentence
+        self.duration = max(duration, 1e-6)
+        self.timeline = timeline
+        self._started = time.monotonic() if started is None else started
+        self._index = -1
+        self.update()
+
+    def index_at(self, elapsed):
+        """재생 경과 시간(초)에 하이라이트할 글자 수"""
+        if self.timeline is not None:
+            times, indices = self.timeline
+            return int(np.interp(elapsed, times, indices))
+        return min(len(self.sentence), int(len(self.sentence) * elapsed / self.duration))
+
+    def time_of(self, index):
+        """하이라이트가 index 글자에 도달하는 시각 (재생 시작 기준 초)"""
+        if self.timeline is not None:
+            times, indices = self.timeline
+            i = int(np.searchsorted(indices, index))
+            if i >= len(indices):
+                return self.duration
+            if i == 0 or indices[i] == indices[i - 1]:
+                return float(times[i])
+            return float(np.interp(index, indices[i - 1:i + 1], times[i - 1:i + 1]))
+        return self.duration * index / len(self.sentence) if self.sentence else self.duration
+
+    def update(self):
+        """하이라이트 위치가 바뀌었을 때만 다시 그립니다. 바뀌었으면 True."""
+        index = self.index_at(time.monotonic() - self._started)
+        if index == self._index:
+            return False
+        self._index = index
+        self.renders += 1
+        self.live_area.markdown(
+            "<div class='karaoke-line'>"
+            f"<span class='karaoke-highlighted'>{html.escape(self.sentence[:index])}</span>"
+            f"<span class='karaoke-normal'>{html.escape(self.sentence[index:])}</span>"
+            "</div>",
+            unsafe_allow_html=True,
+        )
+        return True
+
+    def play(self):
+        """문장 재생 시간이 끝날 때까지 하이라이트를 갱신합니다. (다음 변경 시각까지 잠듦)"""
+        end = self._started + self.duration
+        while True:
+            self.update()
+            now = time.monotonic()
+            if now >= end:
+                break
+            next_change = self._started + self.time_of(self._index + 1)
+            time.sleep(min(end, max(next_change, now + self.min_interval)) - now)
+        self.update()
+
+    def finish(self):
+        """현재 문장을 완료 영역에 한 번 추가하고, 현재 문장 영역을 비웁니다."""
+        if self.sentence:
+            self.done_area.markdown(self.sentence)
+        self.live_area.empty()
+        self.sentence = ""
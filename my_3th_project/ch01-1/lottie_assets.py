@@ -0,0 +1,107 @@
+# ------------------------------------------------------------
+# lottie_assets.py
+# Lottie 애니메이션(JSON) 불러오기 + 캐시
+#  - Streamlit은 버튼을 누를 때마다 스크립트 전체를 다시 실행하므로,
+#    한 번 불러온 JSON은 프로세스 메모리에 보관해 다시 요청하지 않습니다.
+#  - 내려받은 JSON은 디스크(.lottie_cache/)에도 저장해서 앱을 다시 켜도 네트워크 없이 씁니다.
+#  - 요청은 연결을 재사용하는 requests.Session으로 보내고, 연결/응답 시간 제한(timeout)을 둡니다.
+#  - 네트워크가 안 되면 assets/lottie/ 폴더의 같은 이름 파일(번들 사본)을 씁니다.
+#    (번들 사본은 원본과 비슷한 모양의 간단한 대체 애니메이션입니다.)
+#    그것도 없으면 None을 돌려줍니다. 두 경우 모두 한동안(retry_after초)만 그 결과를 쓰고
+#    그 뒤에 다시 원본을 요청합니다. (번들 사본은 디스크 캐시에 저장하지 않음)
+#  - 잠금(Lock)은 메모리 캐시를 읽고 쓸 때만 잡습니다. 네트워크 요청 중에는 잡지 않으므로
+#    느린 URL 하나가 다른 URL이나 다른 세션을 막지 않습니다. (같은 URL은 한 번만 요청)
+# ------------------------------------------------------------
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, ".lottie_cache")  # 내려받은 JSON 보관 폴더
+BUNDLED_DIR = os.path.join(BASE_DIR, "assets", "lottie")  # 오프라인용 번들 사본 폴더
+
+TIMEOUT = (3.0, 5.0)  # (연결, 응답) 제한 시간 (초)
+
+_memo = {}  # url → (JSON 또는 None, 저장 시각, 원본인지 여부)
+_inflight = {}  # url → 불러오는 중임을 알리는 threading.Event
+_lock = threading.Lock()  # _memo / _inflight 보호용 (네트워크 요청 중에는 잡지 않음)
+_session = None
+
+
+def _http():
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1))
+        return _session
+
+
+def _cache_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".json")
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _fetch(url, timeout):
+    """(JSON 또는 None, 원본인지 여부)를 반환합니다. 번들 사본이나 None이면 나중에 다시 요청합니다."""
+    # 1) 디스크 캐시
+    path = _cache_path(url)
+    data = _read_json(path)
+    if data is not None:
+        return data, True
+
+    # 2) 네트워크 (성공하면 디스크 캐시에 저장)
+    try:
+        r = _http().get(url, timeout=timeout)
+        r.raise_for_status()
+        data = r.json()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)  # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 한 번에 바꿔치기
+        return data, True
+    except (requests.RequestException, ValueError, OSError) as e:
+        print(f"⚠️ Lottie 불러오기 실패 ({url}): {e}")
+
+    # 3) 번들 사본 (URL의 파일 이름과 같은 파일)
+    return _read_json(os.path.join(BUNDLED_DIR, os.path.basename(url))), False
+
+
+def load_lottie(url, timeout=TIMEOUT, retry_after=300.0):
+    """url의 Lottie JSON을 반환합니다. (메모리 → 디스크 → 네트워크 → 번들 사본 순서, 실패하면 None)"""
+    while True:
+        with _lock:
+            if url in _memo:
+                data, saved, original = _memo[url]
+                if original or time.monotonic() - saved < retry_after:
+                    return data
+            event = _inflight.get(url)
+            owner = event is None
+            if owner:
+                event = _inflight[url] = threading.Event()
+        if owner:
+            break
+        event.wait()  # 같은 URL을 다른 요청이 불러오는 중이면 기다렸다가 메모리 캐시에서 읽습니다.
+
+    data, original = None, False
+    try:
+        data, original = _fetch(url, timeout)  # 잠금 없이 불러옵니다.
+    finally:
+        with _lock:
+            _memo[url] = (data, time.monotonic(), original)
+            del _inflight[url]
+        event.set()
+    return data
@@ -0,0 +1,205 @@
+# ------------------------------------------------------------
+# pdf_service.py
+# 백그라운드 PDF 생성 서비스
+#  - 한글 폰트 경로는 한 번만 찾습니다. (PDF_FONT_PATH 환경변수 → OS별 기본 폰트 → 번들 폰트)
+#    번들 폰트(fonts/NanumGothic.ttf, SIL OFL 1.1 - fonts/OFL.txt)가 있어 어느 OS에서나 한글이 나옵니다.
+#  - 작업 프로세스마다 폰트를 한 번만 읽어(add_font) 둔 원본 FPDF와 폰트 파일 바이트를 보관하고,
+#    PDF를 만들 때마다 그 원본을 복사(deepcopy)해서 씁니다. (글자 폭 표 등을 매번 다시 계산하지 않음)
+#    PDF를 저장할 때 fpdf가 폰트(TTFont)를 그 자리에서 잘라내므로(subset), 복사본마다
+#    보관해 둔 바이트로 새 TTFont를 붙여 줍니다. (원본 폰트가 첫 PDF의 글자만 남고 망가지지 않도록)
+#  - PDF 생성은 별도 프로세스 풀에서 실행되고, submit()은 작업 핸들(PDFJob)을 바로 돌려줍니다.
+#    → 음성 답변이 PDF 생성을 기다리지 않습니다.
+# ------------------------------------------------------------
+import copy
+import io
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+FONT_FAMILY = "KoreanFont"
+
+# 번들 폰트: 이 파일 옆 fonts/ 폴더의 NanumGothic.ttf (시스템 한글 폰트가 없을 때 사용)
+BUNDLED_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+
+# OS별 한글 폰트 후보 (앞에서부터 먼저 찾은 것을 사용)
+SYSTEM_FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgun.ttf",  # Windows 맑은 고딕
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",  # Ubuntu/Debian (fonts-nanum)
+    "/usr/share/fonts/nanum/NanumGothic.ttf",  # Fedora/Arch
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # Debian (fonts-noto-cjk)
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",  # Fedora/Arch
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # macOS
+    "/Library/Fonts/AppleGothic.ttf",  # macOS (구버전)
+]
+
+
+# ------------------------------------------------------------
+# 1) 폰트 찾기 (한 번만)
+# ------------------------------------------------------------
+@lru_cache(maxsize=None)
+def find_font(font_path=None):
+    """사용할 한글 폰트 경로를 반환합니다. 찾지 못하면 None (영문만 쓸 수 있음)."""
+    candidates = [font_path, os.getenv("PDF_FONT_PATH")] + SYSTEM_FONT_CANDIDATES
+    if os.path.isdir(BUNDLED_FONT_DIR):
+        candidates += [os.path.join(BUNDLED_FONT_DIR, name)
+                       for name in sorted(os.listdir(BUNDLED_FONT_DIR))
+                       if name.lower().endswith((".ttf", ".otf", ".ttc"))]
+
+    for path in candidates:
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+# ------------------------------------------------------------
+# 2) 폰트를 미리 읽어 둔 원본 FPDF (작업 프로세스마다 한 번)
+# ------------------------------------------------------------
+_prototypes = {}
+
+
+def _prototype(font_path):
+    if font_path not in _prototypes:
+        from fpdf import FPDF  # 작업 프로세스에서만 필요합니다.
+
+        pdf, font_bytes = FPDF(), None
+        if font_path:
+            try:
+                pdf.add_font(FONT_FAMILY, fname=font_path)
+                with open(font_path, "rb") as f:
+                    font_bytes = f.read()
+            except Exception as e:
+                print(f"⚠️ 폰트를 불러오지 못했습니다 ({font_path}): {e}")
+                pdf, font_bytes = FPDF(), None
+        _prototypes[font_path] = (pdf, font_bytes)
+    return _prototypes[font_path]
+
+
+def _fresh_copy(prototype, font_bytes):
+    """원본 FPDF를 복사하고, 폰트(TTFont)는 보관해 둔 바이트로 새로 열어 복사본마다 따로 갖게 합니다."""
+    pdf = copy.deepcopy(prototype)  # fpdf는 복사할 때도 TTFont를 원본과 함께 씁니다. (그래서 아래에서 바꿔 끼움)
+    if font_bytes is not None:
+        from fontTools.ttLib import TTFont  # fpdf2와 함께 설치됩니다.
+
+        for font in pdf.fonts.values():
+            if getattr(font, "ttfont", None) is not None:
+                font.ttfont = TTFont(io.BytesIO(font_bytes), recalcTimestamp=False, lazy=True,
+                                     fontNumber=font.collection_font_number)
+    return pdf
+
+
+def _warm_up(font_path):
+    """작업 프로세스가 시작될 때 폰트를 미리 읽어 둡니다."""
+    _prototype(font_path)
+
+
+def render_pdf(content, filename, title=None, font_path=None):
+    """
+    content를 PDF로 저장하고 filename을 반환합니다. (작업 프로세스에서 실행)
+    title이 있으면 16pt 가운데 정렬 제목을 먼저 씁니다. font_path가 없으면 find_font()로 찾은 폰트를 씁니다.
+    """
+    prototype, font_bytes = _prototype(font_path or find_font())
+    pdf = _fresh_copy(prototype, font_bytes)  # 폰트가 이미 들어 있는 복사본
+    pdf.add_page()
+
+    if font_bytes is not None:
+        pdf.set_font(FONT_FAMILY, size=12)
+    else:
+        # 한글 폰트 없이 기본 폰트로 쓰면 한글에서 알아보기 힘든 인코딩 오류가 나므로 먼저 알려 줍니다.
+        try:
+            f"{title or ''}{content}".encode("latin-1")
+        except UnicodeEncodeError:
+            raise RuntimeError(
+                "한글 폰트를 찾지 못해 PDF를 만들 수 없습니다. "
+                "PDF_FONT_PATH를 지정하거나 fonts/ 폴더에 한글 TTF(NanumGothic.ttf 등)를 넣어 주세요."
+            ) from None
+        pdf.set_font("Helvetica", size=12)
+
+    if title:
+        pdf.set_font_size(16)
+        pdf.cell(0, 10, text=title, new_x="LMARGIN", new_y="NEXT", align="C")
+        pdf.ln(10)
+        pdf.set_font_size(11)
+
+    for line in content.split("\n"):
+        pdf.multi_cell(0, 8, text=line, new_x="LMARGIN", new_y="NEXT")  # 줄바꿈 처리하여 쓰기
+
+    pdf.output(filename)
+    return filename
+
+
+# ------------------------------------------------------------
+# 3) 서비스 (프로세스 풀 + 작업 핸들)
+# ------------------------------------------------------------
+class PDFJob:
+    """submit()이 바로 돌려주는 작업 핸들입니다."""
+
+    def __init__(self, future, filename):
+        self.future = future
+        self.filename = filename
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """PDF가 다 만들어질 때까지 기다렸다가 파일 이름을 반환합니다. (실패하면 예외)"""
+        return self.future.result(timeout)
+
+
+class PDFService:
+    """PDF 생성을 백그라운드 프로세스에서 처리합니다."""
+
+    def __init__(self, font_path=None, max_workers=1):
+        self.font_path = find_font(font_path)
+        self.max_workers = max_workers
+        self._executor = None
+        if self.font_path is None:
+            print("⚠️ 한글 폰트를 찾지 못했습니다. PDF_FONT_PATH를 지정하거나 fonts/ 폴더에 TTF를 넣어 주세요.")
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_warm_up,
+                initargs=(self.font_path,),
+            )
+        return self._executor
+
+    @staticmethod
+    def make_filename(prefix="Report"):
+        # 같은 초에 여러 개를 만들어도 겹치지 않도록 짧은 고유값을 붙입니다.
+        return f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:6]}.pdf"
+
+    def submit(self, content, filename=None, title=None, on_done=None):
+        """PDF 생성을 예약하고 PDFJob을 바로 반환합니다. on_done(job)은 끝났을 때 호출됩니다."""
+        filename = filename or self.make_filename()
+        future = self._pool().submit(render_pdf, content, filename, title, self.font_path)
+        job = PDFJob(future, filename)
+        if on_done:
+            future.add_done_callback(lambda _: on_done(job))
+        return job
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def announce(job):
+    """on_done용: PDF 생성 결과를 콘솔에 알려줍니다."""
+    try:
+        print(f"✅ PDF 저장 완료: {job.result()}")
+    except Exception as e:
+        print(f"❌ PDF 생성 실패 ({job.filename}): {e}")
+
+
+_default_service = None
+
+
+def get_pdf_service():
+    """프로그램 전체에서 함께 쓰는 PDFService를 반환합니다. (처음 부를 때 만듦)"""
+    global _default_service
+    if _default_service is None:
+        _default_service = PDFService()
+    return _default_service
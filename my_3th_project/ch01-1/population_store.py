@@ -0,0 +1,200 @@
+# ------------------------------------------------------------
+# population_store.py
+# 서울 생활인구 CSV → 열(column) 단위 NumPy 캐시
+#  - 처음 한 번만 CSV를 읽어 열마다 .npy 파일로 저장합니다.
+#  - 이후에는 .npy 파일을 메모리 맵(mmap)으로 열기 때문에 CSV를 다시 읽지 않습니다.
+#  - 행을 행정동코드 순으로 정렬해 두고, 구 코드(앞 5자리)별 시작/끝 위치를
+#    인덱스로 저장하므로 구별 합계는 배열 한 구간을 더하는 것으로 끝납니다.
+# ------------------------------------------------------------
+import csv
+import json
+import os
+
+import numpy as np
+
+# CSV 열 이름 (서울열린데이터광장 "생활인구" 데이터 기준)
+CODE_COLUMN = "행정동코드"
+TOTAL_COLUMN = "생활인구합계"
+HOUR_COLUMN = "시간대구분"  # 없으면 시간대별 집계는 사용할 수 없습니다.
+
+CACHE_VERSION = 2  # 캐시 구조가 바뀌면 올려서 기존 캐시를 다시 만들게 합니다.
+
+
+# ------------------------------------------------------------
+# 1) CSV 열 읽기 + 숫자 변환
+# ------------------------------------------------------------
+def read_columns(csv_path, columns, encoding="euc-kr"):
+    """CSV를 한 번 훑으면서 필요한 열만 문자열 배열로 모아 {열 이름: np.ndarray}로 반환합니다."""
+    with open(csv_path, "r", encoding=encoding, newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip().strip('"').lstrip("\ufeff") for h in next(reader)]
+        index = {name: header.index(name) for name in columns if name in header}
+
+        values = {name: [] for name in index}
+        for row in reader:
+            if not row:
+                continue
+            for name, i in index.items():
+                values[name].append(row[i].strip())
+
+    return {name: np.array(vals) for name, vals in values.items()}
+
+
+def parse_float_column(raw):
+    """
+    문자열 배열을 float 배열로 한꺼번에 변환합니다.
+    '*' 처럼 비공개(숫자가 아닌) 값은 NaN으로 바꾸고 마스크 배열(np.ma)로 돌려줍니다.
+    """
+    raw = np.char.strip(raw.astype(str))
+    suppressed = (raw == "*") | (raw == "")
+    cleaned = np.where(suppressed, "nan", raw)
+    try:
+        values = cleaned.astype(np.float64)
+    except ValueError:
+        # '*' 외의 다른 비숫자 값이 섞인 경우에만 한 칸씩 변환합니다.
+        values = np.array([_to_float(v) for v in cleaned], dtype=np.float64)
+    return np.ma.masked_array(values, mask=np.isnan(values))
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+# ------------------------------------------------------------
+# 2) 열 단위 캐시
+# ------------------------------------------------------------
+class PopulationStore:
+    """행정동코드 순으로 정렬된 생활인구 열 배열과 구 코드(앞 5자리) 인덱스입니다."""
+
+    def __init__(self, codes, totals, cumtotals, hours, gu_index):
+        self.codes = codes  # 행정동코드 (int64, 정렬됨)
+        self.totals = totals  # 생활인구합계 (float64, 비공개 값은 NaN)
+        self.cumtotals = cumtotals  # 누적합 (길이 n+1, 비공개 값은 0으로 취급)
+        self.hours = hours  # 시간대구분 (int16) 또는 None
+        self.gu_index = gu_index  # {"11110": (시작, 끝), ...}
+
+    # -------------------------------
+    # 생성 / 불러오기
+    # -------------------------------
+    @staticmethod
+    def cache_dir_for(csv_path):
+        return os.path.splitext(csv_path)[0] + ".cache"
+
+    @classmethod
+    def open(cls, csv_path, cache_dir=None):
+        """캐시가 최신이면 메모리 맵으로 열고, 없거나 CSV가 바뀌었으면 먼저 다시 만듭니다."""
+        cache_dir = cache_dir or cls.cache_dir_for(csv_path)
+        meta_path = os.path.join(cache_dir, "meta.json")
+        stat = os.stat(csv_path)
+        source = {"size": stat.st_size, "mtime": stat.st_mtime, "version": CACHE_VERSION}
+
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        if meta is None or meta.get("source") != source:
+            meta = cls.ingest(csv_path, cache_dir, source)
+
+        def load(name):
+            return np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r")
+
+        hours = load("hours") if meta["has_hours"] else None
+        gu_index = {gu: tuple(span) for gu, span in meta["gu_index"].items()}
+        return cls(load("codes"), load("totals"), load("cumtotals"), hours, gu_index)
+
+    @staticmethod
+    def ingest(csv_path, cache_dir, source):
+        """CSV를 한 번 읽어 정렬된 열 배열(.npy)과 구 인덱스(meta.json)를 저장합니다."""
+        cols = read_columns(csv_path, [CODE_COLUMN, TOTAL_COLUMN, HOUR_COLUMN])
+
+        raw_codes = np.char.strip(cols[CODE_COLUMN].astype(str))
+        totals = parse_float_column(cols[TOTAL_COLUMN]).filled(np.nan)
+        hours = None
+        if HOUR_COLUMN in cols:
+            # 시간대도 같은 정리 과정을 거칩니다. 비어 있거나 '*'인 칸은 -1(시간대 모름)로 두어
+            # 전체 합계에는 들어가고 시간대별 집계에서만 빠지게 합니다.
+            hours = parse_float_column(cols[HOUR_COLUMN]).filled(-1).astype(np.int16)
+
+        # 행정동코드가 비어 있거나 '*'처럼 숫자가 아닌 행은 어느 구에도 넣을 수 없으므로 뺍니다.
+        valid = np.char.isdigit(raw_codes)
+        dropped = int(len(raw_codes) - valid.sum())
+        if dropped:
+            print(f"⚠️ 행정동코드가 올바르지 않은 {dropped}개 행을 제외했습니다.")
+            raw_codes, totals = raw_codes[valid], totals[valid]
+            if hours is not None:
+                hours = hours[valid]
+
+        # 행정동코드를 문자열 순으로 정렬하면 같은 앞 5자리(구)의 행들이 한 구간에 모입니다.
+        order = np.argsort(raw_codes, kind="stable")
+        raw_codes, totals = raw_codes[order], totals[order]
+        if hours is not None:
+            hours = hours[order]
+        codes = raw_codes.astype(np.int64)
+
+        # 구 코드(앞 5자리)별 [시작, 끝) 위치 인덱스를 만듭니다.
+        unique, starts = np.unique(raw_codes.astype("U5"), return_index=True)
+        ends = np.append(starts[1:], len(codes))
+        gu_index = {str(g): [int(s), int(e)] for g, s, e in zip(unique, starts, ends)}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(os.path.join(cache_dir, "codes.npy"), codes)
+        np.save(os.path.join(cache_dir, "totals.npy"), totals)
+        # 누적합을 저장해 두면 구간 합계가 뺄셈 한 번(cum[끝] - cum[시작])으로 끝납니다.
+        np.save(os.path.join(cache_dir, "cumtotals.npy"), np.concatenate(([0.0], np.cumsum(np.nan_to_num(totals)))))
+        if hours is not None:
+            np.save(os.path.join(cache_dir, "hours.npy"), hours)
+
+        meta = {"source": source, "has_hours": hours is not None, "gu_index": gu_index, "dropped_rows": dropped}
+        with open(os.path.join(cache_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return meta
+
+    # -------------------------------
+    # 조회
+    # -------------------------------
+    def gu_total(self, prefix, hours=None):
+        """구 코드 prefix의 생활인구 합계를 반환합니다. hours를 주면 해당 시간대만 더합니다."""
+        start, end = self.gu_index.get(prefix, (0, 0))
+        if hours is None:
+            return float(self.cumtotals[end] - self.cumtotals[start])
+
+        if self.hours is None:
+            raise ValueError(f"CSV에 '{HOUR_COLUMN}' 열이 없어 시간대별 집계를 할 수 없습니다.")
+        mask = np.isin(self.hours[start:end], np.atleast_1d(hours))
+        return float(np.nansum(self.totals[start:end][mask]))
+
+    def all_gu_totals(self, hours=None):
+        """{구 코드: 생활인구 합계} 딕셔너리를 반환합니다."""
+        return {gu: self.gu_total(gu, hours) for gu in self.gu_index}
+
+    def gu_table(self):
+        """
+        모든 구를 한 번에 집계한 표를 반환합니다.
+        {구 코드: {"population": 합계, "rows": 행 수, "suppressed": '*' 비공개 행 수}}
+        구마다 반복하지 않고 구간 시작/끝 배열로 누적합을 한꺼번에 빼서 계산합니다.
+        """
+        gus = list(self.gu_index)
+        spans = np.array([self.gu_index[gu] for gu in gus], dtype=np.int64).reshape(-1, 2)
+        starts, ends = spans[:, 0], spans[:, 1]
+
+        suppressed_cum = np.concatenate(([0], np.cumsum(np.isnan(self.totals))))
+        population = self.cumtotals[ends] - self.cumtotals[starts]
+        suppressed = suppressed_cum[ends] - suppressed_cum[starts]
+
+        return {
+            gu: {"population": float(p), "rows": int(e - s), "suppressed": int(m)}
+            for gu, p, s, e, m in zip(gus, population, starts, ends, suppressed)
+        }
+
+    def gu_by_hour(self, prefix):
+        """구 코드 prefix의 시간대(0~23)별 생활인구 합계 배열을 반환합니다."""
+        if self.hours is None:
+            raise ValueError(f"CSV에 '{HOUR_COLUMN}' 열이 없어 시간대별 집계를 할 수 없습니다.")
+        start, end = self.gu_index.get(prefix, (0, 0))
+        hours = self.hours[start:end]
+        known = hours >= 0  # 시간대를 모르는 행(-1)은 뺍니다.
+        totals = np.nan_to_num(self.totals[start:end])
+        return np.bincount(hours[known], weights=totals[known], minlength=24)
@@ -0,0 +1,101 @@
+# ------------------------------------------------------------
+# speech_pipeline.py
+# 답변을 만들면서 동시에 말하기 (생성 → 문장 분리 → TTS → 재생 파이프라인)
+#  - GPT 스트리밍 조각(토큰)을 받는 즉시 문장 단위로 자릅니다.
+#  - 문장이 완성되면 바로 TTS 작업자(스레드)에게 넘깁니다.
+#  - 재생은 문장 순서대로 진행되고, 그동안 다음 문장의 생성/TTS가 계속됩니다.
+#  → 전체 답변 + 전체 TTS를 기다리지 않고 첫 문장이 준비되는 즉시 말하기 시작합니다.
+# ------------------------------------------------------------
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 문장 끝: 마침표/물음표/느낌표(+닫는 따옴표/괄호) 뒤에 공백이 오거나, 줄바꿈
+SENTENCE_END = re.compile(r"[.!?。！？…~]+[\"'”’)\]]*\s+|\n+")
+MAX_SENTENCE_CHARS = 200  # 문장 부호 없이 너무 길어지면 쉼표/공백에서라도 자릅니다.
+
+
+def split_sentences(chunks, on_text=None):
+    """텍스트 조각 반복자를 받아 완성된 문장을 하나씩 내보냅니다. on_text는 조각마다 호출됩니다."""
+    buffer = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if on_text:
+            on_text(chunk)
+        buffer += chunk
+
+        while True:
+            match = SENTENCE_END.search(buffer)
+            if match:
+                cut = match.end()
+            elif len(buffer) > MAX_SENTENCE_CHARS:
+                cut = max(buffer.rfind(",", 0, MAX_SENTENCE_CHARS), buffer.rfind(" ", 0, MAX_SENTENCE_CHARS)) + 1
+                cut = cut or MAX_SENTENCE_CHARS
+            else:
+                break
+            sentence, buffer = buffer[:cut].strip(), buffer[cut:]
+            if sentence:
+                yield sentence
+
+    if buffer.strip():
+        yield buffer.strip()  # 마지막 남은 문장
+
+
+def speak_while_generating(chunks, synthesize, play, max_workers=2, on_text=None):
+    """
+    chunks(답변 조각 반복자)를 문장으로 나눠 synthesize(문장 → 오디오)를 작업자에게 맡기고,
+    완성된 오디오를 문장 순서대로 play(오디오)로 재생합니다. 전체 답변 문자열을 반환합니다.
+    """
+    parts = []
+    playback = queue.Queue()  # 재생 대기열 (문장 순서대로 TTS 작업이 들어감)
+    errors = []
+    stop = threading.Event()  # 재생 쪽에서 실패하면 생성 쪽도 더 맡기지 않도록 알리는 신호
+
+    def collect(chunk):
+        parts.append(chunk)
+        if on_text:
+            on_text(chunk)
+
+    def produce(executor):
+        try:
+            for sentence in split_sentences(chunks, on_text=collect):
+                if stop.is_set():
+                    break  # 앞 문장에서 실패했으면 더 이상 TTS를 맡기지 않습니다.
+                playback.put(executor.submit(synthesize, sentence))
+        except Exception as e:
+            if not stop.is_set():  # 멈춘 뒤에 생긴 오류는 원래 오류를 가리지 않도록 버립니다.
+                errors.append(e)
+        finally:
+            playback.put(None)  # 생성 끝 표시
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        producer = threading.Thread(target=produce, args=(executor,), daemon=True)
+        producer.start()
+
+        # 🔊 재생은 호출한 스레드에서 순서대로 (앞 문장을 말하는 동안 뒤 문장을 준비)
+        try:
+            while True:
+                future = playback.get()
+                if future is None:
+                    break
+                audio = future.result()
+                if audio:
+                    play(audio)
+        except BaseException:
+            # TTS나 재생이 실패하면 생성을 멈추고, 아직 시작 안 한 TTS는 취소한 뒤 그 오류를 그대로 올립니다.
+            stop.set()
+            while True:
+                try:
+                    pending = playback.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is not None:
+                    pending.cancel()
+            raise
+        producer.join()
+
+    if errors:
+        raise errors[0]
+    return "".join(parts)
@@ -0,0 +1,127 @@
+# ------------------------------------------------------------
+# streaming_stt.py
+# 말하는 동안 미리 받아쓰기 (구간 단위 Whisper 업로드)
+#  - VADRecorder가 말 중간의 짧은 쉼마다 구간을 잘라 넘겨주면,
+#    그 구간을 바로 백그라운드 스레드에서 Whisper로 보냅니다.
+#  - 말이 끝나면 마지막 구간 하나만 기다리면 되므로,
+#    "말하는 시간 + 전체 STT 시간"이 아니라 "마지막 구간 STT 시간"만 더해집니다.
+#  - 구간별 결과는 녹음된 순서대로 이어 붙입니다.
+#
+# 마이크 없이 테스트하기:
+#   OPENAI_BASE_URL=http://localhost:8000/v1 python streaming_stt.py sample.wav
+#   (WAV 파일을 0.1초 블록으로 흘려보내고, 가짜 STT 서버로 업로드합니다.)
+# ------------------------------------------------------------
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_io import decode_wav, encode_wav, transcribe
+from vad_recorder import VADRecorder
+
+
+# ------------------------------------------------------------
+# 1) 오디오 소스: WAV 파일 → 블록
+# ------------------------------------------------------------
+def wav_file_blocks(path, block_duration=0.1, realtime=False):
+    """
+    WAV 파일을 마이크처럼 block_duration 초씩 잘라 (fs, int16 블록)으로 내보냅니다.
+    realtime=True면 블록 사이에 실제 시간만큼 쉬어서 말하는 속도를 흉내 냅니다.
+    """
+    with open(path, "rb") as f:
+        fs, data = decode_wav(f.read())
+    if data.ndim > 1:
+        data = data[:, 0]  # 첫 번째 채널만 사용합니다.
+
+    step = int(block_duration * fs)
+    for i in range(0, len(data), step):
+        yield fs, data[i:i + step]
+        if realtime:
+            time.sleep(block_duration)
+
+
+# ------------------------------------------------------------
+# 2) 구간 단위 받아쓰기
+# ------------------------------------------------------------
+class StreamingTranscriber:
+    """VADRecorder가 넘겨준 구간들을 백그라운드에서 받아쓰고 순서대로 이어 붙입니다."""
+
+    def __init__(self, client, fs=16000, language="ko", model="whisper-1", max_workers=2):
+        self.client = client
+        self.fs = fs
+        self.language = language
+        self.model = model
+        self.max_workers = max_workers
+        self.futures = []  # 구간별 받아쓰기 작업 (녹음 순서)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _transcribe(self, index, samples):
+        try:
+            return transcribe(self.client, encode_wav(samples, self.fs),
+                              language=self.language, model=self.model,
+                              filename=f"segment_{index}.wav")
+        except Exception as e:
+            print(f"⚠️ {index + 1}번째 구간 받아쓰기 실패: {e}")
+            return ""
+
+    def submit(self, samples):
+        """구간 하나를 업로드 대기열에 넣습니다. (VADRecorder의 on_segment로 사용)"""
+        with self._lock:
+            index = len(self.futures)
+            self.futures.append(self._executor.submit(self._transcribe, index, samples))
+
+    def listen(self, recorder, source=None):
+        """
+        recorder로 발화 하나를 듣고 받아쓴 문장을 반환합니다.
+        source가 없으면 마이크로 녹음하고, 있으면 (fs, 블록) 반복자(예: wav_file_blocks)를 사용합니다.
+        """
+        self.futures = []
+        recorder.on_segment = self.submit
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            if source is None:
+                recorder.record()
+            else:
+                recorder.reset()
+                for _, block in source:
+                    if recorder.feed(block):
+                        break
+                else:
+                    recorder.finish()  # 파일이 끝나면 남은 구간을 넘깁니다.
+
+            # 🧩 앞 구간들은 말하는 동안 이미 끝나 있으므로 보통 마지막 구간만 기다립니다.
+            texts = [future.result() for future in self.futures]
+        finally:
+            self._executor.shutdown(wait=False)
+
+        return " ".join(t.strip() for t in texts if t and t.strip())
+
+
+def listen_and_transcribe(client, fs=16000, silence_threshold=150, silence_duration=1.2,
+                          segment_pause=0.5, **options):
+    """마이크로 발화 하나를 들으면서 구간마다 받아쓰고, 이어 붙인 문장을 반환합니다."""
+    recorder = VADRecorder(fs=fs, silence_threshold=silence_threshold,
+                           silence_duration=silence_duration, segment_pause=segment_pause, **options)
+    return StreamingTranscriber(client, fs=fs).listen(recorder)
+
+
+# ------------------------------------------------------------
+# 3) WAV 파일로 실행해 보기
+# ------------------------------------------------------------
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    load_dotenv()
+    client = OpenAI()  # OPENAI_BASE_URL을 지정하면 가짜(로컬) STT 서버로 보냅니다.
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "input.wav"
+    fs, _ = next(wav_file_blocks(path))
+    recorder = VADRecorder(fs=fs, segment_pause=0.5)
+    transcriber = StreamingTranscriber(client, fs=fs)
+
+    started = time.perf_counter()
+    text = transcriber.listen(recorder, source=wav_file_blocks(path, realtime=True))
+    print(f"📝 인식 결과 ({len(transcriber.futures)}개 구간, {time.perf_counter() - started:.1f}초): {text}")
@@ -0,0 +1,176 @@
+# ------------------------------------------------------------
+# tool_registry.py
+# GPT 함수 호출(Function Calling)용 도구 등록기
+#  - @tools.tool(...)로 함수와 설명(스키마)을 한 곳에서 함께 선언하면
+#    tools.schema가 OpenAI tools 형식 목록을 자동으로 만들어 줍니다.
+#  - 한 번의 응답에 들어 있는 여러 도구 호출(tool_calls)을 스레드 풀에서 동시에 실행하고,
+#    도구마다 정한 시간(timeout) 안에 끝나지 않으면 오류 결과를 대신 돌려줍니다.
+#    → "서울, 부산 날씨 + AI 뉴스"가 도구 시간의 합이 아니라 가장 느린 도구 시간만큼 걸립니다.
+#  - memoize=True로 등록한 도구는 같은 인자로 다시 불리면 저장해 둔 결과를 바로 돌려줍니다.
+#    결과는 도구마다 정한 ttl(초) 동안만 쓰고, 최대 max_memo개까지만 보관합니다. (오래 안 쓴 것부터 삭제)
+#    ttl=0이면 저장하지 않고, 한 번의 응답 안에서 같은 호출이 겹칠 때만 한 번 실행합니다. (시간/날씨 등)
+#    (등록기 하나 = 세션 하나. clear_memo()로 비울 수 있습니다.)
+# ------------------------------------------------------------
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+class ToolRegistry:
+    """도구 함수와 스키마를 함께 보관하고, 도구 호출을 병렬로 실행합니다."""
+
+    def __init__(self, max_workers=8, default_timeout=15.0, default_ttl=300.0, max_memo=256):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.default_ttl = default_ttl  # memoize 도구의 기본 결과 유효 시간(초)
+        self.max_memo = max_memo  # 저장해 둘 결과의 최대 개수
+        self._tools = {}  # 이름 → (함수, 스키마, timeout, memoize, ttl)
+        self._memo = OrderedDict()  # (이름, 인자 JSON) → (결과 문자열, 만료 시각), 오래 안 쓴 것이 앞
+        self._executor = None
+
+    # -------------------------------
+    # 등록 / 스키마
+    # -------------------------------
+    def tool(self, description, properties=None, required=None, timeout=None, name=None, memoize=False, ttl=None):
+        """
+        함수를 도구로 등록하는 데코레이터입니다.
+        properties는 {"인자 이름": {"type": "string", ...}} 형식의 JSON 스키마입니다.
+        memoize=True면 같은 인자의 호출 결과를 ttl초(기본 default_ttl) 동안 저장해 두고 재사용합니다. (조회용 도구에만 사용)
+        """
+        def register(func):
+            tool_name = name or func.__name__
+            schema = {
+                "type": "function",
+                "function": {
+                    "name": tool_name,
+                    "description": description,
+                    "parameters": {
+                        "type": "object",
+                        "properties": properties or {},
+                        "required": list(required or []),
+                    },
+                },
+            }
+            self._tools[tool_name] = (func, schema, timeout or self.default_timeout, memoize,
+                                      self.default_ttl if ttl is None else ttl)
+            return func
+        return register
+
+    @property
+    def schema(self):
+        """OpenAI chat.completions의 tools= 에 그대로 넘길 수 있는 목록입니다."""
+        return [entry[1] for entry in self._tools.values()]
+
+    def __contains__(self, tool_name):
+        return tool_name in self._tools
+
+    # -------------------------------
+    # 실행
+    # -------------------------------
+    def clear_memo(self):
+        self._memo.clear()
+
+    def _memo_get(self, key):
+        entry = self._memo.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self._memo[key]  # 유효 시간이 지난 결과는 버립니다.
+            return None
+        self._memo.move_to_end(key)
+        return entry[0]
+
+    def _memo_put(self, key, content):
+        ttl = self._tools[key[0]][4]
+        if ttl <= 0:
+            return  # ttl=0인 도구(시간, 날씨 등)는 저장하지 않습니다.
+        self._memo[key] = (content, time.monotonic() + ttl)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.max_memo:
+            self._memo.popitem(last=False)  # 가장 오래 안 쓴 결과부터 지웁니다.
+
+    def _filter_args(self, tool_name, args):
+        known = self._tools[tool_name][1]["function"]["parameters"]["properties"]
+        if known:
+            args = {k: v for k, v in args.items() if k in known}  # 스키마에 없는 인자는 버립니다.
+        return args
+
+    def run(self, tool_name, args):
+        """도구 하나를 실행하고 결과 문자열을 반환합니다. 실패하면 오류 JSON을 반환합니다."""
+        return self._execute(tool_name, args)[0]
+
+    def _execute(self, tool_name, args):
+        """(결과 문자열, 성공 여부)를 반환합니다. 성공한 결과만 memo에 저장됩니다."""
+        if tool_name not in self._tools:
+            return _error(f"알 수 없는 도구: {tool_name}"), False
+
+        func = self._tools[tool_name][0]
+        try:
+            result = func(**self._filter_args(tool_name, args))
+        except Exception as e:
+            return _error(str(e)), False
+        return (result if isinstance(result, str) else json.dumps(result, ensure_ascii=False)), True
+
+    def run_calls(self, tool_calls):
+        """
+        tool_calls(응답 객체의 tool_call 또는 {"id", "name", "arguments"} 딕셔너리 목록)를
+        동시에 실행하고, 요청 순서대로 role="tool" 메시지 목록을 반환합니다.
+        """
+        if self._executor is None:
+            # 시간 초과된 도구가 계속 돌고 있어도 다음 호출을 막지 않도록 풀을 계속 재사용합니다.
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+
+        started = time.monotonic()
+        jobs = []  # (id, 이름, memo 키, 결과 문자열 또는 Future)
+        pending = {}  # 이번 호출 안에서 같은 요청이 또 오면 같은 Future를 함께 씁니다.
+        for call in tool_calls:
+            call_id, name, arguments = _normalize_call(call)
+            try:
+                args = json.loads(arguments or "{}")
+            except json.JSONDecodeError as e:
+                jobs.append((call_id, name, None, _error(f"인자 JSON 오류: {e}")))
+                continue
+
+            key = None
+            if name in self._tools and self._tools[name][3]:
+                key = (name, json.dumps(self._filter_args(name, args), sort_keys=True, ensure_ascii=False))
+                cached = self._memo_get(key)
+                if cached is not None:
+                    print(f"♻️ [System] '{name}' 저장된 결과를 재사용합니다.")
+                    jobs.append((call_id, name, None, cached))
+                    continue
+                if key in pending:
+                    jobs.append((call_id, name, key, pending[key]))
+                    continue
+
+            future = self._executor.submit(self._execute, name, args)
+            if key is not None:
+                pending[key] = future
+            jobs.append((call_id, name, key, future))
+
+        messages = []
+        for call_id, name, key, job in jobs:
+            content = job
+            if not isinstance(job, str):
+                timeout = self._tools[name][2] if name in self._tools else self.default_timeout
+                try:
+                    content, ok = job.result(timeout=max(0.0, started + timeout - time.monotonic()))
+                    if ok and key is not None:
+                        self._memo_put(key, content)
+                except FutureTimeout:
+                    print(f"⏰ [System] '{name}' 도구가 {timeout:g}초 안에 끝나지 않았습니다.")
+                    content = _error(f"시간 초과 ({timeout:g}초)")
+            messages.append({"tool_call_id": call_id, "role": "tool", "name": name, "content": content})
+        return messages
+
+
+def _error(message):
+    return json.dumps({"status": "error", "error": message}, ensure_ascii=False)
+
+
+def _normalize_call(call):
+    """tool_call 객체와 딕셔너리를 (id, 이름, 인자 JSON 문자열)로 맞춥니다."""
+    if isinstance(call, dict):
+        return call["id"], call["name"], call["arguments"]
+    return call.id, call.function.name, call.function.arguments
@@ -0,0 +1,202 @@
+# ------------------------------------------------------------
+# vad_recorder.py
+# 콜백(callback) 방식 음성 녹음기 (VAD: 말소리 감지)
+#  - 마이크 블록을 리스트에 쌓지 않고, 미리 잡아 둔 링 버퍼(ring buffer)에 바로 씁니다.
+#  - 음량(RMS)은 미리 만들어 둔 float32 작업 버퍼로 계산해서 블록마다 새 배열을 만들지 않습니다.
+#  - 말이 감지되기 직전 pre_roll 초를 함께 남겨서 첫 음절이 잘리지 않습니다.
+#  - 녹음 길이는 max_seconds로 제한되어 아무리 길게 말해도 메모리가 늘어나지 않습니다.
+#  - 아무도 말하지 않으면 max_wait초(기본: max_seconds) 뒤에 빈 결과(None)로 끝납니다.
+#  - sd.rec()/sd.wait()를 블록마다 부르지 않으므로 블록 사이에 소리가 빠지지 않습니다.
+#  - on_segment를 주면 말하는 도중 짧은 쉼(segment_pause)마다 그때까지의 구간을 넘겨줍니다.
+#    (streaming_stt.py에서 말하는 동안 미리 받아쓰기에 사용)
+# ------------------------------------------------------------
+import threading
+
+import numpy as np
+
+
+class VADRecorder:
+    """링 버퍼 + 에너지 기반 VAD로 한 번의 발화(utterance)를 녹음합니다."""
+
+    def __init__(self,
+                 fs=16000,
+                 silence_threshold=150,
+                 silence_duration=1.2,
+                 pre_roll=0.3,
+                 max_seconds=30.0,
+                 wait_for_voice=True,
+                 ignore_initial=0.0,
+                 block_duration=0.1,
+                 on_voice=None,
+                 on_segment=None,
+                 segment_pause=0.5,
+                 min_segment=1.5,
+                 max_wait=None):
+        self.fs = fs
+        self.silence_threshold = silence_threshold
+        self.silence_samples = int(silence_duration * fs)
+        self.pre_roll_samples = int(pre_roll * fs)
+        self.ignore_samples = int(ignore_initial * fs)
+        self.block_size = int(block_duration * fs)
+        self.wait_for_voice = wait_for_voice
+        self.on_voice = on_voice  # 말이 처음 감지되면 호출할 함수 (예: 안내 문구 출력)
+        self.on_segment = on_segment  # 구간(int16 배열)이 완성될 때마다 호출할 함수
+        self.segment_pause_samples = int(segment_pause * fs)
+        self.min_segment_samples = int(min_segment * fs)
+        # 말이 시작되기를 기다리는 최대 시간 (지나면 말이 없었던 것으로 보고 끝냄)
+        self.max_wait_samples = int((max_seconds if max_wait is None else max_wait) * fs)
+
+        # 🥣 미리 잡아 두는 버퍼 (녹음 중에는 새로 할당하지 않음)
+        self.capacity = int(max_seconds * fs) + self.pre_roll_samples
+        self._ring = np.zeros(self.capacity, dtype=np.int16)
+        self._scratch = np.zeros(self.block_size * 4, dtype=np.float32)
+
+        self.reset()
+
+    def reset(self):
+        """다음 발화를 녹음할 수 있도록 상태를 초기화합니다."""
+        self._written = 0  # 지금까지 받은 전체 샘플 수 (링 위치 = _written % capacity)
+        self._start = None if self.wait_for_voice else 0  # 발화 시작 위치 (샘플 단위)
+        self._silent = 0  # 연속 무음 샘플 수
+        self._segment_start = self._start  # 아직 넘기지 않은 구간의 시작 위치
+        self._segment_voiced = False  # 그 구간에 말소리가 있었는지 (무음만 있는 구간은 넘기지 않음)
+        self.voice_detected = not self.wait_for_voice
+        self.truncated = False  # max_seconds를 넘겨서 끊겼는지 여부
+        self.overflowed = False  # 입력 오버플로우(샘플 손실)가 있었는지 여부
+        self._finished = False  # finish()가 이미 불렸는지 여부
+        self.done = threading.Event()  # 마지막 구간까지 넘긴 뒤에 켜집니다.
+
+    # -------------------------------
+    # 블록 처리 (콜백에서 호출)
+    # -------------------------------
+    def _rms(self, block):
+        n = len(block)
+        if n > len(self._scratch):
+            self._scratch = np.zeros(n, dtype=np.float32)
+        buf = self._scratch[:n]
+        np.copyto(buf, block, casting="unsafe")  # int16 → float32 (기존 버퍼에 복사, 새 배열 없음)
+        return float(np.sqrt(np.dot(buf, buf) / n)) if n else 0.0
+
+    def _write(self, block):
+        n = len(block)
+        pos = self._written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._ring[pos:pos + first] = block[:first]
+        if first < n:
+            self._ring[:n - first] = block[first:]  # 끝에 닿으면 앞에서부터 이어서 씁니다.
+        self._written += n
+
+    def feed(self, block):
+        """마이크 블록(int16 1차원 배열) 하나를 처리합니다. 발화가 끝나면 True를 반환합니다."""
+        if self._finished:
+            return True
+
+        finished = False
+        volume = self._rms(block)
+        self._write(block)
+
+        if not self.voice_detected:
+            if volume > self.silence_threshold:
+                # 🗣️ 말 시작: 직전 pre_roll 구간부터 녹음한 것으로 칩니다.
+                self.voice_detected = True
+                self._start = max(0, self._written - len(block) - self.pre_roll_samples)
+                self._segment_start = self._start
+                self._segment_voiced = True
+                if self.on_voice:
+                    self.on_voice()
+            elif self._written >= self.max_wait_samples:
+                self.finish()  # ⏳ 끝까지 말이 없었습니다. (audio()는 None)
+            return self._finished
+
+        if self._written <= self.ignore_samples:
+            return False  # 시작 직후 구간은 무음 판정에서 제외합니다.
+
+        if volume < self.silence_threshold:
+            self._silent += len(block)
+            if self._silent >= self.silence_samples:
+                finished = True
+            elif self._silent - len(block) < self.segment_pause_samples <= self._silent:
+                # ✂️ 말 중간의 짧은 쉼: 충분히 긴 구간이 모였으면 여기서 잘라 넘깁니다.
+                if self._written - self._segment_start >= self.min_segment_samples:
+                    self._emit_segment()
+        else:
+            self._silent = 0
+            self._segment_voiced = True
+
+        # 📏 최대 길이에 닿으면 (링 버퍼가 시작 지점을 덮어쓰기 전에) 종료합니다.
+        #    구간을 넘겨주는 경우에는 넘기지 않은 구간 길이만 제한합니다.
+        start = self._segment_start if self.on_segment else self._start
+        if self._written - start >= self.capacity - self.block_size:
+            if self.on_segment:
+                self._emit_segment()
+            else:
+                self.truncated = True
+                finished = True
+
+        if finished:
+            self.finish()
+        return finished
+
+    def finish(self):
+        """
+        녹음을 끝내고, 아직 넘기지 않은 마지막 구간이 있으면 on_segment로 넘깁니다.
+        done은 마지막 구간을 넘긴 뒤에 켜므로, done을 기다리던 쪽이 마지막 구간을 놓치지 않습니다.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        self._emit_segment()
+        self.done.set()
+
+    def _emit_segment(self):
+        if self.on_segment and self._segment_voiced and self._written > self._segment_start:
+            self.on_segment(self.slice(self._segment_start, self._written))
+        self._segment_start = self._written
+        self._segment_voiced = False
+
+    def callback(self, indata, frames, time_info, status):
+        """sd.InputStream(callback=...)용 콜백입니다."""
+        if status:
+            self.overflowed = True
+        self.feed(indata[:, 0])
+
+    # -------------------------------
+    # 결과 꺼내기
+    # -------------------------------
+    def audio(self):
+        """녹음된 발화를 int16 1차원 배열로 반환합니다. 말이 없었으면 None."""
+        if self._start is None or self._written <= self._start:
+            return None
+        return self.slice(self._start, self._written)
+
+    def slice(self, start, end):
+        """전체 샘플 위치 [start, end) 구간을 링 버퍼에서 꺼내 새 배열로 반환합니다."""
+        start = max(start, self._written - self.capacity)
+        a, b = start % self.capacity, end % self.capacity
+        if end - start == 0:
+            return np.zeros(0, dtype=np.int16)
+        if a < b:
+            return self._ring[a:b].copy()
+        return np.concatenate((self._ring[a:], self._ring[:b]))
+
+    # -------------------------------
+    # 마이크로 녹음
+    # -------------------------------
+    def record(self, timeout=None):
+        """마이크에서 발화 하나를 녹음하고 int16 배열(없으면 None)을 반환합니다."""
+        import sounddevice as sd  # 마이크가 필요한 경우에만 불러옵니다.
+
+        self.reset()
+        with sd.InputStream(samplerate=self.fs, channels=1, dtype="int16",
+                            blocksize=self.block_size, callback=self.callback):
+            finished = self.done.wait(timeout)
+        if not finished:
+            self.finish()  # timeout으로 끝났으면 (스트림을 닫은 뒤) 남은 구간을 정리합니다.
+        return self.audio()
+
+
+def record_utterance(fs=16000, silence_threshold=150, silence_duration=1.2, timeout=60.0, **options):
+    """VADRecorder로 발화 하나를 녹음해 int16 배열(없으면 None)을 반환하는 간단한 함수입니다. (최대 timeout초)"""
+    recorder = VADRecorder(fs=fs, silence_threshold=silence_threshold,
+                           silence_duration=silence_duration, **options)
+    return recorder.record(timeout)
@@ -0,0 +1,139 @@
+# ------------------------------------------------------------
+# vector_store.py
+# 임베딩 벡터 저장소 (float32 메모리 맵 행렬 + id→행 번호 인덱스)
+#  - 여러 문장을 한 번의 embeddings 요청으로 묶어서(batch) 임베딩합니다.
+#  - 벡터는 길이 1로 정규화해서 저장하므로 코사인 유사도 = 내적(dot) 입니다.
+#  - 검색은 "저장된 행렬 @ 질문 벡터" 행렬-벡터 곱 한 번으로 모든 유사도를 구합니다.
+# ------------------------------------------------------------
+import json
+import os
+
+import numpy as np
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+class EmbeddingStore:
+    """디렉터리 하나에 vectors.f32(행렬)와 index.json(id 목록)을 저장하는 벡터 저장소입니다."""
+
+    def __init__(self, client, path="embeddings", model=EMBEDDING_MODEL, batch_size=100):
+        self.client = client
+        self.path = path
+        self.model = model
+        self.batch_size = batch_size
+
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.index_path = os.path.join(path, "index.json")
+        os.makedirs(path, exist_ok=True)
+
+        # 저장된 인덱스 불러오기 (없으면 빈 저장소)
+        self.dim = None
+        self.ids = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            # 다른 모델의 벡터와 섞이면 유사도가 의미 없어지므로, 저장된 모델과 다르면 열지 않습니다.
+            if meta.get("model", model) != model:
+                raise ValueError(
+                    f"{path}의 벡터는 '{meta['model']}' 모델로 만들어졌습니다. "
+                    f"'{model}' 모델을 쓰려면 다른 path를 지정하거나 폴더를 지우고 다시 만드세요."
+                )
+            self.dim = meta["dim"]
+            self.ids = meta["ids"]
+        self.rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+
+        self._matrix = None
+        self._capacity = 0
+        if self.dim is not None:
+            self._open(os.path.getsize(self.vectors_path) // (self.dim * 4))
+
+    # -------------------------------
+    # 행렬 파일 (메모리 맵)
+    # -------------------------------
+    def _open(self, capacity):
+        """vectors.f32를 capacity 행 크기로 늘린 뒤 메모리 맵으로 다시 엽니다."""
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r+",
+                                 shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def _ensure_capacity(self, rows):
+        if rows > self._capacity:
+            self._open(max(rows, self._capacity * 2, 64))  # 두 배씩 늘려 재할당 횟수를 줄입니다.
+
+    def save(self):
+        """행렬을 디스크에 반영하고 id 목록을 저장합니다."""
+        if self._matrix is not None:
+            self._matrix.flush()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim, "ids": self.ids}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)  # 쓰는 도중 중단돼도 기존 인덱스가 깨지지 않게 교체합니다.
+
+    def __len__(self):
+        return len(self.ids)
+
+    # -------------------------------
+    # 임베딩
+    # -------------------------------
+    def embed(self, texts):
+        """texts를 batch_size개씩 묶어 요청하고, 정규화된 (N, dim) float32 행렬을 반환합니다."""
+        chunks = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i:i + self.batch_size]
+            response = self.client.embeddings.create(model=self.model, input=batch)
+            chunks.append(np.array([d.embedding for d in response.data], dtype=np.float32))
+
+        vectors = np.vstack(chunks) if chunks else np.empty((0, self.dim or 0), np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add_texts(self, texts, ids=None):
+        """문장들을 임베딩해서 저장합니다. 이미 있는 id는 벡터를 새 값으로 덮어씁니다."""
+        ids = list(ids) if ids is not None else list(texts)
+        if len(ids) != len(texts):
+            raise ValueError("texts와 ids의 개수가 같아야 합니다.")
+        if not texts:
+            return
+
+        vectors = self.embed(list(texts))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"임베딩 차원({vectors.shape[1]})이 저장된 차원({self.dim})과 다릅니다.")
+
+        new_ids = [doc_id for doc_id in dict.fromkeys(ids) if doc_id not in self.rows]
+        self._ensure_capacity(len(self.ids) + len(new_ids))
+        for doc_id in new_ids:
+            self.rows[doc_id] = len(self.ids)
+            self.ids.append(doc_id)
+
+        target_rows = np.fromiter((self.rows[doc_id] for doc_id in ids), dtype=np.int64, count=len(ids))
+        self._matrix[target_rows] = vectors
+        self.save()
+
+    def get_vector(self, doc_id):
+        return np.asarray(self._matrix[self.rows[doc_id]])
+
+    # -------------------------------
+    # 검색
+    # -------------------------------
+    def search(self, query, k=5):
+        """질문(문장 또는 벡터)과 가장 비슷한 k개를 [(id, 유사도), ...]로 반환합니다."""
+        if not self.ids:
+            return []
+        if isinstance(query, str):
+            query = self.embed([query])[0]
+        else:
+            query = np.asarray(query, dtype=np.float32)
+            query = query / max(np.linalg.norm(query), 1e-12)
+
+        scores = self._matrix[:len(self.ids)] @ query  # 모든 저장 벡터와의 코사인 유사도를 한 번에 계산
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]  # 전체 정렬 없이 상위 k개만 고릅니다.
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
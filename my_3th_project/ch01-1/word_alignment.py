@@ -0,0 +1,150 @@
+# ------------------------------------------------------------
+# word_alignment.py
+# TTS 음성에서 단어별 시작/끝 시간 추정 (외부 모델 없이 에너지 기반)
+#  - WAV 샘플을 20ms 프레임으로 나눠 음량(RMS)을 한 번에(벡터 연산) 계산합니다.
+#  - 조용한 프레임이 min_pause 이상 이어지는 곳을 "쉼"으로 보고, 말소리 구간들을 찾습니다.
+#  - 단어 길이(글자 수) 비율로 말소리 시간에 단어를 나눠 배치하되,
+#    쉼과 가장 가까운 단어 경계는 그 쉼에 맞춥니다. (쉼 동안에는 하이라이트가 멈춤)
+#  - 결과는 노래방 하이라이트(char_timeline)와 단어 단위 SRT/VTT 자막에 함께 사용합니다.
+# ------------------------------------------------------------
+import re
+
+import numpy as np
+
+WORD = re.compile(r"\S+")
+
+
+# ------------------------------------------------------------
+# 1) 말소리 구간 찾기
+# ------------------------------------------------------------
+def voiced_segments(data, fs, frame=0.02, min_pause=0.12, threshold_ratio=0.1):
+    """말소리 구간 [(시작 초, 끝 초), ...]를 반환합니다. min_pause보다 짧은 쉼은 이어 붙입니다."""
+    samples = np.asarray(data)
+    if samples.ndim > 1:
+        samples = samples[:, 0]
+    hop = max(1, int(frame * fs))
+    n = len(samples) // hop
+    if n == 0:
+        return []
+
+    frames = samples[:n * hop].reshape(n, hop).astype(np.float32)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / hop)  # 프레임별 음량 (복사 없이 한 번에)
+
+    # 배경 소음보다 충분히 크고, 최대 음량의 threshold_ratio 이상이면 말소리로 봅니다.
+    threshold = max(np.percentile(rms, 10) * 2.0, rms.max() * threshold_ratio)
+    voiced = rms > threshold
+    if not voiced.any():
+        return []
+
+    edges = np.diff(np.concatenate(([0], voiced.view(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    # 짧은 쉼은 쉼으로 보지 않고 앞뒤 구간을 합칩니다.
+    keep = (starts[1:] - ends[:-1]) * frame >= min_pause
+    starts = np.concatenate((starts[:1], starts[1:][keep]))
+    ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+    return list(zip((starts * hop / fs).tolist(), (ends * hop / fs).tolist()))
+
+
+# ------------------------------------------------------------
+# 2) 단어 배치
+# ------------------------------------------------------------
+def align_words(sentence, data, fs, **options):
+    """
+    sentence의 단어별 [(단어, 시작 초, 끝 초), ...]를 반환합니다. (sentence 음성 data 기준)
+    말소리를 찾지 못하면 전체 길이에 글자 수 비율로 나눕니다.
+    """
+    words = WORD.findall(sentence)
+    if not words:
+        return []
+    duration = len(data) / fs
+    segments = voiced_segments(data, fs, **options) or [(0.0, duration)]
+
+    seg_start = np.array([s for s, _ in segments])
+    seg_len = np.array([e - s for s, e in segments])
+    voiced_end = np.cumsum(seg_len)  # "말소리만 이어 붙인 시간"에서 각 구간이 끝나는 위치
+    total = voiced_end[-1]
+
+    # 단어 경계를 글자 수 비율로 정합니다. (말소리 시간 기준)
+    weights = np.array([max(1, sum(ch.isalnum() for ch in w)) for w in words], dtype=float)
+    bounds = np.concatenate(([0.0], np.cumsum(weights) / weights.sum() * total))
+
+    # 쉼마다 가장 가까운 단어 경계를 쉼 위치로 옮기고, 그 사이 단어들은 비율대로 다시 나눕니다.
+    anchors = {0: 0.0, len(words): total}
+    if len(words) > 1:
+        for pause in voiced_end[:-1]:
+            k = int(np.argmin(np.abs(bounds[1:-1] - pause))) + 1
+            anchors.setdefault(k, pause)
+    bounds = _spread(weights, anchors)
+
+    # 말소리 시간 → 실제 시간: 쉼 위치의 경계는 앞 단어는 구간 끝, 뒤 단어는 다음 구간 시작으로 보냅니다.
+    starts = _to_real(bounds[:-1], seg_start, voiced_end, seg_len, side="right")
+    ends = _to_real(bounds[1:], seg_start, voiced_end, seg_len, side="left")
+    return [(w, float(s), float(e)) for w, s, e in zip(words, starts, ends)]
+
+
+def _spread(weights, anchors):
+    """고정된 경계(anchors: 경계 번호 → 시간) 사이의 단어들을 글자 수 비율로 나눕니다."""
+    keys = sorted(anchors)
+    result = np.zeros(len(weights) + 1)
+    for a, b in zip(keys[:-1], keys[1:]):
+        cum = np.concatenate(([0.0], np.cumsum(weights[a:b])))
+        result[a:b + 1] = anchors[a] + (anchors[b] - anchors[a]) * cum / cum[-1]
+    return result
+
+
+def _to_real(points, seg_start, voiced_end, seg_len, side):
+    index = np.minimum(np.searchsorted(voiced_end, points, side=side), len(voiced_end) - 1)
+    offset = points - (voiced_end[index] - seg_len[index])
+    return seg_start[index] + np.clip(offset, 0.0, seg_len[index])
+
+
+# ------------------------------------------------------------
+# 3) 하이라이트용 글자 타임라인
+# ------------------------------------------------------------
+def char_timeline(sentence, timings, duration):
+    """
+    (시각 배열, 글자 인덱스 배열)을 반환합니다.
+    np.interp(경과 시간, 시각, 인덱스)로 그 순간 하이라이트할 글자 수를 구할 수 있습니다.
+    """
+    spans = [m.span() for m in WORD.finditer(sentence)]
+    times, indices = [0.0], [0]
+    for (a, b), (_, start, end) in zip(spans, timings):
+        times += [start, end]
+        indices += [a, b]
+    times.append(max(duration, times[-1]))
+    indices.append(len(sentence))
+    return np.maximum.accumulate(np.array(times)), np.array(indices)
+
+
+# ------------------------------------------------------------
+# 4) 단어 단위 자막 (SRT / VTT)
+# ------------------------------------------------------------
+def format_timestamp(seconds, separator=","):
+    ms = int(round(seconds * 1000))
+    return f"{ms // 3600000:02}:{ms // 60000 % 60:02}:{ms // 1000 % 60:02}{separator}{ms % 1000:03}"
+
+
+def save_word_srt(sentence_timings, filename="result_words.srt"):
+    """
+    단어마다 자막 한 줄(cue)을 만듭니다.
+    sentence_timings는 [(문장 시작 초, [(단어, 시작, 끝), ...]), ...] 입니다.
+    """
+    with open(filename, "w", encoding="utf-8") as f:
+        i = 0
+        for offset, timings in sentence_timings:
+            for word, start, end in timings:
+                i += 1
+                f.write(f"{i}\n{format_timestamp(offset + start)} --> {format_timestamp(offset + end)}\n{word}\n\n")
+
+
+def save_vtt(sentence_timings, filename="result.vtt"):
+    """문장마다 자막 한 줄을 만들고, 단어마다 <시각> 태그를 넣어 플레이어가 단어 단위로 강조하게 합니다."""
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("WEBVTT\n\n")
+        for offset, timings in sentence_timings:
+            if not timings:
+                continue
+            start, end = offset + timings[0][1], offset + timings[-1][2]
+            words = [timings[0][0]] + [f"<{format_timestamp(offset + s, '.')}>{w}" for w, s, _ in timings[1:]]
+            f.write(f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n{' '.join(words)}\n\n")
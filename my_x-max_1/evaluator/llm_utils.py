@@ -9,19 +9,42 @@
 from openai import OpenAI  # OpenAI의 AI 모델을 사용하기 위해 공식 라이브러리를 불러옵니다. (터미널 설치: pip install openai)
 from dotenv import load_dotenv  # .env 파일에서 API 키를 가져오기 위해 불러옵니다. (터미널 설치: pip install python-dotenv)
 import os  # 운영체제 기능(환경변수 등)을 사용하기 위해 불러옵니다. (기본 내장)
+import sys  # 상위 폴더의 공용 모듈을 찾을 수 있도록 경로를 추가하기 위해 불러옵니다. (기본 내장)
 import time  # 재시도 시 대기 시간을 주기 위해 불러옵니다. (기본 내장)
+from concurrent.futures import ThreadPoolExecutor  # 여러 광고를 동시에 평가하기 위한 스레드 풀입니다. (기본 내장)
+
+# 응답 캐시 모듈은 상위 폴더(my_x-max_1/llm_cache.py) 한 곳에만 두고 함께 씁니다. (이 폴더 파일이 먼저 검색되도록 맨 뒤에 추가)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_cache import ResponseCache  # 같은 요청의 응답을 디스크에 저장해 재사용하는 캐시입니다. (상위 폴더 공용 파일)
 
 load_dotenv()  # .env 파일에서 OPENAI_API_KEY 로드
+# OPENAI_BASE_URL 환경변수를 지정하면 로컬 가짜(fake) 서버로 요청을 보내 테스트할 수 있습니다.
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # 클라이언트 객체 생성
+cache = ResponseCache()  # 응답 캐시 (temperature=0.0 평가 호출은 재실행 시 API 비용 없이 재사용)
 
 
 def ask_llm(prompt: str,
             model: str = "gpt-4o-mini",
             temperature: float = 0.7,
             max_retries: int = 3,
-            retry_delay: float = 2.0) -> str:
-    """기본적인 LLM 호출 함수 (재시도 포함)."""
+            retry_delay: float = 2.0,
+            use_cache: bool = True) -> str:
+    """기본적인 LLM 호출 함수 (재시도 + 응답 캐시 포함)."""
     
+    # 🖐 [검사]: 한 번도 시도하지 않으면 돌려줄 응답이 없으므로 먼저 막습니다.
+    if max_retries < 1:
+        raise ValueError("max_retries는 1 이상이어야 합니다.")
+
+    messages = [{"role": "user", "content": prompt}]
+
+    # 🖐 [검사]: 캐시에 같은 요청의 응답이 있으면 API 호출 없이 바로 반환합니다.
+    cacheable = use_cache and cache.is_cacheable(temperature)
+    key = cache.make_key(model, temperature, messages)
+    if cacheable:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     # 🔄 [반복]: 네트워크 오류 등에 대비해 정해진 횟수만큼 재시도합니다.
     for attempt in range(1, max_retries + 1):
         try:
@@ -30,12 +53,13 @@ def ask_llm(prompt: str,
             resp = client.chat.completions.create(
                 model=model,
                 temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
+                messages=messages
             )
             
             # 6. 결과 처리 (Data Processing)
-            # 🤜 [결과 저장]: 응답 객체에서 텍스트 내용(.content)만 추출하여 반환합니다.
-            return resp.choices[0].message.content
+            # 🤜 [결과 저장]: 응답 객체에서 텍스트 내용(.content)만 추출합니다.
+            content = resp.choices[0].message.content
+            break
 
         except Exception as e:
             # 2. 컨텍스트 관리 (에러 로그)
@@ -48,6 +72,11 @@ def ask_llm(prompt: str,
             # 🔄 [반복] 대기: 서버 과부하를 막기 위해 잠시 멈춥니다.
             time.sleep(retry_delay)
 
+    # 재시도 블록 밖에서 캐시에 저장합니다. (캐시 오류는 경고만 남기고 받은 응답은 그대로 반환)
+    if cacheable:
+        cache.store(key, content)
+    return content
+
 
 def evaluate_ad(ad_text: str, template: str) -> int:
     """광고 문구 1개를 평가하여 총점을 정수로 반환."""
@@ -73,3 +102,21 @@ def evaluate_ad(ad_text: str, template: str) -> int:
 
     # 파싱에 실패한 경우 0점을 반환합니다.
     return 0
+
+
+def evaluate_ads(ads: list, template: str, max_workers: int = 5) -> list:
+    """광고 문구 여러 개를 동시에 평가하여 입력 순서 그대로 점수 리스트를 반환."""
+
+    # 🖐 [검사]: 평가할 광고가 없으면 스레드 풀을 만들 필요가 없습니다.
+    if not ads:
+        return []
+
+    # 👌 [실행]: 동시에 실행할 작업 수를 광고 개수 이내로 제한합니다. (최소 1개)
+    workers = max(1, min(max_workers, len(ads)))
+
+    # 3. 추론 요청 (병렬)
+    # 👆 [AI 호출]: LLM 호출은 대부분 네트워크 대기 시간이므로 스레드로 동시에 보내면
+    # 전체 소요 시간이 광고 개수만큼 늘어나지 않고 가장 느린 1회 호출 시간에 가까워집니다.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 🤜 [결과 저장]: executor.map은 끝난 순서와 상관없이 입력 순서대로 결과를 돌려줍니다.
+        return list(executor.map(lambda ad: evaluate_ad(ad, template), ads))
@@ -5,7 +5,7 @@
 # 
 # [주의] 이 파일들은 우리가 직접 만든 것이므로 pip로 설치하지 않습니다. 같은 폴더에 파일이 있어야 합니다.
 # llm_utils.py에서 기본 생성 함수(ask_llm)와 평가 함수(evaluate_ad)를 가져옵니다.
-from llm_utils import ask_llm, evaluate_ad
+from llm_utils import ask_llm, evaluate_ads
 # prompt_templates.py에서 광고 생성 템플릿과 평가 템플릿을 가져옵니다.
 from prompt_templates import AD_TEMPLATE, EVALUATOR_TEMPLATE
 
@@ -85,16 +85,14 @@ def main():
         print(f"{i}. {ad}")
 
     # --- ④ 평가 (Evaluator) ---
-    scores = []
     print("\n[광고 평가 결과]")
-    
-    # 🔄 [반복]: 생성된 모든 광고를 하나씩 순회하며 점수를 매깁니다.
-    for i, ad in enumerate(ads_list, start=1):
-        # 👆 [AI 호출]: evaluate_ad 함수 내부에서 AI가 심사위원(Evaluator)이 되어 점수를 매깁니다.
-        score = evaluate_ad(ad, EVALUATOR_TEMPLATE)
-        
-        # 🤜 [결과 저장]: 점수를 리스트에 모아둡니다.
-        scores.append(score)
+
+    # 👆 [AI 호출]: 모든 광고를 한꺼번에 심사위원(Evaluator)에게 보내 동시에 점수를 매깁니다.
+    # 🤜 [결과 저장]: 점수 리스트는 ads_list와 같은 순서로 돌아옵니다.
+    scores = evaluate_ads(ads_list, EVALUATOR_TEMPLATE)
+
+    # 🔄 [반복]: 광고 번호와 점수를 짝지어 출력합니다.
+    for i, score in enumerate(scores, start=1):
         print(f"{i}번 광고 총점: {score}")
 
     # --- ⑤ 최고 점수 광고 선택 ---
@@ -2,27 +2,49 @@
 from openai import OpenAI
 from dotenv import load_dotenv
 import os
+import sys
 import time
 
+# 응답 캐시는 상위 폴더(my_x-max_1/llm_cache.py)의 공용 모듈을 씁니다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_cache import ResponseCache
+
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+cache = ResponseCache()
 
 def ask_llm(prompt: str,
             model: str = "gpt-4o-mini",
             temperature: float = 0.7,
             max_retries: int = 3,
-            retry_delay: float = 2.0) -> str:
+            retry_delay: float = 2.0,
+            use_cache: bool = True) -> str:
     """기본 LLM 호출 함수입니다."""
+    if max_retries < 1:
+        raise ValueError("max_retries는 1 이상이어야 합니다.")
+    messages = [{"role": "user", "content": prompt}]
+    cacheable = use_cache and cache.is_cacheable(temperature)
+    key = cache.make_key(model, temperature, messages)
+    if cacheable:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     for attempt in range(1, max_retries + 1):
         try:
             resp = client.chat.completions.create(
                 model=model,
                 temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
+                messages=messages
             )
-            return resp.choices[0].message.content
+            content = resp.choices[0].message.content
+            break
         except Exception as e:
             print(f"[오류] 시도 {attempt}/{max_retries}: {e}")
             if attempt == max_retries:
                 return "AI 응답을 가져오는 데 실패했습니다."
             time.sleep(retry_delay)
+
+    if cacheable:
+        cache.store(key, content)
+    return content
@@ -0,0 +1,154 @@
+# my_x-max_1/
+#  ├── llm_cache.py         # LLM 응답 디스크 캐시 모듈 (이 파일 하나를 모든 폴더가 함께 씁니다)
+#  ├── llm_utils.py         # LLM 호출 함수 모듈
+#  ├── evaluator/           # evaluator/llm_utils.py 도 이 llm_cache.py 를 불러옵니다.
+#  └── llm_ad_project/      # llm_ad_project/llm_utils.py 도 이 llm_cache.py 를 불러옵니다.
+
+# llm_cache.py
+
+import hashlib  # 요청 내용을 짧은 해시(Hash) 키로 바꾸기 위해 불러옵니다. (기본 내장)
+import json  # 요청 내용을 항상 같은 문자열로 직렬화하기 위해 불러옵니다. (기본 내장)
+import os  # 환경변수에서 캐시 설정을 읽기 위해 불러옵니다. (기본 내장)
+import sqlite3  # 응답을 디스크에 저장하는 내장 데이터베이스입니다. (기본 내장)
+import threading  # 여러 스레드가 동시에 캐시를 쓸 때 충돌을 막기 위해 불러옵니다. (기본 내장)
+import time  # 저장 시각과 만료(TTL) 계산을 위해 불러옵니다. (기본 내장)
+
+# ✍️ [기록]: 캐시 기본 설정값입니다. 환경변수로 바꿀 수 있습니다.
+# 실행한 폴더와 상관없이 항상 이 파일 옆의 캐시 하나를 함께 씁니다.
+DEFAULT_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"),
+)  # 캐시 파일 위치
+DEFAULT_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))  # 보관 기간 (기본 7일)
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))  # 최대 보관 개수
+# temperature > 0 인 호출은 매번 다른 답을 기대하는 경우가 많으므로 기본적으로 캐시하지 않습니다.
+DEFAULT_CACHE_NONZERO_TEMPERATURE = os.getenv("LLM_CACHE_NONZERO_TEMP", "0") == "1"
+
+
+class ResponseCache:
+    """요청 전체(model, temperature, messages)의 해시를 키로 LLM 응답을 SQLite에 저장하는 캐시입니다."""
+
+    def __init__(self,
+                 path: str = DEFAULT_CACHE_PATH,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 cache_nonzero_temperature: bool = DEFAULT_CACHE_NONZERO_TEMPERATURE):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.cache_nonzero_temperature = cache_nonzero_temperature
+
+        # 📊 적중(hit)/실패(miss) 횟수를 세어 캐시 효과를 확인할 수 있게 합니다.
+        self.hits = 0
+        self.misses = 0
+
+        # 🔒 하나의 연결을 여러 스레드가 공유하므로 잠금(Lock)으로 순서를 지킵니다.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            # 가장 오래 안 쓴 항목(LRU)을 빨리 찾기 위한 인덱스입니다.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+            )
+
+    @staticmethod
+    def make_key(model: str, temperature: float, messages: list) -> str:
+        """요청 내용을 정렬된 JSON으로 만든 뒤 SHA-256 해시 문자열로 반환합니다."""
+        payload = json.dumps(
+            {"model": model, "temperature": temperature, "messages": messages},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """temperature가 0이거나, 0이 아닌 값도 캐시하도록 설정한 경우에만 True."""
+        return temperature == 0 or self.cache_nonzero_temperature
+
+    def get(self, key: str):
+        """캐시된 응답을 반환합니다. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            # 🖐 [검사]: 저장된 적이 없으면 실패(miss)로 기록합니다.
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+
+            # 🖐 [검사]: 보관 기간(TTL)이 지났으면 지우고 실패로 처리합니다.
+            if now - created_at > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            # 🤜 [결과 저장]: 최근 사용 시각을 갱신해 LRU 순서를 유지합니다.
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            return response
+
+    def set(self, key: str, response: str) -> None:
+        """응답을 저장하고, 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 지웁니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def store(self, key: str, response) -> bool:
+        """
+        응답을 저장하되, 저장에 실패해도 예외를 내지 않고 경고만 출력합니다. (저장했으면 True)
+        이미 비용을 낸 응답을 캐시 오류 때문에 버리지 않도록 set() 대신 이 함수를 씁니다.
+        """
+        # 🖐 [검사]: 빈 응답(None)은 저장하지 않습니다. (response 열은 NOT NULL)
+        if response is None:
+            return False
+        try:
+            self.set(key, response)
+            return True
+        except sqlite3.Error as e:
+            print(f"[경고] 응답 캐시 저장 실패: {e}")
+            return False
+
+    def clear(self) -> None:
+        """저장된 모든 응답과 통계를 지웁니다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """적중/실패 횟수와 현재 저장된 항목 수를 딕셔너리로 반환합니다."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,6 +1,7 @@
-# llm_ad_project/
+# my_x-max_1/
 #  ├── main.py              # 광고 생성기 실행 파일
 #  ├── llm_utils.py         # LLM 호출 함수 모듈
+#  ├── llm_cache.py         # LLM 응답 디스크 캐시 모듈 (evaluator/, llm_ad_project/도 함께 사용)
 #  └── prompt_templates.py  # 프롬프트 템플릿 모음
 
 # llm_utils.py
@@ -9,17 +10,34 @@ from openai import OpenAI  # OpenAI의 AI 모델을 사용하기 위해 공식 
 from dotenv import load_dotenv  # .env 파일에서 API 키를 가져오기 위해 불러옵니다. (터미널 설치: pip install python-dotenv)
 import os  # 운영체제 기능(환경변수 등)을 사용하기 위해 불러옵니다. (기본 내장)
 import time  # 재시도 전 대기 시간(sleep)을 주기 위해 불러옵니다. (기본 내장)
+from llm_cache import ResponseCache  # 같은 요청의 응답을 디스크에 저장해 재사용하는 캐시입니다. (로컬 파일: pip 설치 불필요)
 
 load_dotenv()  # .env 파일의 내용을 메모리에 올립니다.
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # 환경변수에서 꺼낸 키로 클라이언트를 설정합니다.
+cache = ResponseCache()  # 응답 캐시를 준비합니다. (cache.stats()로 적중/실패 횟수 확인)
 
 def ask_llm(prompt: str,
             model: str = "gpt-4o-mini",
             temperature: float = 0.7,
             max_retries: int = 3,
-            retry_delay: float = 2.0) -> str:
+            retry_delay: float = 2.0,
+            use_cache: bool = True) -> str:
     """기본 LLM 호출 함수입니다. 실패 시 재시도 기능이 포함되어 있습니다."""
     
+    # 🖐 [검사]: 한 번도 시도하지 않으면 돌려줄 응답이 없으므로 먼저 막습니다.
+    if max_retries < 1:
+        raise ValueError("max_retries는 1 이상이어야 합니다.")
+
+    messages = [{"role": "user", "content": prompt}]  # 사용자 메시지 전달
+
+    # 🖐 [검사]: 같은 (모델, 온도, 프롬프트) 요청의 저장된 응답이 있으면 API를 부르지 않고 바로 반환합니다.
+    cacheable = use_cache and cache.is_cacheable(temperature)
+    key = cache.make_key(model, temperature, messages)
+    if cacheable:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     # 🔄 [반복]: 정해진 횟수(max_retries)만큼 성공할 때까지 반복 시도합니다.
     for attempt in range(1, max_retries + 1):
         try:
@@ -28,12 +46,13 @@ def ask_llm(prompt: str,
             resp = client.chat.completions.create(
                 model=model,  # 사용할 모델 (기본값: gpt-4o-mini)
                 temperature=temperature,  # 창의성 조절
-                messages=[{"role": "user", "content": prompt}]  # 사용자 메시지 전달
+                messages=messages  # 사용자 메시지 전달
             )
             
             # 6. 결과 처리 (Data Processing)
             # 🤜 [결과 저장]: [중요] 최신 버전에서는 딕셔너리가 아닌 객체 속성(.content)으로 접근해야 합니다.
-            return resp.choices[0].message.content
+            content = resp.choices[0].message.content
+            break
 
         except Exception as e:
             # 2. 컨텍스트 관리 (에러 로그)
@@ -48,4 +67,9 @@ def ask_llm(prompt: str,
                 return "AI 응답을 가져오는 데 실패했습니다."
             
             # 🔄 [반복] 대기: 다음 시도 전, 서버 과부하를 막기 위해 잠시 기다립니다.
-            time.sleep(retry_delay)
\ No newline at end of file
+            time.sleep(retry_delay)
+
+    # 성공한 응답만 캐시에 저장합니다. (재시도 블록 밖: 캐시 오류가 나도 이미 받은 응답을 버리고 다시 호출하지 않음)
+    if cacheable:
+        cache.store(key, content)
+    return content
\ No newline at end of file
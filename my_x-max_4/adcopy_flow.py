@@ -0,0 +1,90 @@
+# ---------------------------------------------------------
+# [광고 카피 동시 처리 흐름 (Concurrent Flow)]
+# - 기존: 모더레이션(검사) → 생성 → TTS(음성)를 차례대로 기다렸습니다.
+# - 지금: 모더레이션과 생성을 동시에 시작합니다. 🏁
+#   · 생성된 조각은 검사 결과가 나올 때까지 화면에 내보내지 않고 모아 둡니다. (유해 입력의 결과가 보이지 않도록)
+#   · 검사에서 걸리면(flagged) 생성을 중단하고 모아 둔 조각은 버립니다. 🛑
+#   · 생성이 끝나면 마지막 [BEST] 표시 뒤의 내용 전체를 한 번의 TTS로 바로 넘깁니다. 🎵
+#     (앞부분에서 [BEST]를 언급할 수도 있으므로 마지막 표시를 기준으로 하고,
+#      한 번에 읽어야 억양과 쉼이 자연스럽습니다)
+#     TTS는 화면 쪽에서 생성 결과를 검사하는 동안 백그라운드에서 진행됩니다.
+#   → 전체 시간이 "검사 + 생성 + 검사 + TTS"가 아니라 거의 "생성 + TTS 시간"만큼으로 줄어듭니다.
+# ---------------------------------------------------------
+
+# ① 파이썬 내장 모듈 (Standard Library) - 설치 불필요
+import queue  # 생성된 조각을 백그라운드 스레드에서 화면 쪽으로 넘겨줄 대기열(Queue)입니다. 📬
+import threading  # 생성을 백그라운드에서 미리 받아 두기 위한 스레드(Thread)입니다. 🧵
+from concurrent.futures import ThreadPoolExecutor  # 모더레이션과 TTS를 동시에 돌릴 작업자 풀입니다. 👷
+
+BEST_MARKER = "[BEST]"  # 이 표시 뒤의 내용만 음성으로 만듭니다. 🏷️
+_DONE = object()  # 생성이 끝났다는 표시
+
+
+class AdcopyRun:
+    """
+    check(모더레이션)와 chunks(생성 스트림)를 동시에 시작하고,
+    stream()으로 검사를 통과한 조각만 내보내고, 다 받으면 마지막 [BEST] 이후 내용을 synthesize(TTS)에 넘깁니다.
+    """
+
+    def __init__(self, check, chunks, synthesize, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._synthesize = synthesize
+        self._audio = None  # [BEST] 이후 내용의 TTS 작업 🎵
+        self._chunks = queue.Queue()
+        self._cancelled = threading.Event()
+
+        self._check = self._executor.submit(check)  # 🛡️ 모더레이션 시작
+        self._producer = threading.Thread(target=self._produce, args=(chunks,), daemon=True)
+        self._producer.start()  # 🤖 생성 시작 (검사 결과를 기다리지 않음)
+
+    def _produce(self, chunks):
+        try:
+            for chunk in chunks:
+                if self._cancelled.is_set():
+                    break  # 검사에서 걸렸으면 더 받지 않습니다.
+                self._chunks.put(chunk)
+        except Exception as e:
+            self._chunks.put(e)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()  # 스트림 연결을 닫습니다. 🔌
+            self._chunks.put(_DONE)
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._audio is not None:
+            self._audio.cancel()
+        self._executor.shutdown(wait=False)
+
+    def stream(self):
+        """검사를 통과하면 생성된 조각을 내보냅니다. (st.write_stream용) 걸리면 ValueError가 발생합니다."""
+        try:
+            self._check.result()  # 🛡️ 검사 결과 대기 (그동안 생성은 계속 쌓이는 중)
+        except Exception:
+            self.cancel()
+            raise
+
+        text = ""
+        while True:
+            chunk = self._chunks.get()
+            if chunk is _DONE:
+                break
+            if isinstance(chunk, Exception):
+                self.cancel()
+                raise chunk
+            text += chunk
+            yield chunk
+
+        # 마지막 [BEST] 이후 내용 전체([BEST]가 없으면 전체)를 한 번에 TTS로 넘깁니다.
+        marker = text.rfind(BEST_MARKER)
+        best = text[marker + len(BEST_MARKER):] if marker != -1 else text
+        if best.strip():
+            self._audio = self._executor.submit(self._synthesize, best.strip())
+
+    def audio(self):
+        """[BEST] 이후 내용의 음성(MP3 바이트)을 반환합니다. (읽을 내용이 없으면 b"")"""
+        try:
+            return self._audio.result() if self._audio is not None else b""
+        finally:
+            self._executor.shutdown(wait=False)
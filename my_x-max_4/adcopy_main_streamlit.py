@@ -4,12 +4,14 @@
 # [Import 순서 및 라이브러리 설명]
 # ---------------------------------------------------------
 import streamlit as st  # 웹 앱 생성을 위한 스트림릿(Streamlit) 라이브러리입니다. (터미널 설치: pip install streamlit) 🌊
+from openai import OpenAIError  # OpenAI 요청(검사·생성·TTS)이 실패했을 때 나는 에러입니다. 📡
 
 # 아래 모듈들은 사용자가 직접 만든 파일이므로 pip 설치가 필요 없습니다. (같은 폴더에 있어야 함)
 from prompt_template import * # 프롬프트 템플릿(Prompt Template) 모듈을 가져옵니다. 📝
-from moderation_check import moderation_check  # 유해성 검사(Moderation Check) 모듈을 가져옵니다. 🛡️
-from ask_llm import create_script  # LLM 호출(Ask LLM) 모듈을 가져옵니다. 🤖
-from tts import text_to_speech  # 텍스트 음성 변환(Text to Speech) 모듈을 가져옵니다. 🗣️
+from moderation_check import moderation_check_fields  # 유해성 검사(Moderation Check) 모듈을 가져옵니다. (여러 필드 한 번에) 🛡️
+from ask_llm import stream_script  # LLM 호출(Ask LLM) 모듈을 가져옵니다. (스트리밍 버전) 🤖
+from tts import synthesize_speech  # 텍스트 음성 변환(Text to Speech) 모듈을 가져옵니다. (MP3 바이트 반환) 🗣️
+from adcopy_flow import AdcopyRun  # 모더레이션·생성·TTS를 동시에 처리하는 모듈을 가져옵니다. 🏁
 
 def main_adcopy():  # 광고 카피 생성 메인 함수(Function)를 정의합니다. 🎬
 
@@ -30,39 +32,61 @@ def main_adcopy():  # 광고 카피 생성 메인 함수(Function)를 정의합
         if not topic:  # 만약 주제(Topic)가 입력되지 않았다면... 🚫
             st.warning("제품/서비스명을 입력해주세요!")  # 경고(Warning) 메시지를 띄웁니다. ⚠️
         else:
-            # 🛡️ [안전 장치] 콘텐츠 모더레이션 체크 (Try-Except 구문 사용)
+            # 1. 프롬프트(Prompt) 생성: 입력된 정보를 바탕으로 질문지를 만듭니다. 📜
+            prompt = adcopy_prompt(topic, message, target)
+
+            # 🏁 [동시 시작] 모더레이션 체크와 스크립트 생성을 함께 시작합니다.
+            #    검사를 통과하기 전까지 생성된 내용은 화면에 나오지 않고, 걸리면 생성을 중단하고 버립니다. 🛡️
+            #    생성이 끝나면 마지막 [BEST] 표시 이후 내용을 바로 음성 변환(TTS)합니다. 🎵
+            run = AdcopyRun(
+                # 입력된 주제·핵심 문구·타겟을 요청 한 번으로 검사(Check)합니다. (같은 입력은 캐시에서 바로) 👮‍♂️
+                check=lambda: moderation_check_fields(제품명=topic, 핵심문구=message, 타겟=target),
+                chunks=stream_script(prompt),  # LLM 스트리밍 생성 🤖
+                synthesize=synthesize_speech  # [BEST] 이후 내용 → MP3 바이트 🔊
+            )
+
+            # 2. 스크립트(Script) 생성: 답변이 도착하는 대로 채팅 말풍선에 바로 그립니다. (스트리밍) 🌊
+            stream_box = st.empty()  # 스트리밍 출력을 잠시 보여줄 빈 자리(Placeholder)입니다. 📺
             try:
-                moderation_check(topic)  # 입력된 주제가 유해한지 검사(Check)합니다. 👮‍♂️
-            except ValueError as e:  # 만약 유해하다고 판단되어 에러(ValueError)가 발생하면... 🚨
+                with stream_box.container():
+                    with st.chat_message("assistant"):
+                        ai_reply = st.write_stream(run.stream())  # 모두 받은 뒤 전체 텍스트를 돌려받습니다. 📝
+            except (ValueError, OpenAIError) as e:  # 유해하다고 판단되었거나(ValueError) 요청이 실패하면... 🚨
+                stream_box.empty()
                 st.error(str(e))  # 화면에 빨간색 에러 메시지를 출력합니다. 💥
                 st.stop()         # 이후 코드를 실행하지 않고 중단(Stop)합니다. 🛑
 
-            # ⏳ [로딩 처리] AI가 작업하는 동안 스피너(Spinner)를 보여줍니다.
-            with st.spinner("전문 카피 라이터가 전략을 짜는 중입니다..."):
-                # 1. 프롬프트(Prompt) 생성: 입력된 정보를 바탕으로 질문지를 만듭니다. 📜
-                prompt = adcopy_prompt(topic, message, target)
-                
-                # 2. 스크립트(Script) 생성: LLM에게 질문지를 보내고 답변을 받습니다. 🤖
-                ai_reply = create_script(prompt)
-                
-                # 3. 음성 파일(Audio File) 생성: [BEST] 태그를 기준으로 변환 범위를 정합니다.
-                if "[BEST]" in ai_reply:  # 만약 답변에 '[BEST]'라는 단어가 있다면... 🔍
-                    # [BEST] 뒤에 있는 문장만 잘라내어(Split) 공백을 제거(Strip)합니다. ✂️
-                    best_part = ai_reply.split("[BEST]")[-1].strip()
-                    audio_file = text_to_speech(best_part)  # 그 부분만 음성으로 변환합니다. 🎵
-                else:  # 태그가 없다면...
-                    audio_file = text_to_speech(ai_reply)  # 전체 내용을 음성으로 변환합니다. 🔊
+            # ⏳ [로딩 처리] 음성 변환이 끝날 때까지 스피너(Spinner)를 보여줍니다.
+            with st.spinner("카피를 음성으로 변환하는 중입니다..."):
+                # 🛡️ 생성된 결과도 검사합니다. (그동안 음성 변환은 백그라운드에서 계속 진행)
+                try:
+                    moderation_check_fields(생성결과=ai_reply)
+                except (ValueError, OpenAIError) as e:
+                    run.cancel()  # 결과가 부적절하거나 검사를 못 하면 음성은 버립니다. 🗑️
+                    stream_box.empty()
+                    st.error(str(e))
+                    st.stop()
+
+                # 3. 음성(Audio) 완성: 마지막 [BEST] 이후 내용의 음성을 받습니다. ([BEST]가 없으면 전체 내용)
+                try:
+                    audio_bytes = run.audio()
+                except OpenAIError as e:  # 음성 변환 요청이 실패하면 텍스트만 남깁니다. 🔇
+                    st.warning(f"음성 변환에 실패했습니다: {e}")
+                    audio_bytes = None
                 
-                # 4. 결과 저장: 텍스트와 오디오 파일을 세션 스테이트(Session State)에 추가(Append)합니다. 💾
+                # 4. 결과 저장: 텍스트와 오디오 데이터를 세션 스테이트(Session State)에 추가(Append)합니다. 💾
                 st.session_state["messages"].append(
-                    {"role": "assistant", "content": ai_reply, "audio": audio_file}
+                    {"role": "assistant", "content": ai_reply, "audio": audio_bytes}
                 )
+
+            # 완성된 답변은 아래 대화 기록에서 다시 그려지므로 스트리밍용 임시 출력은 지웁니다. 🧹
+            stream_box.empty()
             
     # 📝 [출력] 누적된 대화 기록을 화면에 보여줍니다. (최신 내용이 위로 오도록 역순 출력)
     for msg in reversed(st.session_state["messages"]):  # 저장된 메시지를 거꾸로(Reversed) 가져옵니다. 🔄
         with st.chat_message(msg["role"]):  # 메시지 역할(Role)에 맞는 UI를 생성합니다. 💬
             st.markdown(msg["content"])  # 텍스트 내용을 마크다운(Markdown) 형식으로 출력합니다. 📄
-            if "audio" in msg:  # 만약 오디오 데이터가 포함되어 있다면... 🎧
+            if msg.get("audio"):  # 만약 오디오 데이터가 포함되어 있다면... (음성 변환에 실패했으면 없음) 🎧
                 st.audio(msg["audio"], format="audio/mp3")  # 오디오 플레이어를 표시합니다. ▶️
             st.divider()  # 메시지 사이에 구분선(Divider)을 그립니다. ➖
 
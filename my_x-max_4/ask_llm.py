@@ -2,20 +2,26 @@
 # [Import 순서 정리]
 # 1. 파이썬 내장 모듈
 # 2. 서드파티 라이브러리
+# 3. 같은 폴더의 모듈
 # ---------------------------------------------------------
 
 # ① 파이썬 내장 모듈 (Standard Library) - 설치 불필요
 import os  # 운영체제(Operating System) 기능을 사용하여 환경변수를 가져오기 위해 불러옵니다. 💻
 
 # ② 서드파티 라이브러리 (Third-party Libraries) - 설치 필요
-from openai import OpenAI  # OpenAI(오픈에이아이) API 사용을 위한 클라이언트입니다. (터미널 설치: pip install openai) 🤖
 from dotenv import load_dotenv  # .env 파일에서 환경변수를 로드하기 위한 라이브러리입니다. (터미널 설치: pip install python-dotenv) 🔐
 
+# ③ 같은 폴더의 모듈 (Local Module)
+from openai_client import get_client  # 프로세스 전체에서 함께 쓰는 OpenAI 클라이언트입니다. 🔗
+
 # ---------------------------------------------------------
 # [설정 및 클라이언트 초기화]
 # ---------------------------------------------------------
 load_dotenv()  # .env 파일의 API 키 정보를 환경변수로 메모리에 로드합니다. 📂
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # 로드된 키를 사용하여 OpenAI 클라이언트(Client)를 생성합니다. 🔗
+# OpenAI 클라이언트는 공용 모듈(openai_client.py)에서 처음 필요할 때 한 번만 만들고 재사용합니다. (연결 재사용) 🔗
+
+# 스트리밍(Streaming) 사용 여부입니다. STREAM_SCRIPT=0 으로 설정하면 한 번에 받는 방식으로 동작합니다. 🔀
+STREAM_ENABLED = os.getenv("STREAM_SCRIPT", "1") == "1"
 
 # ---------------------------------------------------------
 # [시스템 프롬프트 설정]
@@ -27,17 +33,51 @@ system_prompt = '''
 모든 콘텐츠는 2025년 12월의 트렌드, 소비자 행동, 플랫폼 알고리즘, 언어 사용을 반영해야 합니다.
 '''
 
+def build_messages(prompt: str) -> list:  # 시스템 프롬프트와 사용자 프롬프트로 메시지 리스트를 만듭니다. 📜
+    return [
+        {"role": "system", "content": system_prompt},  # 시스템(System): AI의 역할과 규칙을 설정합니다. ⚙️
+        {"role": "user", "content": prompt}  # 사용자(User): 실제로 요청할 광고 주제나 내용을 전달합니다. 👤
+    ]
+
+
 def create_script(prompt: str) -> str:  # 프롬프트를 입력받아 완성된 스크립트 문자열을 반환하는 함수입니다. ✍️
     
     # 📡 [API 호출]: LLM에게 요청을 보냅니다.
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model="gpt-4o",  # 사용할 AI 모델(Model)입니다. (최신 모델인 gpt-4o 사용) 🚀
-        messages=[  # 대화의 문맥(Context)을 구성하는 메시지 리스트입니다. 📜
-            {"role": "system", "content": system_prompt},  # 시스템(System): AI의 역할과 규칙을 설정합니다. ⚙️
-            {"role": "user", "content": prompt}  # 사용자(User): 실제로 요청할 광고 주제나 내용을 전달합니다. 👤
-        ],
+        messages=build_messages(prompt),  # 대화의 문맥(Context)을 구성하는 메시지 리스트입니다. 📜
         temperature=0.7  # 창의성(Temperature) 지수입니다. (0.0은 정적, 1.0은 매우 창의적. 0.7은 마케팅에 적절한 균형값) 🌡️
     )
     
     # 🎁 [결과 처리]: 응답 객체에서 텍스트 내용만 추출하여 반환합니다.
     return response.choices[0].message.content
+
+
+def stream_script(prompt: str):  # 답변을 토큰이 도착하는 대로 조각(Chunk)씩 돌려주는 제너레이터(Generator)입니다. 🌊
+    """
+    st.write_stream()에 바로 넘길 수 있도록 텍스트 조각을 하나씩 yield 합니다.
+    스트리밍이 꺼져 있거나 스트림 연결에 실패하면 create_script()로 전체 답변을 한 번에 돌려줍니다.
+    """
+
+    # 🔀 [대체 경로]: 스트리밍을 끈 경우 기존 방식(한 번에 받기)으로 동작합니다.
+    if not STREAM_ENABLED:
+        yield create_script(prompt)
+        return
+
+    # 📡 [API 호출]: stream=True 로 요청하면 답변이 완성되기 전부터 조각이 도착합니다.
+    try:
+        stream = get_client().chat.completions.create(
+            model="gpt-4o",
+            messages=build_messages(prompt),
+            temperature=0.7,
+            stream=True  # 스트리밍(Streaming) 모드 🌊
+        )
+    except Exception:
+        # 스트림 연결 자체가 실패하면 한 번에 받는 방식으로 다시 시도합니다. 🔁
+        yield create_script(prompt)
+        return
+
+    # 🎁 [결과 처리]: 각 조각의 delta.content(새로 생성된 텍스트)만 꺼내서 바로 전달합니다.
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -0,0 +1,157 @@
+# ---------------------------------------------------------
+# [TTS 음성 캐시 (Audio Cache)]
+# - 음성 파일 이름을 시간 대신 내용(모델, 목소리, 텍스트)의 해시(Hash)로 정합니다.
+#   → 같은 문장은 다시 합성하지 않고 저장된 MP3를 바로 돌려줍니다. ♻️
+#   → 같은 초에 두 요청이 와도 서로 덮어쓰지 않습니다. (내용이 같으면 같은 파일, 다르면 다른 파일)
+# - 같은 문장을 동시에 요청하면 한 번만 합성하고 나머지는 그 결과를 기다립니다.
+# - 전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 파일부터 지웁니다. (LRU) 🧹
+# - 청소부(janitor)는 중간에 끊긴 임시 파일, 비어 있거나 이름이 맞지 않는 파일을 정리합니다.
+#   폴더는 잠금 없이 훑고, 그 결과를 기존 목록에 합칩니다. (훑는 동안 저장된 파일도 목록에 남음)
+# ---------------------------------------------------------
+
+# ① 파이썬 내장 모듈 (Standard Library) - 설치 불필요
+import hashlib  # 내용으로 파일 이름(키)을 만들기 위한 해시 모듈입니다. #️⃣
+import os  # 파일 크기·시간 확인과 삭제를 위해 불러옵니다. 💻
+import re  # 캐시 파일 이름 형식을 확인하기 위한 정규표현식 모듈입니다. 🧩
+import threading  # 여러 사용자가 동시에 써도 안전하도록 잠금(Lock)을 사용합니다. 🔒
+import time  # 임시 파일이 얼마나 오래됐는지 확인하기 위해 불러옵니다. ⏱️
+from collections import OrderedDict  # LRU(가장 오래 안 쓴 순서) 목록을 위한 자료구조입니다. 🗂️
+
+CACHE_FILE = re.compile(r"^[0-9a-f]{64}\.mp3$")  # 캐시 파일 이름 형식 (sha256.mp3)
+
+
+class AudioCache:
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024, janitor_every=50, stale_seconds=600):
+        self.directory = directory
+        self.max_bytes = max_bytes  # 캐시 폴더 최대 크기 📏
+        self.janitor_every = janitor_every  # 저장 몇 번마다 청소할지 🧹
+        self.stale_seconds = stale_seconds  # 이보다 오래된 임시 파일은 끊긴 것으로 봅니다. ⏳
+        self._index = OrderedDict()  # 키 → 파일 크기 (오래 안 쓴 것 → 최근 쓴 것)
+        self._saved_at = {}  # 키 → 마지막 저장 시각 (janitor가 훑는 동안 저장된 키를 알아보는 데 씀)
+        self._total = 0
+        self._writes = 0
+        self._pending = {}  # 합성 중인 키 → threading.Event (같은 요청 중복 방지)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.janitor()
+
+    @staticmethod
+    def key(model, voice, text):  # (모델, 목소리, 텍스트)로 만든 고유 키 🔑
+        return hashlib.sha256(f"{model}\0{voice}\0{text.strip()}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".mp3")
+
+    # -------------------------------
+    # 청소 (Janitor)
+    # -------------------------------
+    def janitor(self):
+        """폴더를 다시 훑어 목록을 맞추고, 끊긴 임시 파일·빈 파일·이름이 다른 파일을 지웁니다."""
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # 훑는 사이에 지워진 파일
+            if entry.name.endswith(".tmp"):
+                if now - stat.st_mtime > self.stale_seconds:
+                    _remove(entry.path)  # 쓰다가 끊긴 임시 파일
+                continue
+            if not CACHE_FILE.match(entry.name) or stat.st_size == 0:
+                _remove(entry.path)  # 캐시가 만든 파일이 아니거나 비어 있음
+                continue
+            entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+
+        with self._lock:
+            merged = OrderedDict()
+            for _, k, size in sorted(entries):  # 마지막 사용 시각 순
+                if k in self._saved_at and self._saved_at[k] >= now:
+                    continue  # 훑은 뒤에 다시 저장된 키는 아래에서 최신 크기로 넣습니다.
+                if k in self._index or os.path.exists(self._path(k)):  # 훑은 뒤에 지워진 파일은 뺍니다.
+                    merged[k] = size
+            for k, size in self._index.items():
+                if self._saved_at.get(k, 0) >= now:
+                    merged[k] = size  # 훑는 동안 저장된 파일 (가장 최근에 쓴 것으로)
+            self._index = merged
+            self._saved_at = {k: t for k, t in self._saved_at.items() if t >= now}
+            self._total = sum(self._index.values())
+            self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._index) > 1:
+            k, size = self._index.popitem(last=False)  # 가장 오래 안 쓴 파일부터
+            self._total -= size
+            _remove(self._path(k))
+
+    # -------------------------------
+    # 읽기 / 쓰기
+    # -------------------------------
+    def get(self, key):
+        """저장된 MP3 바이트를 반환합니다. 없으면 None."""
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))  # 마지막 사용 시각을 남겨 재시작 후에도 LRU 순서를 유지합니다.
+            return data
+        except OSError:
+            with self._lock:
+                self._total -= self._index.pop(key, 0)  # 누가 지운 파일이면 목록에서도 뺍니다.
+            return None
+
+    def put(self, key, data):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)  # 다 쓴 뒤 한 번에 바꿔치기 (반쯤 쓴 파일이 보이지 않음)
+
+        with self._lock:
+            self._total += len(data) - self._index.get(key, 0)
+            self._index[key] = len(data)
+            self._index.move_to_end(key)
+            self._saved_at[key] = time.time()
+            self._evict()
+            self._writes += 1
+            run_janitor = self._writes % self.janitor_every == 0
+        if run_janitor:
+            self.janitor()
+
+    def get_or_create(self, key, create):
+        """캐시에 있으면 바로 반환하고, 없으면 create()로 만들어 저장합니다. (같은 키는 동시에 한 번만 만듦)"""
+        while True:
+            data = self.get(key)
+            if data is not None:
+                return data
+            with self._lock:
+                event = self._pending.get(key)
+                owner = event is None
+                if owner:
+                    event = self._pending[key] = threading.Event()
+            if owner:
+                break
+            event.wait()  # 다른 요청이 만드는 중이면 끝날 때까지 기다렸다가 캐시에서 다시 읽습니다.
+            # (먼저 만들던 요청이 실패했으면 다음 반복에서 이 요청이 직접 만듭니다.)
+
+        try:
+            data = create()
+            self.put(key, data)
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,21 +1,108 @@
 # ---------------------------------------------------------
 # [Import 순서 정리]
 # 1. 파이썬 내장 모듈
-# 2. 서드파티 라이브러리
+# 2. 같은 폴더의 모듈
 # ---------------------------------------------------------
 
 # ① 파이썬 내장 모듈 (Standard Library) - 설치 불필요
-import os  # 운영체제(OS) 기능을 사용하여 환경변수를 가져오기 위해 불러옵니다. 💻
+import hashlib  # 정규화한 텍스트를 짧은 해시(Hash) 키로 바꾸기 위해 불러옵니다. #️⃣
+import re  # 연속된 공백을 하나로 합치기 위한 정규표현식(Regular Expression) 모듈입니다. 🧩
+import threading  # 여러 사용자가 동시에 캐시를 읽고 써도 안전하도록 잠금(Lock)을 사용합니다. 🔒
+import time  # 캐시 유효 시간(TTL)을 재기 위해 불러옵니다. ⏱️
+import unicodedata  # 전각/반각 등 같은 글자를 같은 형태로 맞추기(정규화) 위해 불러옵니다. 🔤
+from collections import OrderedDict  # 가장 오래 안 쓴 항목부터 지우는 LRU 캐시를 만들기 위한 자료구조입니다. 🗂️
 
-# ② 서드파티 라이브러리 (Third-party Libraries) - 설치 필요
-from openai import OpenAI  # OpenAI(오픈에이아이) API 사용을 위한 클라이언트입니다. (터미널 설치: pip install openai) 🤖
-from dotenv import load_dotenv  # .env 파일에서 환경변수를 로드하기 위한 라이브러리입니다. (터미널 설치: pip install python-dotenv) 🔐
+# ② 같은 폴더의 모듈 (Local Module)
+from openai_client import get_client  # 프로세스 전체에서 함께 쓰는 OpenAI 클라이언트입니다. 🔗
 
 # ---------------------------------------------------------
 # [설정 및 클라이언트 초기화]
 # ---------------------------------------------------------
-load_dotenv()  # .env 파일의 API 키 정보를 환경변수로 메모리에 로드합니다. 📂
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # 로드된 키를 사용하여 OpenAI 클라이언트(Client)를 생성합니다. 🔗
+# OpenAI 클라이언트는 공용 모듈(openai_client.py)에서 처음 필요할 때 한 번만 만들고 재사용합니다. (연결 재사용) 🔗
+
+MODERATION_MODEL = "omni-moderation-latest"  # 최신 다목적(Omni) 모더레이션 모델 사용 🚀
+
+
+# ---------------------------------------------------------
+# [모더레이션 서비스] 여러 텍스트를 한 번에 검사 + 결과 캐시
+# - 검사할 텍스트들을 목록(List)으로 모아 요청 한 번으로 보냅니다. 📦
+# - 결과는 "정규화한 텍스트의 해시"를 키로 LRU + TTL 캐시에 보관합니다.
+#   → 같은 주제를 다시 입력하면 API를 부르지 않습니다. (비용 0, 대기 0) ♻️
+# ---------------------------------------------------------
+class ModerationService:
+
+    def __init__(self, max_entries=1024, ttl=3600.0):
+        self.max_entries = max_entries  # 캐시에 보관할 최대 결과 수 📏
+        self.ttl = ttl  # 결과를 믿고 재사용할 시간(초) ⏳
+        self._cache = OrderedDict()  # 키 → (결과, 만료 시각)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text):  # 대소문자, 공백, 전각/반각 차이는 같은 텍스트로 봅니다. 🔑
+        normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().lower()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _get(self, key, now):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[1] < now:  # 유효 시간이 지난 결과는 버립니다. 🗑️
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)  # 최근에 쓴 항목으로 표시 (LRU)
+        return entry[0]
+
+    def _put(self, key, result, now):
+        self._cache[key] = (result, now + self.ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)  # 가장 오래 안 쓴 항목부터 지웁니다. 🧹
+
+    def check_fields(self, fields):
+        """
+        {필드 이름: 텍스트}를 검사하고 {필드 이름: {"flagged": bool, "categories": [걸린 항목]}}을 반환합니다.
+        캐시에 없는 텍스트만 모아서 요청 한 번으로 보냅니다. 빈 텍스트는 검사하지 않습니다.
+        """
+        now = time.monotonic()
+        keys = {name: self.key(text) for name, text in fields.items() if text and text.strip()}
+
+        with self._lock:
+            known = {k: self._get(k, now) for k in set(keys.values())}
+        missing = {}  # 키 → 텍스트 (같은 텍스트는 한 번만 보냄)
+        for name, k in keys.items():
+            if known[k] is None:
+                missing.setdefault(k, fields[name])
+
+        if missing:
+            # 🛡️ [콘텐츠 모더레이션 체크 요청] 여러 텍스트를 목록으로 한 번에 보냅니다.
+            response = get_client().moderations.create(
+                model=MODERATION_MODEL,
+                input=list(missing.values())  # 검사할 텍스트 목록 📝
+            )
+            with self._lock:
+                for k, result in zip(missing, response.results):
+                    categories = result.categories.model_dump() if hasattr(result.categories, "model_dump") else dict(result.categories)
+                    known[k] = {"flagged": result.flagged, "categories": [c for c, hit in categories.items() if hit]}
+                    self._put(k, known[k], now)
+
+        safe = {"flagged": False, "categories": []}
+        return {name: known[keys[name]] if name in keys else safe for name in fields}
+
+
+_service = ModerationService()  # 프로세스 전체에서 함께 쓰는 모더레이션 서비스 (캐시 공유) 📦
+
+
+def moderation_check_fields(**fields) -> dict:
+    """
+    여러 입력/출력 필드를 한 번에 검사합니다. (예: moderation_check_fields(주제=topic, 핵심문구=message))
+    :return: 모두 안전하면 필드별 결과 딕셔너리 반환, 하나라도 유해하면 ValueError 발생
+    """
+    results = _service.check_fields(fields)
+    flagged = [name for name, result in results.items() if result["flagged"]]
+    if flagged:
+        # 유해 콘텐츠가 감지되면 어느 필드인지 알려 주고 진행을 중단합니다. 🛑
+        raise ValueError(f"입력하신 내용이 부적절하여 처리할 수 없습니다. ({', '.join(flagged)})")
+    return results
 
 
 def moderation_check(text: str) -> bool:
@@ -24,20 +111,13 @@ def moderation_check(text: str) -> bool:
     :param text: 검사할 텍스트 문자열
     :return: 안전한 경우 True 반환, 유해한 경우 ValueError 발생
     """
-    
-    # 🛡️ [콘텐츠 모더레이션 체크 요청]
-    # OpenAI의 최신 모더레이션 모델을 사용하여 텍스트를 분석합니다.
-    check = client.moderations.create(
-        model="omni-moderation-latest",  # 최신 다목적(Omni) 모더레이션 모델 사용 🚀
-        input=text  # 검사할 텍스트 입력 📝
-    )
-    
+
     # 🚩 [결과 확인]
-    # flagged(플래그드)가 True라면 정책 위반 내용이 포함되어 있다는 뜻입니다.
-    if check.results[0].flagged:
+    # flagged(플래그드)가 True라면 정책 위반 내용이 포함되어 있다는 뜻입니다. (같은 텍스트는 캐시에서 바로 확인)
+    if _service.check_fields({"text": text})["text"]["flagged"]:
         # 유해 콘텐츠가 감지되면 즉시 예외(Exception)를 발생시켜 진행을 중단합니다. 🛑
         # ValueError (밸류 에러): 값이 부적절할 때 사용하는 에러 타입
-        raise ValueError("입력하신 내용이 부적절하여 처리할 수 없습니다.") 
-    
+        raise ValueError("입력하신 내용이 부적절하여 처리할 수 없습니다.")
+
     # 문제가 없다면 True를 반환하며 통과시킵니다. ✅
-    return True
\ No newline at end of file
+    return True
@@ -0,0 +1,67 @@
+# ---------------------------------------------------------
+# [공용 OpenAI 클라이언트 (Shared Client)]
+# - 스트림릿(Streamlit)은 버튼을 누를 때마다 스크립트를 다시 실행하지만, 이 모듈은 프로세스(Process)에 한 번만 올라갑니다.
+# - 그래서 클라이언트를 여기 한 곳에서 처음 필요할 때 한 번만 만들고(Lazy), 모든 모듈과 사용자가 함께 씁니다.
+# - 클라이언트 안의 연결 풀(Connection Pool)이 keep-alive 연결을 보관하므로,
+#   다음 요청은 TLS(보안 연결) 핸드셰이크 없이 이미 열린 연결을 재사용합니다. 🔁
+# - 클라이언트는 (API 키, OPENAI_BASE_URL)마다 하나씩 만들고, 부를 때마다 지금 환경변수 값으로 찾습니다.
+#   → 실행 중에 키나 주소를 바꾸면 바뀐 값에 맞는 클라이언트가 나옵니다.
+# ⚠️ my_x-max_4/openai_client.py 와 my_3th_project/ch01-1/openai_client.py 는 같은 파일입니다.
+#    (두 프로젝트가 따로 실행되므로 폴더마다 한 부씩 둡니다) 한쪽을 고치면 다른 쪽도 똑같이 고쳐 주세요.
+# ---------------------------------------------------------
+
+# ① 파이썬 내장 모듈 (Standard Library) - 설치 불필요
+import os  # 환경변수에서 API 키와 연결 풀 설정을 읽기 위해 불러옵니다. 💻
+import threading  # 여러 사용자가 동시에 처음 호출해도 클라이언트를 하나만 만들기 위한 잠금(Lock)입니다. 🔒
+
+# ② 서드파티 라이브러리 (Third-party Libraries) - 설치 필요
+import httpx  # OpenAI 라이브러리가 내부에서 쓰는 HTTP 클라이언트입니다. (openai 설치 시 함께 설치됨) 🌐
+from openai import OpenAI, DefaultHttpxClient  # OpenAI 클라이언트와 기본 설정이 들어 있는 HTTP 클라이언트입니다. 🤖
+from dotenv import load_dotenv  # .env 파일에서 환경변수를 로드하기 위한 라이브러리입니다. 🔐
+
+# ---------------------------------------------------------
+# [연결 풀 설정] 환경변수로 바꿀 수 있습니다.
+# ---------------------------------------------------------
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))  # 동시에 열 수 있는 최대 연결 수입니다. 🔢
+MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))  # 쉬는 동안에도 열어 둘 연결 수입니다. 🔌
+KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "120"))  # 쉬는 연결을 닫기 전까지 기다리는 시간(초)입니다. ⏳
+REQUEST_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))  # 요청 하나의 최대 대기 시간(초)입니다. ⏱️
+
+_clients = {}  # (API 키, 주소) → 클라이언트 📦
+_dotenv_loaded = False  # .env는 처음 한 번만 읽습니다. 📌
+_lock = threading.Lock()
+
+
+def _client_for(key):  # (잠금을 잡은 상태에서) (키, 주소)에 맞는 클라이언트를 찾거나 만듭니다.
+    api_key, base_url = key
+    if key not in _clients:
+        http_client = DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+        _clients[key] = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+    return _clients[key]
+
+
+def get_client(api_key=None):  # 프로세스 전체에서 함께 쓰는 OpenAI 클라이언트를 돌려주는 함수입니다. 🔗
+    """
+    처음 부를 때만 클라이언트를 만들고, 이후에는 같은 객체를 돌려줍니다. (키와 주소가 같으면)
+    api_key를 주지 않으면 .env / 환경변수의 OPENAI_API_KEY를 사용합니다. (.env는 처음 한 번만 읽음)
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        with _lock:
+            if not _dotenv_loaded:
+                load_dotenv()  # .env 파일의 API 키 정보를 환경변수로 로드합니다. 📂
+                _dotenv_loaded = True
+
+    key = (api_key or os.getenv("OPENAI_API_KEY"), os.getenv("OPENAI_BASE_URL"))
+    client = _clients.get(key)
+    if client is not None:
+        return client  # 빠른 길: 이미 만든 클라이언트를 잠금 없이 바로 돌려줍니다. ⚡
+    with _lock:
+        return _client_for(key)
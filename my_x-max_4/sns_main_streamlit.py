@@ -10,7 +10,7 @@ import streamlit as st  # 웹 앱 생성을 위한 스트림릿(Streamlit) 라
 # ② 사용자 정의 모듈 (User-defined Modules) - 같은 폴더에 파일이 있어야 함
 from prompt_template import * # 프롬프트(Prompt) 템플릿 함수들을 가져옵니다. 📝
 from moderation_check import moderation_check  # 입력 내용의 유해성을 검사(Moderation Check)하는 모듈입니다. 🛡️
-from ask_llm import create_script  # LLM(거대 언어 모델)에게 질문하고 답을 받는 함수입니다. 🤖
+from ask_llm import stream_script  # LLM(거대 언어 모델)의 답변을 스트리밍으로 받는 함수입니다. 🤖
 from tts import text_to_speech  # 텍스트를 음성으로 변환(Text-to-Speech)하는 함수입니다. 🗣️
 
 
@@ -48,29 +48,35 @@ def main_sns():  # SNS 포스팅 생성 메인 함수를 정의합니다. 📱
             # moderation_check(topic)
             
 
-            with st.spinner(f"{channel} 최적화 문구를 작성 중입니다..."):  # 작업 완료 전까지 로딩(Spinner) 표시를 합니다. ⏳
-                # 프롬프트 생성
-                # 입력된 정보를 바탕으로 AI에게 보낼 질문지(Prompt)를 만듭니다. 📜
-                prompt = sns_prompt(topic, channel, tone, target)
-                
-                # SNS 포스팅 스크립트 생성
-                # LLM 함수를 호출하여 AI의 답변(Reply)을 받습니다. 🤖
-                ai_reply = create_script(prompt)
-            
+            # 프롬프트 생성
+            # 입력된 정보를 바탕으로 AI에게 보낼 질문지(Prompt)를 만듭니다. 📜
+            prompt = sns_prompt(topic, channel, tone, target)
+
+            # 스크립트 스트리밍 생성
+            # 답변이 도착하는 대로 채팅 말풍선에 바로 그립니다. (첫 글자까지의 대기 시간만 체감) 🌊
+            stream_box = st.empty()  # 스트리밍 출력을 잠시 보여줄 빈 자리(Placeholder)입니다. 📺
+            with stream_box.container():
+                with st.chat_message("assistant"):
+                    ai_reply = st.write_stream(stream_script(prompt))  # 모두 받은 뒤 전체 텍스트를 돌려받습니다. 📝
+
+            with st.spinner("음성 파일을 만드는 중입니다..."):  # 음성 변환 동안 로딩(Spinner) 표시를 합니다. ⏳
                 # 음성 파일 생성 (베스트 부분만 음성 변환, 없으면 전체 변환)
                 # 답변에 '[BEST]' 태그가 있는지 확인합니다. 🔍
                 if "[BEST]" in ai_reply:
                     # [BEST] 뒤에 있는 텍스트만 잘라내어(Split) 다듬습니다(Strip). ✂️
                     best_part = ai_reply.split("[BEST]")[-1].strip()
-                    audio_file = text_to_speech(best_part)  # 그 부분만 TTS로 변환합니다. 🎵
+                    audio_bytes = text_to_speech(best_part)  # 그 부분만 TTS로 변환합니다. 🎵
                 else:
-                    audio_file = text_to_speech(ai_reply)  # 태그가 없으면 전체를 변환합니다. 🔊
+                    audio_bytes = text_to_speech(ai_reply)  # 태그가 없으면 전체를 변환합니다. 🔊
                 
                 # 모델 응답 이력에 텍스트와 음성을 한쌍으로 저장
-                # 결과 텍스트와 오디오 파일을 세션에 추가(Append)합니다. ➕
+                # 결과 텍스트와 오디오(MP3 바이트, 같은 문장은 캐시에서 재사용)를 세션에 추가(Append)합니다. ➕
                 st.session_state["messages"].append(
-                    {"role": "assistant", "content": ai_reply, "audio": audio_file}
+                    {"role": "assistant", "content": ai_reply, "audio": audio_bytes}
                 )
+
+            # 완성된 답변은 아래 누적 결과에서 다시 그려지므로 스트리밍용 임시 출력은 지웁니다. 🧹
+            stream_box.empty()
             
     # 텍스트와 음성 포함한 누적 결과 출력 (최근 결과를 위쪽으로 출력)
     # 최신 메시지가 위에 오도록 리스트를 역순(Reversed)으로 반복합니다. 🔄